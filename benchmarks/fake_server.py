@@ -0,0 +1,309 @@
+"""
+Minimal stand-in for an Immich server, used by the benchmark suite.
+
+Only the endpoints exercised by the benchmarks are implemented. Asset metadata
+is generated deterministically on demand, so the server's own memory stays flat
+regardless of the simulated library size.
+"""
+
+import base64
+import gzip
+import hashlib
+import json
+import re
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CHUNK_SIZE = 64 * 1024
+PAYLOAD_SIZE = 1024 * 1024
+MAX_PAGE_SIZE = 1000
+
+
+def _encoders():
+    """Content encoders available in this environment, keyed by Content-Encoding name."""
+    encoders = {
+        "gzip": lambda body: gzip.compress(body, compresslevel=6),
+        "deflate": lambda body: zlib.compress(body, 6),
+    }
+    try:
+        import brotli
+        encoders["br"] = lambda body: brotli.compress(body, quality=5)
+    except ImportError:
+        pass
+    try:
+        import zstandard
+        encoders["zstd"] = lambda body: zstandard.ZstdCompressor(level=3).compress(body)
+    except ImportError:
+        pass
+    return encoders
+
+
+ENCODERS = _encoders()
+
+
+def make_asset(index):
+    """
+    Build the search/metadata representation of the asset at a given index.
+
+    Args:
+        index (int): Position of the asset in the fake library.
+
+    Returns:
+        dict: Asset data shaped like the real API response (with EXIF).
+    """
+    day = 1 + index % 28
+    stamp = f"2024-05-{day:02d}T10:{index % 60:02d}:{(index // 60) % 60:02d}.000Z"
+    return {
+        "id": f"00000000-0000-4000-8000-{index:012d}",
+        "deviceAssetId": f"IMG_{index:06d}.JPG-{index}",
+        "ownerId": "11111111-1111-4111-8111-111111111111",
+        "deviceId": "bench-device",
+        "libraryId": None,
+        "type": "IMAGE",
+        "originalPath": f"/usr/src/app/upload/library/admin/2024/IMG_{index:06d}.JPG",
+        "originalFileName": f"IMG_{index:06d}.JPG",
+        "originalMimeType": "image/jpeg",
+        "thumbhash": "1QcSHQRnh493V4dIh4eXh1h4kJUI",
+        "fileCreatedAt": stamp,
+        "fileModifiedAt": stamp,
+        "localDateTime": stamp,
+        "updatedAt": stamp,
+        "isFavorite": index % 10 == 0,
+        "isArchived": False,
+        "isTrashed": False,
+        "visibility": "timeline",
+        "duration": "0:00:00.00000",
+        "checksum": base64.b64encode(hashlib.sha1(str(index).encode()).digest()).decode(),
+        "livePhotoVideoId": None,
+        "hasMetadata": True,
+        "isOffline": False,
+        "exifInfo": {
+            "make": "Canon",
+            "model": "EOS R5",
+            "exifImageWidth": 8192,
+            "exifImageHeight": 5464,
+            "fileSizeInByte": 1024 * 1024 + index,
+            "orientation": "1",
+            "dateTimeOriginal": stamp,
+            "lensModel": "RF24-105mm F4 L IS USM",
+            "fNumber": 4.0,
+            "focalLength": 50.0,
+            "iso": 100 * (1 + index % 8),
+            "exposureTime": "1/250",
+            "latitude": 48.8566 + index * 1e-6,
+            "longitude": 2.3522,
+            "city": "Paris",
+            "state": "Ile-de-France",
+            "country": "France",
+            "description": "",
+            "rating": None,
+        },
+        "people": [],
+        "tags": [],
+    }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, data, status=200):
+        body = json.dumps(data).encode()
+        encoding = self._choose_encoding()
+        if encoding:
+            body = ENCODERS[encoding](body)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.server.throttled_write(self.wfile, body)
+
+    def _choose_encoding(self):
+        """First encoding of the client's Accept-Encoding list that the server can produce."""
+        for name in self.headers.get("Accept-Encoding", "").split(","):
+            name = name.split(";")[0].strip().lower()
+            if name in ENCODERS:
+                return name
+        return None
+
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length", 0))
+        remaining = length
+        data = []
+        while remaining > 0:
+            chunk = self.rfile.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            data.append(chunk)
+            remaining -= len(chunk)
+        return b"".join(data)
+
+    def _dispatch(self, method):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        path = self.path.split("?", 1)[0]
+        body = self._read_body() if method in ("POST", "PUT") else b""
+        if method != "POST" or path != "/api/assets":
+            self.server.record_request()
+        for route_method, pattern, handler in self.server.routes:
+            match = pattern.fullmatch(path)
+            if route_method == method and match:
+                return handler(self, body, *match.groups())
+        self._send_json({"message": f"Cannot {method} {path}", "statusCode": 404}, status=404)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    # Route handlers
+
+    def route_server_version(self, body):
+        self._send_json({"major": 1, "minor": 130, "patch": 0})
+
+    def route_search_metadata(self, body):
+        query = json.loads(body or b"{}")
+        size = min(int(query.get("size") or 250), MAX_PAGE_SIZE)
+        page = int(query.get("page") or 1)
+        start = (page - 1) * size
+        end = min(start + size, self.server.asset_count)
+        items = [make_asset(i) for i in range(start, end)]
+        next_page = str(page + 1) if end < self.server.asset_count else None
+        self._send_json({
+            "albums": {"total": 0, "count": 0, "items": [], "facets": []},
+            "assets": {"total": len(items), "count": len(items), "items": items, "facets": [], "nextPage": next_page},
+        })
+
+    def route_list_albums(self, body):
+        self._send_json([{"id": "album-0", "albumName": "Benchmark", "assetCount": self.server.album_size}])
+
+    def route_get_album(self, body, album_id):
+        album = {
+            "id": album_id,
+            "albumName": "Benchmark",
+            "ownerId": "11111111-1111-4111-8111-111111111111",
+            "assetCount": self.server.album_size,
+        }
+        if "withoutAssets=true" not in self.path:
+            album["assets"] = [make_asset(i) for i in range(self.server.album_size)]
+        self._send_json(album)
+
+    def route_download_original(self, body, asset_id):
+        size = self.server.asset_size
+        self.send_response(200)
+        self.send_header("Content-Type", "image/jpeg")
+        self.send_header("Content-Length", str(size))
+        self.end_headers()
+        self.server.throttled_write(self.wfile, self.server.payload, size)
+
+    def route_upload_asset(self, body):
+        self.server.record_request(len(body))
+        self._send_json({"id": hashlib.md5(body[-4096:]).hexdigest(), "status": "created"}, status=201)
+
+
+class FakeImmichServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server imitating the Immich endpoints used by the benchmarks.
+
+    Implemented endpoints: GET server/version, POST search/metadata (paged),
+    GET albums, GET albums/{id}, GET assets/{id}/original and POST assets.
+    JSON responses honour Accept-Encoding (gzip and deflate, plus br and zstd when
+    the brotli and zstandard packages are installed).
+
+    Attributes:
+        url (str): Base URL to pass to ImmichClient.
+        request_count (int): Number of requests served so far.
+        uploaded_bytes (int): Total size of uploaded request bodies.
+    """
+    daemon_threads = True
+    routes = [
+        ("GET", re.compile(r"/api/server/version"), _Handler.route_server_version),
+        ("POST", re.compile(r"/api/search/metadata"), _Handler.route_search_metadata),
+        ("GET", re.compile(r"/api/albums"), _Handler.route_list_albums),
+        ("GET", re.compile(r"/api/albums/([^/]+)"), _Handler.route_get_album),
+        ("GET", re.compile(r"/api/assets/([^/]+)/original"), _Handler.route_download_original),
+        ("POST", re.compile(r"/api/assets"), _Handler.route_upload_asset),
+    ]
+
+    def __init__(self, asset_count=10000, album_size=1000, asset_size=1024 * 1024,
+                 latency=0.0, bandwidth=None, host="127.0.0.1", port=0):
+        """
+        Bind the server (port 0 picks a free port).
+
+        Args:
+            asset_count (int): Number of assets returned by search/metadata.
+            album_size (int): Number of assets embedded in albums/{id}.
+            asset_size (int): Size in bytes of every original file.
+            latency (float): Delay in seconds added before each response.
+            bandwidth (float, optional): Per-connection throughput limit in bytes per second.
+            host (str): Interface to listen on.
+            port (int): Port to listen on.
+        """
+        self.asset_count = asset_count
+        self.album_size = album_size
+        self.asset_size = asset_size
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.payload = bytes(range(256)) * (PAYLOAD_SIZE // 256)
+        self.request_count = 0
+        self.uploaded_bytes = 0
+        self._count_lock = threading.Lock()
+        self._thread = None
+        super().__init__((host, port), _Handler)
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def record_request(self, uploaded=0):
+        with self._count_lock:
+            self.request_count += 1
+            self.uploaded_bytes += uploaded
+
+    def throttled_write(self, wfile, data, size=None):
+        """
+        Write `size` bytes (repeating `data` if needed) at no more than the configured bandwidth.
+        """
+        size = len(data) if size is None else size
+        view = memoryview(data)
+        # Small steps keep throttling smooth; unthrottled writes use the whole buffer
+        step = CHUNK_SIZE if self.bandwidth else len(view)
+        start = time.perf_counter()
+        sent = 0
+        while sent < size:
+            offset = sent % len(view)
+            chunk = view[offset:offset + min(step, size - sent, len(view) - offset)]
+            wfile.write(chunk)
+            sent += len(chunk)
+            if self.bandwidth:
+                delay = start + sent / self.bandwidth - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+
+    def start(self):
+        """Serve requests from a background thread and return self."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and release the socket."""
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
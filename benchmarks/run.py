@@ -0,0 +1,395 @@
+"""
+Benchmark suite for immich-lib.
+
+Starts a FakeImmichServer on localhost and runs each scenario in a fresh
+subprocess, so peak RSS is measured per scenario. Results can be saved as
+baselines and later checked against them to catch regressions before a release.
+
+Usage:
+    python benchmarks/run.py                      # run all scenarios and print a report
+    python benchmarks/run.py list download        # run selected scenarios
+    python benchmarks/run.py --save               # update benchmarks/baselines.json
+    python benchmarks/run.py --check              # exit 1 if a scenario regressed
+    python benchmarks/run.py list-identity list-gzip --bandwidth 5e6   # compression over a slow link
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.join(os.path.dirname(HERE), "src"))
+
+from fake_server import FakeImmichServer  # noqa: E402
+
+BASELINE_PATH = os.path.join(HERE, "baselines.json")
+
+DEFAULT_CONFIG = {
+    "assets": 20000,
+    "album_size": 2000,
+    "asset_size": 4 * 1024 * 1024,
+    "downloads": 32,
+    "uploads": 16,
+    "concurrency": 4,
+    "latency": 0.002,
+    "bandwidth": None,
+    "tmpdir": None,
+}
+
+
+class Recorder:
+    """Collects per-operation latencies and transferred bytes for one scenario."""
+    def __init__(self):
+        self.latencies = []
+        self.bytes = 0
+        self.items = 0
+        self.extra = {}
+
+    def timed(self, func, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.latencies.append(time.perf_counter() - start)
+
+
+def _timed_session(client, recorder):
+    """Record the latency of every HTTP request issued by the client."""
+    request = client.session.request
+
+    def wrapper(*args, **kwargs):
+        return recorder.timed(request, *args, **kwargs)
+
+    client.session.request = wrapper
+
+
+# Scenarios: each takes (client, config, recorder) and fills the recorder.
+# Throughput is reported in recorder items per second, and in MB/s when bytes are recorded.
+
+def bench_list(client, config, recorder):
+    """Page through the whole library with iter_assets, keeping every asset dict in memory."""
+    # Uncompressed, so the numbers isolate client-side parsing (see the list-<encoding> scenarios)
+    client.set_compression(None)
+    _timed_session(client, recorder)
+    assets = list(client.iter_assets())
+    recorder.items = len(assets)
+
+
+def bench_list_typed(client, config, recorder):
+    """Same as 'list' but keeping compact Asset records."""
+    client.set_compression(None)
+    _timed_session(client, recorder)
+    assets = list(client.iter_assets(typed=True))
+    recorder.items = len(assets)
+
+
+def _bench_list_encoded(encoding):
+    def bench(client, config, recorder):
+        """Page through the library with the given response encoding, recording wire and decoded sizes."""
+        from immich_lib.profiling import PhaseStats
+
+        client.set_compression(None if encoding == "identity" else encoding)
+        client.stats = PhaseStats()
+        _timed_session(client, recorder)
+        for _ in client.iter_assets():
+            recorder.items += 1
+        transfer = client.stats.as_dict()["transfer"]
+        recorder.bytes = transfer["wire_bytes"]
+        recorder.extra = {
+            "wire_mb": transfer["wire_bytes"] / (1024 * 1024),
+            "decoded_mb": transfer["decoded_bytes"] / (1024 * 1024),
+        }
+    return bench
+
+
+def bench_album(client, config, recorder):
+    """Fetch an album with its embedded assets repeatedly."""
+    client.set_compression(None)
+    _timed_session(client, recorder)
+    for _ in range(20):
+        recorder.items += len(client.get_album("album-0")["assets"])
+
+
+def bench_download(client, config, recorder):
+    """Download originals to disk with a thread pool."""
+    from immich_lib.utils import run_concurrently
+
+    with tempfile.TemporaryDirectory(dir=config["tmpdir"]) as tmp:
+        def download(index):
+            path = os.path.join(tmp, f"{index}.jpg")
+            recorder.timed(client.download_asset, f"asset-{index}", path)
+            return os.path.getsize(path)
+
+        sizes = run_concurrently(download, range(config["downloads"]), config["concurrency"])
+    recorder.items = len(sizes)
+    recorder.bytes = sum(sizes)
+
+
+def _legacy_download(client, asset_id, output_path):
+    """The original download loop (8 KB iter_content chunks, one progress update per chunk)."""
+    from tqdm import tqdm
+
+    response = client.get(f"assets/{asset_id}/original", stream=True)
+    total_size = int(response.headers.get("content-length", 0))
+    with open(output_path, "wb") as f:
+        with tqdm(total=total_size, unit="B", unit_scale=True, desc=os.path.basename(output_path)) as pbar:
+            for chunk in response.iter_content(chunk_size=8192):
+                if chunk:
+                    f.write(chunk)
+                    pbar.update(len(chunk))
+    return True
+
+
+def bench_download_legacy(client, config, recorder):
+    """Same as 'download' but with the original 8 KB copy loop, for comparison."""
+    from immich_lib.utils import run_concurrently
+
+    with tempfile.TemporaryDirectory(dir=config["tmpdir"]) as tmp:
+        def download(index):
+            path = os.path.join(tmp, f"{index}.jpg")
+            recorder.timed(_legacy_download, client, f"asset-{index}", path)
+            return os.path.getsize(path)
+
+        sizes = run_concurrently(download, range(config["downloads"]), config["concurrency"])
+    recorder.items = len(sizes)
+    recorder.bytes = sum(sizes)
+
+
+def bench_upload(client, config, recorder):
+    """Upload local files with a thread pool."""
+    from immich_lib.utils import run_concurrently
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for index in range(config["uploads"]):
+            path = os.path.join(tmp, f"upload-{index}.jpg")
+            with open(path, "wb") as f:
+                f.write(os.urandom(1024) * (config["asset_size"] // 1024))
+            paths.append(path)
+
+        def upload(path):
+            recorder.timed(client.upload_asset, path, deviceAssetId=os.path.basename(path), deviceId="bench")
+            return os.path.getsize(path)
+
+        sizes = run_concurrently(upload, paths, config["concurrency"])
+    recorder.items = len(sizes)
+    recorder.bytes = sum(sizes)
+
+
+SCENARIOS = {
+    "list": bench_list,
+    "list-typed": bench_list_typed,
+    "list-identity": _bench_list_encoded("identity"),
+    "list-gzip": _bench_list_encoded("gzip"),
+    "list-br": _bench_list_encoded("br"),
+    "list-zstd": _bench_list_encoded("zstd"),
+    "album": bench_album,
+    "download": bench_download,
+    "download-legacy": bench_download_legacy,
+    "upload": bench_upload,
+}
+
+
+def peak_rss_mb():
+    """Peak resident set size of the current process in MB, or None if unavailable."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a list of numbers."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+
+def run_child(name, url, config):
+    """Run one scenario in this process and return its metrics."""
+    from immich_lib.client import ImmichClient
+
+    client = ImmichClient(url, "benchmark-key")
+    recorder = Recorder()
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    SCENARIOS[name](client, config, recorder)
+    elapsed = time.perf_counter() - start
+    cpu = time.process_time() - cpu_start
+    result = {
+        "seconds": elapsed,
+        "items": recorder.items,
+        "throughput": recorder.items / elapsed if elapsed else None,
+        "p50_ms": _ms(percentile(recorder.latencies, 0.50)),
+        "p95_ms": _ms(percentile(recorder.latencies, 0.95)),
+        "p99_ms": _ms(percentile(recorder.latencies, 0.99)),
+        "peak_rss_mb": peak_rss_mb(),
+        "cpu_s": cpu,
+    }
+    if recorder.bytes:
+        result["mb_per_s"] = recorder.bytes / (1024 * 1024) / elapsed
+    result.update(recorder.extra)
+    return {key: round(value, 3) if isinstance(value, float) else value for key, value in result.items()}
+
+
+def _ms(seconds):
+    return None if seconds is None else seconds * 1000
+
+
+def run_scenario(name, url, config, repeat):
+    """Run a scenario `repeat` times in subprocesses and return the median of each metric."""
+    runs = []
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", name, "--url", url,
+             "--config", json.dumps(config)],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True,
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(f"Scenario {name} failed:\n{proc.stderr}")
+        runs.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+    return {
+        key: statistics.median(run[key] for run in runs) if runs[0][key] is not None else None
+        for key in runs[0]
+    }
+
+
+def find_regressions(results, baselines, tolerance):
+    """
+    Compare results with saved baselines.
+
+    Returns:
+        list: Human-readable descriptions of every metric that got worse than the tolerance allows.
+    """
+    problems = []
+    for name, result in results.items():
+        base = baselines.get("scenarios", {}).get(name)
+        if not base:
+            continue
+        checks = [("throughput", -1), ("mb_per_s", -1), ("p95_ms", 1), ("peak_rss_mb", 1)]
+        for key, direction in checks:
+            old, new = base.get(key), result.get(key)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if change * direction > tolerance:
+                problems.append(f"{name}: {key} {old:.1f} -> {new:.1f} ({change:+.0%})")
+    return problems
+
+
+def print_report(results, baselines):
+    header = (f"{'scenario':<16}{'items/s':>12}{'MB/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+              f"{'RSS MB':>10}{'CPU s':>8}{'wire MB':>10}")
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        def fmt(key, width, digits=1):
+            value = r.get(key)
+            return f"{value:>{width}.{digits}f}" if value is not None else f"{'-':>{width}}"
+        print(f"{name:<16}{fmt('throughput', 12)}{fmt('mb_per_s', 10)}{fmt('p50_ms', 10)}"
+              f"{fmt('p95_ms', 10)}{fmt('p99_ms', 10)}{fmt('peak_rss_mb', 10)}{fmt('cpu_s', 8, 2)}{fmt('wire_mb', 10)}")
+        base = baselines.get("scenarios", {}).get(name)
+        if base and base.get("throughput") and r.get("throughput"):
+            print(f"{'':<16}{r['throughput'] / base['throughput']:>11.2f}x vs baseline")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Run immich-lib benchmarks against a local fake server")
+    parser.add_argument("scenarios", nargs="*", help=f"Scenarios to run (default: all of {', '.join(SCENARIOS)})")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per scenario; the median is reported")
+    parser.add_argument("--assets", type=int, default=DEFAULT_CONFIG["assets"], help="Assets in the fake library")
+    parser.add_argument("--asset-size", type=int, default=DEFAULT_CONFIG["asset_size"], help="Bytes per original file")
+    parser.add_argument("--latency", type=float, default=DEFAULT_CONFIG["latency"], help="Server latency in seconds")
+    parser.add_argument("--bandwidth", type=float, default=DEFAULT_CONFIG["bandwidth"],
+                        help="Per-connection bandwidth limit in bytes per second")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONFIG["concurrency"],
+                        help="Worker threads for download/upload")
+    parser.add_argument("--tmpdir", help="Directory for downloaded files (e.g. /dev/shm to take the disk out)")
+    parser.add_argument("--save", action="store_true", help="Store the results as the new baselines")
+    parser.add_argument("--check", action="store_true", help="Fail if results regressed against the baselines")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative regression (default 0.25)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--url", help=argparse.SUPPRESS)
+    parser.add_argument("--config", help=argparse.SUPPRESS)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+    if args.child:
+        print(json.dumps(run_child(args.child, args.url, json.loads(args.config))))
+        return 0
+
+    config = dict(
+        DEFAULT_CONFIG,
+        assets=args.assets,
+        asset_size=args.asset_size,
+        latency=args.latency,
+        bandwidth=args.bandwidth,
+        concurrency=args.concurrency,
+        tmpdir=args.tmpdir,
+    )
+    baselines = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH) as f:
+            baselines = json.load(f)
+    if args.check and baselines.get("config") not in (None, config):
+        print("Warning: baselines were recorded with a different configuration.", file=sys.stderr)
+
+    results = {}
+    server = FakeImmichServer(
+        asset_count=config["assets"],
+        album_size=config["album_size"],
+        asset_size=config["asset_size"],
+        latency=config["latency"],
+        bandwidth=config["bandwidth"],
+    )
+    from immich_lib.base import supported_encodings
+
+    encodings = supported_encodings()
+    with server:
+        for name in args.scenarios or list(SCENARIOS):
+            encoding = name[len("list-"):]
+            if name.startswith("list-") and encoding in ("br", "zstd") and encoding not in encodings:
+                print(f"Skipping {name}: no {encoding} decoder installed", file=sys.stderr)
+                continue
+            results[name] = run_scenario(name, server.url, config, args.repeat)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_report(results, baselines)
+
+    if args.save:
+        saved = dict(baselines.get("scenarios", {}), **results)
+        with open(BASELINE_PATH, "w") as f:
+            json.dump({"config": config, "python": sys.version.split()[0], "scenarios": saved}, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baselines written to {BASELINE_PATH}")
+
+    if args.check:
+        problems = find_regressions(results, baselines, args.tolerance)
+        for problem in problems:
+            print(f"REGRESSION {problem}", file=sys.stderr)
+        return 1 if problems else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
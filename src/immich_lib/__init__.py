@@ -1,3 +1,10 @@
-from .client import ImmichClient
-
 __all__ = ["ImmichClient"]
+
+
+def __getattr__(name):
+    # Resolve the client lazily so importing the package (e.g. for the CLI) does
+    # not pull in requests and every API mixin up front.
+    if name == "ImmichClient":
+        from .client import ImmichClient
+        return ImmichClient
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
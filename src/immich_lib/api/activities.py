@@ -1,4 +1,53 @@
 from ..base import ImmichBaseClient
+from ..utils import run_concurrently
+import json
+import os
+import time
+
+ROLLUP_CACHE_VERSION = 1
+
+
+def _load_rollup_cache(path):
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        data = json.load(f)
+    return data.get("albums", {}) if data.get("version") == ROLLUP_CACHE_VERSION else {}
+
+
+def _save_rollup_cache(path, entries):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"version": ROLLUP_CACHE_VERSION, "albums": entries}, f)
+    os.replace(tmp_path, path)
+
+
+def summarize_activities(activities):
+    """
+    Aggregate a list of activities.
+
+    Args:
+        activities (list): Activities as returned by get_activities.
+
+    Returns:
+        dict: {"comments", "likes", "users": {user name or id: activity count}, "lastActivity"}.
+    """
+    summary = {"comments": 0, "likes": 0, "users": {}, "lastActivity": None}
+    for activity in activities:
+        if activity.get("type") == "like":
+            summary["likes"] += 1
+        else:
+            summary["comments"] += 1
+        user = activity.get("user") or {}
+        name = user.get("name") or user.get("email") or user.get("id") or "unknown"
+        summary["users"][name] = summary["users"].get(name, 0) + 1
+        created = activity.get("createdAt")
+        if created and (summary["lastActivity"] is None or created > summary["lastActivity"]):
+            summary["lastActivity"] = created
+    return summary
 
 class ActivitiesMixin(ImmichBaseClient):
     """
@@ -32,3 +81,88 @@ class ActivitiesMixin(ImmichBaseClient):
         params = {"albumId": album_id}
         if asset_id: params["assetId"] = asset_id
         return self.get("activities/statistics", params=params)
+
+    def rollup_activity_statistics(self, album_ids=None, details=False, concurrency=8, cache_path=None, max_age=None):
+        """
+        Collect like and comment counts for many albums concurrently.
+
+        Results are cached per album together with the album's updatedAt, so later
+        runs only query albums that changed. Adding a comment or like does not
+        necessarily change an album's updatedAt; use `max_age` to bound how stale a
+        cached count may get.
+
+        Args:
+            album_ids (list, optional): Albums to include; None for all owned and shared albums.
+            details (bool): Count from each album's full activity list instead, adding per-user
+                counts and the time of the latest activity.
+            concurrency (int): Number of albums queried in parallel.
+            cache_path (str, optional): JSON file caching results between runs.
+            max_age (float, optional): Seconds after which a cached result is refreshed anyway.
+
+        Returns:
+            dict: {"albums": [per-album statistics, most engaged first],
+            "totals": {"comments", "likes"}, "queried": int, "cached": int, "failed": int}.
+        """
+        albums = {album["id"]: album for album in self.list_albums()}
+        if album_ids is None:
+            album_ids = list(albums)
+        cache = _load_rollup_cache(cache_path)
+        now = time.time()
+
+        results, todo = {}, []
+        for album_id in album_ids:
+            album = albums.get(album_id, {})
+            entry = cache.get(album_id)
+            fresh = (
+                entry is not None
+                and album.get("updatedAt") is not None
+                and entry["updatedAt"] == album.get("updatedAt")
+                and (not details or "users" in entry["stats"])
+                and (max_age is None or now - entry["fetchedAt"] < max_age)
+            )
+            if fresh:
+                results[album_id] = entry["stats"]
+            else:
+                todo.append(album_id)
+        cached_count = len(results)
+
+        def fetch(album_id):
+            try:
+                if details:
+                    # The full list has everything the statistics endpoint counts, and more
+                    return summarize_activities(self.get_activities(album_id))
+                statistics = self.get_activity_statistics(album_id)
+                # Older servers only count comments
+                return {"comments": statistics.get("comments", 0), "likes": statistics.get("likes")}
+            except Exception as e:
+                print(f"Error fetching activity statistics of album {album_id}: {e}")
+                return None
+
+        failed = 0
+        for album_id, stats in zip(todo, run_concurrently(fetch, todo, concurrency)):
+            if stats is None:
+                failed += 1
+                continue
+            results[album_id] = stats
+            updated_at = albums.get(album_id, {}).get("updatedAt")
+            if updated_at is not None:
+                cache[album_id] = {"updatedAt": updated_at, "fetchedAt": now, "stats": stats}
+
+        if cache_path:
+            # Forget albums that no longer exist
+            _save_rollup_cache(cache_path, {k: v for k, v in cache.items() if k in albums})
+
+        rows = []
+        for album_id, stats in results.items():
+            rows.append(dict(stats, albumId=album_id, albumName=albums.get(album_id, {}).get("albumName")))
+        rows.sort(key=lambda row: (-(row["comments"] + (row["likes"] or 0)), row["albumName"] or ""))
+        return {
+            "albums": rows,
+            "totals": {
+                "comments": sum(row["comments"] for row in rows),
+                "likes": sum(row["likes"] or 0 for row in rows),
+            },
+            "queried": len(todo),
+            "cached": cached_count,
+            "failed": failed,
+        }
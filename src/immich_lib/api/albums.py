@@ -1,23 +1,30 @@
 from ..base import ImmichBaseClient
+from ..models import Album, Asset
+from ..utils import iter_json_array
+
+STREAM_CHUNK = 64 * 1024
+
 
 class AlbumsMixin(ImmichBaseClient):
     """
     Mixin for Albums related endpoints, handling album lifecycle and sharing.
     """
-    def list_albums(self, shared=None):
+    def list_albums(self, shared=None, typed=False):
         """
         List albums. If shared is None, merges owned and shared albums.
 
         Args:
             shared (bool, optional): Filter by shared status. 
                                      True for shared, False for owned, None for all.
+            typed (bool): Return compact Album records instead of dictionaries.
 
         Returns:
-            list: A list of album data dictionaries.
+            list: A list of album data dictionaries (or Album records).
         """
         if shared is not None:
             params = {"shared": "true" if shared else "false"}
-            return self.get("albums", params=params)
+            albums = self.get("albums", params=params)
+            return Album.from_list(albums) if typed else albums
         
         # Merge owned and shared by default
         owned = self.get("albums", params={"shared": "false"})
@@ -27,7 +34,8 @@ class AlbumsMixin(ImmichBaseClient):
         for a in shared_list:
             if a['id'] not in album_map:
                 album_map[a['id']] = a
-        return list(album_map.values())
+        albums = list(album_map.values())
+        return Album.from_list(albums) if typed else albums
 
     def create_album(self, album_name, asset_ids=None, description=None):
         """
@@ -46,17 +54,65 @@ class AlbumsMixin(ImmichBaseClient):
         if description: data["description"] = description
         return self.post("albums", json=data)
 
-    def get_album(self, album_id):
+    def get_album(self, album_id, typed=False, without_assets=False):
         """
         Get details of a specific album.
 
         Args:
             album_id (str): The UUID of the album.
+            typed (bool): Return an Album record (with Asset records) instead of a dictionary.
+            without_assets (bool): Omit the embedded asset list (use iter_album_assets to walk it).
 
         Returns:
-            dict: Album metadata including the list of assets.
+            dict | Album: Album metadata including the list of assets.
+        """
+        if without_assets:
+            album = self.get(f"albums/{album_id}", params={"withoutAssets": "true"})
+        else:
+            album = self.get(f"albums/{album_id}")
+        return Album.from_dict(album) if typed else album
+
+    def iter_album_assets(self, album_id, page_size=1000, typed=False, album=None, **kwargs):
         """
-        return self.get(f"albums/{album_id}")
+        Iterate over the assets of an album without holding the whole list in memory.
+
+        Unshared albums are paged through search/metadata. That search only covers
+        your own assets and those of partners shown in your timeline, so shared
+        albums (whose other members can add assets of their own), and albums where
+        the search returned fewer assets than the album's assetCount, are read from
+        GET albums/{id} instead, decoding its asset list one item at a time.
+
+        Args:
+            album_id (str): The UUID of the album.
+            page_size (int): Number of assets requested per page.
+            typed (bool): Yield compact Asset records instead of dictionaries.
+            album (dict, optional): Album metadata already fetched with get_album
+                (without_assets=True), to avoid requesting it again.
+            **kwargs: Additional search/metadata filters (e.g., withExif). Filters other
+                than withExif are not applied to albums read through GET albums/{id}.
+
+        Yields:
+            dict | Asset: Asset data dictionaries (or Asset records).
+        """
+        if album is None:
+            album = self.get_album(album_id, without_assets=True)
+        seen = set()
+        if not album.get("shared") and not album.get("albumUsers"):
+            for asset in self.iter_assets(page_size=page_size, typed=typed, albumIds=[album_id], **kwargs):
+                seen.add(asset.id if typed else asset["id"])
+                yield asset
+            # Filtered listings are legitimately shorter than the album
+            extra_filters = set(kwargs) - {"withExif"}
+            if extra_filters or len(seen) >= (album.get("assetCount") or 0):
+                return
+
+        response = self.get(f"albums/{album_id}", stream=True)
+        try:
+            for asset in iter_json_array(response.iter_content(chunk_size=STREAM_CHUNK), "assets"):
+                if asset["id"] not in seen:
+                    yield Asset.from_dict(asset) if typed else asset
+        finally:
+            response.close()
 
     def update_album(self, album_id, album_name=None, description=None, album_thumbnail_asset_id=None):
         """
@@ -1,5 +1,9 @@
 from ..base import ImmichBaseClient
+from ..models import Asset
+import io
 import os
+import time
+from contextlib import nullcontext
 try:
     from tqdm import tqdm
 except ImportError:
@@ -9,11 +13,85 @@ except ImportError:
         def __exit__(self, *args): pass
         def update(self, *args): pass
 
+DOWNLOAD_MIN_CHUNK = 256 * 1024
+DOWNLOAD_MAX_CHUNK = 8 * 1024 * 1024
+DOWNLOAD_GROW_SECONDS = 0.05
+PROGRESS_STEP = 4 * 1024 * 1024
+
+
+def _supports_readinto(response):
+    """Whether the body can be read straight from the raw stream (no content decoding needed)."""
+    encoding = response.headers.get('content-encoding', 'identity').lower()
+    return isinstance(getattr(response, 'raw', None), io.IOBase) and encoding in ('', 'identity')
+
+
+def _posix_call(name, f, *args):
+    """Call an optional os.posix_* file hint, ignoring platforms and filesystems without it."""
+    func = getattr(os, name, None)
+    if func is None:
+        return
+    try:
+        func(f.fileno(), *args)
+    except OSError:
+        pass
+
+
+class _BatchedProgress:
+    """Forward byte counts to a progress bar (if any) in PROGRESS_STEP batches, and to a throttle on every read."""
+    def __init__(self, pbar, client, throttle=None):
+        self.pbar = pbar
+        self.client = client
+        self.throttle = throttle
+        self.pending = 0
+
+    def update(self, count):
+        if self.throttle is not None:
+            self.throttle(count)
+        self.pending += count
+        if self.pending >= PROGRESS_STEP:
+            self.flush()
+
+    def flush(self):
+        if self.pending and self.pbar is not None:
+            with self.client.measure("progress"):
+                self.pbar.update(self.pending)
+        self.pending = 0
+
+
+class _SyncPolicy:
+    """Apply the fsync / drop_cache options of download_asset."""
+    def __init__(self, f, fsync, drop_cache):
+        self.f = f
+        # bool is an int subclass, so check it first: True means "at the end only"
+        self.every = fsync if fsync and not isinstance(fsync, bool) else 0
+        self.enabled = bool(fsync)
+        self.drop_cache = drop_cache
+        self.unsynced = 0
+        self.synced = 0
+
+    def wrote(self, count):
+        self.unsynced += count
+        if self.every and self.unsynced >= self.every:
+            self.sync()
+
+    def sync(self):
+        self.f.flush()
+        os.fsync(self.f.fileno())
+        if self.drop_cache:
+            _posix_call("posix_fadvise", self.f, self.synced, self.unsynced, getattr(os, "POSIX_FADV_DONTNEED", 4))
+        self.synced += self.unsynced
+        self.unsynced = 0
+
+    def finish(self):
+        if self.enabled:
+            self.sync()
+
+
 class AssetsMixin(ImmichBaseClient):
     """
     Mixin for Assets related endpoints, handling listing, downloading, and uploading.
     """
-    def list_assets(self, **kwargs):
+    def list_assets(self, typed=False, **kwargs):
         """
         List assets based on metadata filters.
 
@@ -21,24 +99,52 @@ class AssetsMixin(ImmichBaseClient):
         with empty query as it respects API key restrictions better.
 
         Args:
+            typed (bool): Return compact Asset records instead of dictionaries.
             **kwargs: Filtering parameters (e.g., isFavorite, type).
 
         Returns:
-            list: A list of asset data dictionaries.
+            list: A list of asset data dictionaries (or Asset records).
+        """
+        items = self.post("search/metadata", json=kwargs).get('assets', {}).get('items', [])
+        return Asset.from_list(items) if typed else items
+
+    def iter_assets(self, page_size=1000, typed=False, **kwargs):
+        """
+        Iterate over assets matching metadata filters, one search page at a time.
+
+        Only a single page is held in memory, so this is the preferred way to walk
+        large libraries.
+
+        Args:
+            page_size (int): Number of assets requested per page (server maximum is 1000).
+            typed (bool): Yield compact Asset records instead of dictionaries.
+            **kwargs: Filtering parameters (e.g., isFavorite, type, tagIds, albumIds).
+
+        Yields:
+            dict | Asset: Asset data dictionaries (or Asset records).
         """
-        return self.post("search/metadata", json=kwargs).get('assets', {}).get('items', [])
+        page = 1
+        while page:
+            data = dict(kwargs, page=page, size=page_size)
+            result = self.post("search/metadata", json=data).get('assets', {})
+            for asset in result.get('items', []):
+                yield Asset.from_dict(asset) if typed else asset
+            next_page = result.get('nextPage')
+            page = int(next_page) if next_page else None
 
-    def get_asset_info(self, asset_id):
+    def get_asset_info(self, asset_id, typed=False):
         """
         Get metadata for a specific asset.
 
         Args:
             asset_id (str): The UUID of the asset.
+            typed (bool): Return an Asset record instead of a dictionary.
 
         Returns:
-            dict: Asset metadata.
+            dict | Asset: Asset metadata.
         """
-        return self.get(f"assets/{asset_id}")
+        info = self.get(f"assets/{asset_id}")
+        return Asset.from_dict(info) if typed else info
 
     def update_asset(self, asset_id, **kwargs):
         """
@@ -53,26 +159,43 @@ class AssetsMixin(ImmichBaseClient):
         """
         return self.put(f"assets/{asset_id}", json=kwargs)
 
-    def delete_assets(self, ids):
+    def delete_assets(self, ids, force=False):
         """
         Delete multiple assets.
 
         Args:
             ids (list): List of asset UUIDs to delete.
+            force (bool): Delete permanently instead of moving to the trash.
 
         Returns:
             bool: True if deletion was successful (204 No Content).
         """
-        return self.delete("assets", json={"ids": ids})
+        data = {"ids": ids}
+        if force:
+            data["force"] = True
+        return self.delete("assets", json=data)
 
-    def download_asset(self, asset_id, output_path=None, stream=True):
+    def download_asset(self, asset_id, output_path=None, stream=True, preallocate=False, fsync=False, drop_cache=False,
+                       throttle=None, progress=True):
         """
         Download high-quality/original asset.
 
+        The body is copied with large, adaptively growing reads into a reused buffer
+        and progress is reported in batches, so multi-GB videos cost a few thousand
+        Python-level iterations instead of millions.
+
         Args:
             asset_id (str): The UUID of the asset.
             output_path (str, optional): Local path to save the file. If None, returns the response object.
             stream (bool): Whether to stream the download. Defaults to True.
+            preallocate (bool): Reserve the full file size up front with posix_fallocate (reduces fragmentation).
+            fsync (bool | int): True to fsync once the file is written, or a byte count to fsync
+                every that many bytes (bounds the amount of unwritten data in the page cache).
+            drop_cache (bool): After each fsync, advise the kernel to evict the written pages
+                (keeps bulk downloads from flushing the page cache).
+            throttle (callable, optional): Called with the size of every read before the next
+                one, e.g. TokenBucket.consume to share a bandwidth limit.
+            progress (bool): Show a progress bar. Defaults to True.
 
         Returns:
             bool | requests.Response: True if saved to file, or the Response object if no path provided.
@@ -81,19 +204,66 @@ class AssetsMixin(ImmichBaseClient):
         if not output_path:
             return response
         
-        # If output_path is provided, handle the streaming save
+        # If output_path is provided, stream into a .part file and move it into place once complete,
+        # so a failed transfer never leaves a truncated or zero-filled (preallocated) file behind
+        part_path = output_path + ".part"
         try:
             total_size = int(response.headers.get('content-length', 0))
-            with open(output_path, 'wb') as f:
-                with tqdm(total=total_size, unit='B', unit_scale=True, desc=os.path.basename(output_path)) as pbar:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        if chunk:
-                            f.write(chunk)
-                            pbar.update(len(chunk))
+            with open(part_path, 'wb') as f:
+                if preallocate and total_size:
+                    _posix_call("posix_fallocate", f, 0, total_size)
+                sync = _SyncPolicy(f, fsync, drop_cache)
+                bar = tqdm(total=total_size, unit='B', unit_scale=True, desc=os.path.basename(output_path)) \
+                    if progress else nullcontext()
+                with bar as pbar:
+                    batched = _BatchedProgress(pbar, self, throttle)
+                    if _supports_readinto(response):
+                        self._copy_readinto(response.raw, f, batched, sync)
+                    else:
+                        self._copy_chunks(response, f, batched, sync)
+                    batched.flush()
+                sync.finish()
+            os.replace(part_path, output_path)
             return True
         except Exception as e:
             print(f"Error downloading asset {asset_id}: {e}")
+            if os.path.exists(part_path):
+                os.remove(part_path)
             return False
+        finally:
+            response.close()
+
+    def _copy_readinto(self, raw, f, progress, sync):
+        """Copy a raw response stream to a file through one reused, adaptively grown buffer."""
+        size = DOWNLOAD_MIN_CHUNK
+        view = memoryview(bytearray(size))
+        while True:
+            start = time.perf_counter()
+            with self.measure("http"):
+                count = raw.readinto(view)
+            if not count:
+                return
+            filled_quickly = count == size and time.perf_counter() - start < DOWNLOAD_GROW_SECONDS
+            with self.measure("write", count):
+                f.write(view[:count])
+            progress.update(count)
+            sync.wrote(count)
+            if filled_quickly and size < DOWNLOAD_MAX_CHUNK:
+                # Data arrives faster than we consume it: use bigger reads
+                size *= 2
+                view = memoryview(bytearray(size))
+
+    def _copy_chunks(self, response, f, progress, sync):
+        """Fallback copy loop for responses without a readable raw stream (or with content encoding)."""
+        chunks = response.iter_content(chunk_size=DOWNLOAD_MAX_CHUNK)
+        if self.stats is not None:
+            chunks = self.stats.timed_iter("http", chunks)
+        for chunk in chunks:
+            if chunk:
+                with self.measure("write", len(chunk)):
+                    f.write(chunk)
+                progress.update(len(chunk))
+                sync.wrote(len(chunk))
 
     def view_asset(self, asset_id, size="preview", edited=False):
         """
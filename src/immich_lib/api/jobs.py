@@ -1,4 +1,5 @@
 from ..base import ImmichBaseClient
+import time
 
 class JobsMixin(ImmichBaseClient):
     """
@@ -11,3 +12,99 @@ class JobsMixin(ImmichBaseClient):
     def run_job(self, job_id, command, force=False):
         """Send a command to a job (start, stop, etc.)"""
         return self.put(f"jobs/{job_id}", json={"command": command, "force": force})
+
+    def watch_jobs(self, job_ids=None, min_interval=0.5, max_interval=15.0, smoothing=0.3, deadline=None):
+        """
+        Poll job queues forever, yielding progress snapshots.
+
+        Polling is adaptive: the interval resets to min_interval whenever a watched
+        queue's counts change and doubles (up to max_interval) while they stay idle.
+
+        Args:
+            job_ids (str | list, optional): Queue names to watch (e.g., 'faceDetection'). Defaults to all.
+            min_interval (float): Seconds between polls while queues are moving.
+            max_interval (float): Upper bound for the interval while queues are idle.
+            smoothing (float): Weight of the latest sample in the throughput moving average.
+            deadline (float, optional): time.monotonic() value no sleep may extend past.
+
+        Yields:
+            dict: Per-queue snapshot keyed by job id, with 'active', 'waiting', 'failed',
+                  'pending' (active + waiting + delayed), 'isActive', 'rate' (items/sec)
+                  and 'eta' (seconds, or None when the rate is unknown).
+        """
+        if isinstance(job_ids, str):
+            job_ids = [job_ids]
+        previous = {}
+        rates = {}
+        interval = min_interval
+        while True:
+            now = time.monotonic()
+            snapshot = {}
+            changed = not previous
+            for job_id, job in self.list_jobs().items():
+                if job_ids and job_id not in job_ids:
+                    continue
+                counts = job.get('jobCounts', {})
+                pending = counts.get('active', 0) + counts.get('waiting', 0) + counts.get('delayed', 0)
+                done = counts.get('completed', 0) + counts.get('failed', 0)
+                rate = rates.get(job_id)
+                if job_id in previous:
+                    last_pending, last_done, last_time = previous[job_id]
+                    if (pending, done) != (last_pending, last_done):
+                        changed = True
+                    elapsed = now - last_time
+                    if elapsed > 0:
+                        sample = max(done - last_done, last_pending - pending, 0) / elapsed
+                        rate = sample if rate is None else smoothing * sample + (1 - smoothing) * rate
+                previous[job_id] = (pending, done, now)
+                rates[job_id] = rate
+                snapshot[job_id] = {
+                    "active": counts.get('active', 0),
+                    "waiting": counts.get('waiting', 0),
+                    "failed": counts.get('failed', 0),
+                    "pending": pending,
+                    "isActive": job.get('queueStatus', {}).get('isActive', False),
+                    "rate": rate or 0.0,
+                    "eta": pending / rate if rate else None,
+                }
+            yield snapshot
+            interval = min_interval if changed else min(interval * 2, max_interval)
+            if deadline is None:
+                time.sleep(interval)
+            else:
+                time.sleep(max(0.0, min(interval, deadline - time.monotonic())))
+
+    def wait_for_jobs(self, job_ids, timeout=None, **kwargs):
+        """
+        Block until the given job queues are drained.
+
+        A queue counts as finished once it reports no pending items and is inactive
+        on two consecutive polls, which rides out the delay between run_job and the
+        queue picking up work.
+
+        Args:
+            job_ids (str | list): Queue names to wait for.
+            timeout (float, optional): Maximum number of seconds to wait.
+            **kwargs: Polling options passed to watch_jobs.
+
+        Returns:
+            dict: The final snapshot of the watched queues.
+
+        Raises:
+            ValueError: If a job id is not one of the server's queues.
+            TimeoutError: If the queues are still busy when the timeout expires.
+        """
+        if isinstance(job_ids, str):
+            job_ids = [job_ids]
+        deadline = None if timeout is None else time.monotonic() + timeout
+        idle_polls = 0
+        for snapshot in self.watch_jobs(job_ids, deadline=deadline, **kwargs):
+            unknown = [job_id for job_id in job_ids if job_id not in snapshot]
+            if unknown:
+                raise ValueError(f"Unknown job ids: {', '.join(unknown)}")
+            idle = all(s['pending'] == 0 and not s['isActive'] for s in snapshot.values())
+            idle_polls = idle_polls + 1 if idle else 0
+            if idle_polls >= 2:
+                return snapshot
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f"Jobs still running after {timeout} seconds: {job_ids}")
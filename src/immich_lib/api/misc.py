@@ -1,4 +1,45 @@
 from ..base import ImmichBaseClient
+from ..utils import imap_ordered
+from array import array
+import sys
+
+
+def _compact_column(values):
+    """Convert a list of JSON scalars to the most compact container that holds them."""
+    kinds = {type(v) for v in values}
+    if kinds <= {bool}:
+        return array('b', values)
+    if kinds <= {int}:
+        return array('q', values)
+    if kinds <= {int, float, type(None)} and float in kinds:
+        return array('d', [float('nan') if v is None else v for v in values])
+    if kinds <= {str, type(None)}:
+        return [v if v is None else sys.intern(v) for v in values]
+    return values
+
+
+def decode_timeline_bucket(payload):
+    """
+    Decode a timeline bucket payload into compact columns.
+
+    Recent servers return buckets in columnar form (a list per field); older ones
+    return one dictionary per asset, which is transposed here. Boolean and numeric
+    columns become array.array instances and repeated strings are interned.
+
+    Args:
+        payload (dict | list): The body returned by the 'timeline/bucket' endpoint.
+
+    Returns:
+        dict: Column values keyed by field name, all of the same length.
+    """
+    if isinstance(payload, list):
+        fields = []
+        for asset in payload:
+            fields.extend(k for k in asset if k not in fields)
+        payload = {field: [asset.get(field) for asset in payload] for field in fields}
+    return {field: _compact_column(values) if isinstance(values, list) else values
+            for field, values in payload.items()}
+
 
 class MiscellaneousMixin(ImmichBaseClient):
     """
@@ -29,6 +70,44 @@ class MiscellaneousMixin(ImmichBaseClient):
         """
         return self.get("timeline/buckets", params=kwargs)
 
+    def get_timeline_bucket(self, time_bucket, **kwargs):
+        """
+        Retrieve the assets of a single timeline bucket.
+
+        Args:
+            time_bucket (str): The bucket start date as returned by get_timeline_buckets.
+            **kwargs: Bucket filtering options (e.g., albumId, isFavorite).
+
+        Returns:
+            dict | list: Columnar bucket payload (a list of assets on older servers).
+        """
+        return self.get("timeline/bucket", params=dict(kwargs, timeBucket=time_bucket))
+
+    def iter_timeline(self, size="MONTH", concurrency=4, **kwargs):
+        """
+        Iterate over the whole timeline in chronological order, fetching buckets in parallel.
+
+        Bucket bodies are decoded with decode_timeline_bucket, so each asset costs a few
+        array slots instead of a dictionary.
+
+        Args:
+            size (str): Bucket size ('MONTH' or 'DAY').
+            concurrency (int): Number of buckets fetched in parallel.
+            **kwargs: Filtering options applied to every request (e.g., albumId, userId).
+
+        Yields:
+            dict: {'timeBucket': str, 'count': int, 'columns': dict} for each bucket, oldest first.
+        """
+        params = dict(kwargs, size=size)
+        buckets = sorted(self.get_timeline_buckets(**params), key=lambda b: b['timeBucket'])
+
+        def fetch(bucket):
+            columns = decode_timeline_bucket(self.get_timeline_bucket(bucket['timeBucket'], **params))
+            return {"timeBucket": bucket['timeBucket'], "count": bucket.get('count', 0), "columns": columns}
+
+        for result in imap_ordered(fetch, buckets, concurrency):
+            yield result
+
     # API Keys
     def list_api_keys(self):
         """
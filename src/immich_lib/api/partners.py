@@ -1,4 +1,35 @@
 from ..base import ImmichBaseClient
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from queue import Full, Queue
+import base64
+import binascii
+import threading
+
+FIRST_SHARD_YEAR = 2000
+_DONE = object()
+
+
+def capture_year_windows(first_year=FIRST_SHARD_YEAR, last_year=None):
+    """
+    Split the timeline into one (takenAfter, takenBefore) window per year.
+
+    The first window is open-ended towards the past and the last towards the
+    future, so together they cover every asset exactly once.
+
+    Args:
+        first_year (int): First year with a window of its own.
+        last_year (int, optional): Last year with a window of its own. Defaults to the current year.
+
+    Returns:
+        list: (takenAfter, takenBefore) pairs of ISO timestamps, None for an open end.
+    """
+    last_year = last_year or datetime.now().year
+    bounds = [f"{year}-01-01T00:00:00.000Z" for year in range(first_year, last_year + 1)]
+    # takenBefore is inclusive, so stop 1 ms short of the next window
+    ends = [f"{year - 1}-12-31T23:59:59.999Z" for year in range(first_year, last_year + 1)]
+    return list(zip([None] + bounds, ends + [None]))
+
 
 class PartnersMixin(ImmichBaseClient):
     """
@@ -53,3 +84,112 @@ class PartnersMixin(ImmichBaseClient):
             bool: True if partner relationship was successfully removed (204 No Content).
         """
         return self.delete(f"partners/{partner_id}")
+
+    def iter_combined_library(self, concurrency=4, dedupe=True, page_size=1000, report=None, **kwargs):
+        """
+        Stream the assets of your library and of every partner sharing with you, each unique file once.
+
+        Immich's metadata search already spans your library and the partners shown in your
+        timeline, so the listing is split into capture-year windows fetched concurrently.
+        Duplicates (the same file in several libraries) are detected with binary 20-byte
+        checksums and resolved the same way whatever order the windows arrive in: your own
+        copy wins, otherwise the partner copy with the lowest asset id. Your assets are
+        streamed as they are listed (Immich keeps checksums unique per owner); partner assets
+        are held back until the listing ends. Every asset is tagged with an 'owner' label.
+
+        Args:
+            concurrency (int): Number of windows listed in parallel.
+            dedupe (bool): Yield only one asset for each checksum.
+            page_size (int): search/metadata page size.
+            report (dict, optional): Filled with "listed", "duplicates", "owners" ({label: count})
+                and "hidden" (partners not shown in your timeline, whose assets are not included).
+            **kwargs: Extra search/metadata filters (e.g., type, isFavorite).
+
+        Yields:
+            dict: Asset data with an added 'owner' key (the owner's email, or name or id).
+        """
+        me = self.get_me()
+        owners = {me["id"]: me.get("email") or me.get("name") or me["id"]}
+        hidden = []
+        for partner in self.list_partners("shared-with-me"):
+            label = partner.get("email") or partner.get("name") or partner["id"]
+            owners[partner["id"]] = label
+            if partner.get("inTimeline") is False:
+                hidden.append(label)
+        if report is None:
+            report = {}
+        report.update(listed=0, duplicates=0, owners={}, hidden=hidden)
+
+        queue = Queue(maxsize=page_size * 2)
+        stop = threading.Event()
+
+        def put(item):
+            # Give up once the consumer has stopped iterating, instead of blocking forever
+            while not stop.is_set():
+                try:
+                    queue.put(item, timeout=0.5)
+                    return True
+                except Full:
+                    pass
+            return False
+
+        def list_window(window):
+            after, before = window
+            filters = dict(kwargs)
+            if after:
+                filters["takenAfter"] = after
+            if before:
+                filters["takenBefore"] = before
+            try:
+                for asset in self.iter_assets(page_size=page_size, **filters):
+                    if not put(asset):
+                        return
+            finally:
+                put(_DONE)
+
+        def tag_owner(asset):
+            owner = owners.get(asset.get("ownerId"), asset.get("ownerId"))
+            asset["owner"] = owner
+            report["owners"][owner] = report["owners"].get(owner, 0) + 1
+            return asset
+
+        windows = capture_year_windows()
+        seen = set()
+        # Best partner copy per checksum, kept until no own copy can turn up
+        pending = {}
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            futures = [executor.submit(list_window, window) for window in windows]
+            remaining = len(windows)
+            try:
+                while remaining:
+                    asset = queue.get()
+                    if asset is _DONE:
+                        remaining -= 1
+                        continue
+                    report["listed"] += 1
+                    if dedupe:
+                        try:
+                            key = base64.b64decode(asset.get("checksum") or "") or asset["id"]
+                        except (binascii.Error, ValueError):
+                            key = asset["id"]
+                        if key in seen:
+                            report["duplicates"] += 1
+                            continue
+                        if asset.get("ownerId") != me["id"] and key != asset["id"]:
+                            held = pending.get(key)
+                            if held is not None:
+                                report["duplicates"] += 1
+                            if held is None or asset["id"] < held["id"]:
+                                pending[key] = asset
+                            continue
+                        seen.add(key)
+                        if pending.pop(key, None) is not None:
+                            report["duplicates"] += 1
+                    yield tag_owner(asset)
+            finally:
+                stop.set()
+            # Surface listing errors once every window has finished
+            for future in futures:
+                future.result()
+        for asset in sorted(pending.values(), key=lambda asset: asset["id"]):
+            yield tag_owner(asset)
@@ -1,32 +1,41 @@
 from ..base import ImmichBaseClient
+from ..models import Person
 
 class PeopleMixin(ImmichBaseClient):
     """
     Mixin for People related endpoints, handling facial recognition results and person metadata.
     """
-    def get_all_people(self, with_hidden=False):
+    def get_all_people(self, with_hidden=False, typed=False):
         """
         Retrieve a list of all detected people who are not hidden.
 
         Args:
             with_hidden (bool): Whether to include people marked as hidden.
+            typed (bool): Convert the 'people' list to Person records.
 
         Returns:
             dict: Response containing the list of people.
         """
-        return self.get("people", params={"withHidden": with_hidden})
+        result = self.get("people", params={"withHidden": with_hidden})
+        if typed:
+            if isinstance(result, list):
+                return Person.from_list(result)
+            result = dict(result, people=Person.from_list(result.get('people')))
+        return result
 
-    def get_person(self, person_id):
+    def get_person(self, person_id, typed=False):
         """
         Get information about a specific person by their UUID.
 
         Args:
             person_id (str): The UUID of the person.
+            typed (bool): Return a Person record instead of a dictionary.
 
         Returns:
-            dict: Person metadata (name, thumbnail, etc.).
+            dict | Person: Person metadata (name, thumbnail, etc.).
         """
-        return self.get(f"people/{person_id}")
+        person = self.get(f"people/{person_id}")
+        return Person.from_dict(person) if typed else person
 
     def update_person(self, person_id, **kwargs):
         """
@@ -1,4 +1,134 @@
 from ..base import ImmichBaseClient
+from ..utils import import_numpy, parse_datetime, run_concurrently
+from collections import namedtuple
+import os
+
+RAW_EXTENSIONS = {
+    ".3fr", ".arw", ".cr2", ".cr3", ".crw", ".dng", ".erf", ".iiq", ".kdc", ".mos",
+    ".mrw", ".nef", ".nrw", ".orf", ".pef", ".raf", ".raw", ".rw2", ".sr2", ".srf",
+    ".srw", ".x3f",
+}
+
+StackCandidate = namedtuple("StackCandidate", "id timestamp device stem ext size")
+
+
+def to_stack_candidate(asset):
+    """
+    Reduce an asset dictionary to the compact record used by the auto-stacker.
+
+    Args:
+        asset (dict): Asset data as returned by search/metadata with EXIF.
+
+    Returns:
+        StackCandidate | None: The record, or None if the asset has no usable timestamp.
+    """
+    exif = asset.get('exifInfo') or {}
+    taken = parse_datetime(
+        exif.get('dateTimeOriginal') or asset.get('localDateTime') or asset.get('fileCreatedAt')
+    )
+    if taken is None:
+        return None
+    make_model = " ".join(filter(None, (exif.get('make'), exif.get('model'))))
+    stem, ext = os.path.splitext(asset.get('originalFileName', ''))
+    return StackCandidate(
+        asset['id'],
+        taken.timestamp(),
+        make_model or asset.get('deviceId') or "",
+        stem.lower(),
+        ext.lower(),
+        exif.get('fileSizeInByte') or 0,
+    )
+
+
+def _group_boundaries(keys, times, max_gap):
+    """Return the sort order and, for each sorted position, whether it starts a new group."""
+    np = import_numpy()
+    if np is not None:
+        codes = {}
+        key_codes = np.fromiter((codes.setdefault(k, len(codes)) for k in keys), dtype=np.int64, count=len(keys))
+        times = np.asarray(times, dtype=np.float64)
+        order = np.lexsort((times, key_codes))
+        sorted_codes = key_codes[order]
+        sorted_times = times[order]
+        starts = np.empty(len(order), dtype=bool)
+        starts[:1] = True
+        starts[1:] = (sorted_codes[1:] != sorted_codes[:-1]) | (np.diff(sorted_times) > max_gap)
+        return order.tolist(), starts.tolist()
+
+    order = sorted(range(len(keys)), key=lambda i: (keys[i], times[i]))
+    starts = []
+    previous = None
+    for i in order:
+        starts.append(previous is None or keys[i] != keys[previous] or times[i] - times[previous] > max_gap)
+        previous = i
+    return order, starts
+
+
+def _choose_primary(group, rule):
+    """Pick the primary record of a group according to the configured rule."""
+    if callable(rule):
+        return rule(group)
+    if rule == "first":
+        return min(group, key=lambda c: c.timestamp)
+    if rule == "largest":
+        return max(group, key=lambda c: (c.size, -c.timestamp))
+    if rule == "raw":
+        return min(group, key=lambda c: (c.ext not in RAW_EXTENSIONS, c.timestamp))
+    if rule == "jpeg":
+        return min(group, key=lambda c: (c.ext in RAW_EXTENSIONS, c.timestamp))
+    raise ValueError(f"Unknown primary rule: {rule}")
+
+
+def group_stack_candidates(candidates, mode="burst", max_gap=1.0, primary="jpeg"):
+    """
+    Group compact asset records into stacks.
+
+    Records are sorted by device and capture time; a new group starts whenever the
+    device changes or the gap to the previous shot exceeds max_gap. Uses NumPy for
+    the sort and comparisons when it is installed.
+
+    Args:
+        candidates (list): StackCandidate records.
+        mode (str): 'burst' stacks consecutive shots from one device,
+                    'raw' only stacks files sharing a name stem (RAW+JPEG pairs).
+        max_gap (float): Maximum number of seconds between two shots of the same group.
+        primary (str | callable): 'jpeg', 'raw', 'first', 'largest', or a callable
+                                  receiving the group's records and returning one of them.
+
+    Returns:
+        list: Dictionaries with 'primaryAssetId' and 'assetIds' (primary first).
+    """
+    if mode == "burst":
+        keys = [c.device for c in candidates]
+    elif mode == "raw":
+        keys = [(c.device, c.stem) for c in candidates]
+    else:
+        raise ValueError(f"Unknown stacking mode: {mode}")
+
+    order, starts = _group_boundaries(keys, [c.timestamp for c in candidates], max_gap)
+    groups = []
+    current = []
+    for i, start in zip(order, starts):
+        if start and current:
+            groups.append(current)
+            current = []
+        current.append(candidates[i])
+    if current:
+        groups.append(current)
+
+    stacks = []
+    for group in groups:
+        if len(group) < 2:
+            continue
+        if mode == "raw" and len({c.ext for c in group}) < 2:
+            continue
+        chosen = _choose_primary(group, primary)
+        stacks.append({
+            "primaryAssetId": chosen.id,
+            "assetIds": [chosen.id] + [c.id for c in group if c.id != chosen.id],
+        })
+    return stacks
+
 
 class StacksMixin(ImmichBaseClient):
     """
@@ -66,3 +196,38 @@ class StacksMixin(ImmichBaseClient):
             bool: True if removal was successful (204 No Content).
         """
         return self.delete(f"stacks/{stack_id}/assets/{asset_id}")
+
+    def auto_stack(self, mode="burst", max_gap=1.0, primary="jpeg", dry_run=False, concurrency=4, **kwargs):
+        """
+        Detect bursts or RAW+JPEG pairs across the library and stack them.
+
+        Assets are streamed page by page and reduced to compact records before
+        grouping, so memory stays proportional to the number of images. Assets that
+        already belong to a stack are skipped.
+
+        Args:
+            mode (str): 'burst' or 'raw' (see group_stack_candidates).
+            max_gap (float): Maximum number of seconds between shots of one stack.
+            primary (str | callable): Rule used to choose each stack's primary asset.
+            dry_run (bool): Only compute the stacks without creating them.
+            concurrency (int): Number of create requests in flight.
+            **kwargs: Extra search/metadata filters (e.g., takenAfter, albumIds).
+
+        Returns:
+            list: The planned stacks, as dictionaries with 'primaryAssetId' and 'assetIds'.
+        """
+        filters = dict({"type": "IMAGE", "withExif": True, "withStacked": True}, **kwargs)
+        candidates = []
+        for asset in self.iter_assets(**filters):
+            if asset.get('stack') or asset.get('isTrashed'):
+                continue
+            candidate = to_stack_candidate(asset)
+            if candidate is not None:
+                candidates.append(candidate)
+
+        stacks = group_stack_candidates(candidates, mode=mode, max_gap=max_gap, primary=primary)
+        if not dry_run:
+            run_concurrently(
+                lambda s: self.create_stack(s["primaryAssetId"], s["assetIds"]), stacks, concurrency
+            )
+        return stacks
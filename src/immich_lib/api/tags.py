@@ -1,17 +1,83 @@
 from ..base import ImmichBaseClient
+from ..models import Tag
+from ..utils import chunked, run_concurrently
+
+def normalize_tag_path(path):
+    """Strip surrounding and repeated separators from a tag path."""
+    return "/".join(part.strip() for part in path.split("/") if part.strip())
+
+
+class TagIndex:
+    """
+    In-memory lookup tables for the user's tags.
+
+    Attributes:
+        by_id (dict): Tag metadata keyed by tag UUID.
+        by_path (dict): Tag UUID keyed by full hierarchical path (e.g. 'Parent/Child').
+        children (dict): List of child tag UUIDs keyed by parent UUID (None for root tags).
+    """
+    def __init__(self, tags):
+        """
+        Build the index from a list of tag metadata dictionaries.
+
+        Args:
+            tags (list): Tags as returned by the 'tags' endpoint.
+        """
+        self.by_id = {tag['id']: tag for tag in tags}
+        self.by_path = {}
+        self.children = {}
+        for tag in tags:
+            self.by_path[self._path_of(tag)] = tag['id']
+            self.children.setdefault(tag.get('parentId'), []).append(tag['id'])
+
+    def _path_of(self, tag):
+        """Return the full path of a tag, rebuilding it from parents if 'value' is missing."""
+        if tag.get('value'):
+            return normalize_tag_path(tag['value'])
+        parts = [tag['name']]
+        parent = self.by_id.get(tag.get('parentId'))
+        while parent is not None:
+            parts.append(parent['name'])
+            parent = self.by_id.get(parent.get('parentId'))
+        return "/".join(reversed(parts))
+
+    def resolve(self, path):
+        """
+        Return the UUID of the tag at the given path, or None if it does not exist.
+
+        Args:
+            path (str): Full tag path such as 'Parent/Child'.
+        """
+        return self.by_path.get(normalize_tag_path(path))
+
+    def get_children(self, tag_id=None):
+        """
+        Return the metadata of the direct children of a tag.
+
+        Args:
+            tag_id (str, optional): The parent tag UUID. None lists root tags.
+        """
+        return [self.by_id[child] for child in self.children.get(tag_id, [])]
+
 
 class TagsMixin(ImmichBaseClient):
     """
     Mixin for Tags related endpoints, managing custom tags and asset assignments.
     """
-    def list_tags(self):
+    _tag_index = None
+
+    def list_tags(self, typed=False):
         """
         Get all tags created by the user.
 
+        Args:
+            typed (bool): Return Tag records instead of dictionaries.
+
         Returns:
             list: List of tag metadata.
         """
-        return self.get("tags")
+        tags = self.get("tags")
+        return Tag.from_list(tags) if typed else tags
 
     def create_tag(self, name, type="TEXT"):
         """
@@ -24,19 +90,23 @@ class TagsMixin(ImmichBaseClient):
         Returns:
             dict: The created tag metadata.
         """
-        return self.post("tags", json={"name": name, "type": type})
+        result = self.post("tags", json={"name": name, "type": type})
+        self._tag_index = None
+        return result
 
-    def get_tag(self, tag_id):
+    def get_tag(self, tag_id, typed=False):
         """
         Get metadata for a specific tag.
 
         Args:
             tag_id (str): The UUID of the tag.
+            typed (bool): Return a Tag record instead of a dictionary.
 
         Returns:
-            dict: Tag metadata.
+            dict | Tag: Tag metadata.
         """
-        return self.get(f"tags/{tag_id}")
+        tag = self.get(f"tags/{tag_id}")
+        return Tag.from_dict(tag) if typed else tag
 
     def update_tag(self, tag_id, name):
         """
@@ -49,7 +119,9 @@ class TagsMixin(ImmichBaseClient):
         Returns:
             dict: The updated tag metadata.
         """
-        return self.patch(f"tags/{tag_id}", json={"name": name})
+        result = self.patch(f"tags/{tag_id}", json={"name": name})
+        self._tag_index = None
+        return result
 
     def delete_tag(self, tag_id):
         """
@@ -61,7 +133,71 @@ class TagsMixin(ImmichBaseClient):
         Returns:
             bool: True if deletion was successful (204 No Content).
         """
-        return self.delete(f"tags/{tag_id}")
+        result = self.delete(f"tags/{tag_id}")
+        self._tag_index = None
+        return result
+
+    def upsert_tags(self, paths):
+        """
+        Create any tags in the given list of paths that do not exist yet, including parents.
+
+        Args:
+            paths (list): Full tag paths such as 'Parent/Child'.
+
+        Returns:
+            list: Metadata for every requested tag, existing or newly created.
+        """
+        result = self.put("tags", json={"tags": list(paths)})
+        self._tag_index = None
+        return result
+
+    def get_tag_index(self, refresh=False):
+        """
+        Get the cached tag index, fetching the tag list on first use.
+
+        The index is invalidated by create_tag, update_tag, delete_tag and upsert_tags,
+        so lookups issued between those calls never hit the API.
+
+        Args:
+            refresh (bool): Force a reload from the server.
+
+        Returns:
+            TagIndex: Lookup tables by id, by full path and by parent.
+        """
+        if refresh or self._tag_index is None:
+            self._tag_index = TagIndex(self.list_tags())
+        return self._tag_index
+
+    def resolve_tag(self, path):
+        """
+        Get the UUID of a tag from its full path.
+
+        Args:
+            path (str): Full tag path such as 'Parent/Child'.
+
+        Returns:
+            str | None: The tag UUID, or None if no such tag exists.
+        """
+        return self.get_tag_index().resolve(path)
+
+    def ensure_tags(self, paths):
+        """
+        Resolve tag paths to UUIDs, creating all missing tags with a single request.
+
+        Args:
+            paths (iterable): Full tag paths such as 'Parent/Child'.
+
+        Returns:
+            dict: Tag UUID keyed by the normalized path.
+        """
+        wanted = {normalize_tag_path(p) for p in paths}
+        wanted.discard("")
+        index = self.get_tag_index()
+        missing = sorted(p for p in wanted if index.resolve(p) is None)
+        if missing:
+            self.upsert_tags(missing)
+            index = self.get_tag_index()
+        return {path: index.resolve(path) for path in wanted}
 
     def tag_assets(self, tag_id, asset_ids):
         """
@@ -88,3 +224,99 @@ class TagsMixin(ImmichBaseClient):
             bool: True if removal was successful (204 No Content).
         """
         return self.delete(f"tags/{tag_id}/assets", json={"ids": asset_ids})
+
+    def get_tagged_asset_ids(self, tag_id):
+        """
+        Get the UUIDs of all assets currently carrying a tag.
+
+        Args:
+            tag_id (str): The UUID of the tag.
+
+        Returns:
+            set: Asset UUIDs.
+        """
+        return {asset['id'] for asset in self.iter_assets(tagIds=[tag_id])}
+
+    def plan_tag_assignments(self, assignments, current=None, prune=False, concurrency=4, assets=None):
+        """
+        Compute the minimal tag changes needed to reach the desired asset tags.
+
+        The asset->tags mapping is inverted into tag->assets sets and diffed against
+        the current assignments, so a plan for an unchanged library is empty.
+        Missing tags are created with ensure_tags.
+
+        Args:
+            assignments (dict): Iterable of tag paths keyed by asset UUID.
+            current (dict, optional): Set of asset UUIDs keyed by tag UUID. When omitted it is
+                                      fetched concurrently with paged searches: one per desired
+                                      tag, or, with prune, one per existing tag.
+            prune (bool): Also untag listed assets from any existing tag they should
+                          no longer carry. Without it, tags are only ever added.
+            concurrency (int): Number of parallel requests when fetching current assignments.
+            assets (list, optional): Asset dictionaries (with 'id' and 'tags') of the listed
+                                     assets, used with prune instead of searching every tag.
+
+        Returns:
+            dict: {'add': {tag_id: [asset_ids]}, 'remove': {tag_id: [asset_ids]}}.
+        """
+        tag_ids = self.ensure_tags({path for paths in assignments.values() for path in paths})
+        desired = {}
+        for asset_id, paths in assignments.items():
+            for path in paths:
+                tag_id = tag_ids.get(normalize_tag_path(path))
+                if tag_id:
+                    desired.setdefault(tag_id, set()).add(asset_id)
+
+        relevant = set(desired)
+        if prune:
+            if current is None and assets is not None:
+                # Only the listed assets can change, so their own tags are the whole picture
+                current = {}
+                for asset in assets:
+                    if asset and asset.get("id") in assignments:
+                        for tag in asset.get("tags") or []:
+                            current.setdefault(tag["id"], set()).add(asset["id"])
+            elif current is None:
+                # Any existing tag may carry a listed asset; paging through each tag costs
+                # requests per tag rather than one lookup per listed asset
+                ordered = sorted(self.get_tag_index().by_id)
+                fetched = run_concurrently(self.get_tagged_asset_ids, ordered, concurrency)
+                current = dict(zip(ordered, fetched))
+            relevant.update(tag_id for tag_id, ids in current.items() if not ids.isdisjoint(assignments))
+        if current is None:
+            ordered = sorted(relevant)
+            fetched = run_concurrently(self.get_tagged_asset_ids, ordered, concurrency)
+            current = dict(zip(ordered, fetched))
+
+        plan = {"add": {}, "remove": {}}
+        for tag_id in relevant:
+            wanted = desired.get(tag_id, set())
+            existing = current.get(tag_id, set())
+            to_add = wanted - existing
+            if to_add:
+                plan["add"][tag_id] = sorted(to_add)
+            if prune:
+                to_remove = {a for a in existing if a in assignments} - wanted
+                if to_remove:
+                    plan["remove"][tag_id] = sorted(to_remove)
+        return plan
+
+    def apply_tag_plan(self, plan, chunk_size=1000, concurrency=4):
+        """
+        Execute a plan from plan_tag_assignments with chunked, concurrent calls.
+
+        Args:
+            plan (dict): The plan to execute.
+            chunk_size (int): Maximum number of asset UUIDs per request.
+            concurrency (int): Number of requests in flight.
+
+        Returns:
+            int: Number of API calls issued.
+        """
+        calls = []
+        for tag_id, asset_ids in plan.get("add", {}).items():
+            calls.extend((self.tag_assets, tag_id, chunk) for chunk in chunked(asset_ids, chunk_size))
+        for tag_id, asset_ids in plan.get("remove", {}).items():
+            calls.extend((self.untag_assets, tag_id, chunk) for chunk in chunked(asset_ids, chunk_size))
+        run_concurrently(lambda call: call[0](call[1], call[2]), calls, concurrency)
+        return len(calls)
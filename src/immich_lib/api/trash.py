@@ -1,4 +1,14 @@
+from datetime import datetime, timedelta, timezone
 from ..base import ImmichBaseClient
+from ..utils import imap_ordered
+try:
+    from tqdm import tqdm
+except ImportError:
+    class tqdm:
+        def __init__(self, *args, **kwargs): pass
+        def __enter__(self): return self
+        def __exit__(self, *args): pass
+        def update(self, *args): pass
 
 class TrashMixin(ImmichBaseClient):
     """
@@ -13,6 +23,103 @@ class TrashMixin(ImmichBaseClient):
         """
         return self.get("trash")
 
+    def iter_trash(self, page_size=1000, older_than=None, typed=False, **kwargs):
+        """
+        Iterate over trashed assets one search page at a time.
+
+        Args:
+            page_size (int): Number of assets requested per page.
+            older_than (datetime.timedelta | datetime.datetime | int | float, optional): Only
+                assets trashed before this point; numbers are a number of days.
+            typed (bool): Yield compact Asset records instead of dictionaries.
+            **kwargs: Extra search/metadata filters (e.g., type="VIDEO").
+
+        Yields:
+            dict | Asset: Trashed assets.
+        """
+        if older_than is None:
+            older_than = timedelta(0)
+        if isinstance(older_than, (int, float)):
+            older_than = timedelta(days=older_than)
+        if isinstance(older_than, timedelta):
+            older_than = datetime.now(timezone.utc) - older_than
+        # trashedBefore makes the server return trashed assets only, instead of
+        # every live asset that withDeleted alone would include
+        kwargs["withDeleted"] = True
+        kwargs["trashedBefore"] = older_than.isoformat()
+        for asset in self.iter_assets(page_size=page_size, typed=typed, **kwargs):
+            # Safety net in case the server ignores trashedBefore
+            if asset.is_trashed if typed else asset.get("isTrashed"):
+                yield asset
+
+    def purge_trash(self, older_than=None, filter=None, asset_type=None, chunk_size=500,
+                    concurrency=4, dry_run=False, page_size=1000):
+        """
+        Permanently delete selected trashed assets in concurrent batches.
+
+        The trash is streamed page by page, so only the ids of matched assets are
+        kept in memory. Because deletions shift the search pages, the listing is
+        repeated until a pass finds nothing new.
+
+        Args:
+            older_than (datetime.timedelta | datetime.datetime | int | float, optional): Only
+                purge assets trashed before this point; numbers are a number of days.
+            filter (callable, optional): Predicate on the asset dictionary; only assets for
+                which it returns True are purged.
+            asset_type (str, optional): Only purge assets of this type ('IMAGE', 'VIDEO', ...).
+            chunk_size (int): Number of assets per delete request.
+            concurrency (int): Number of delete requests in flight.
+            dry_run (bool): Only count the matching assets.
+            page_size (int): Search page size used for the listing.
+
+        Returns:
+            dict: {"matched": int, "deleted": int, "failed": int}.
+        """
+        filters = {"type": asset_type} if asset_type else {}
+        seen = set()
+
+        def select():
+            for asset in self.iter_trash(page_size=page_size, older_than=older_than, **filters):
+                if asset["id"] not in seen and (filter is None or filter(asset)):
+                    seen.add(asset["id"])
+                    yield asset["id"]
+
+        def chunks():
+            while True:
+                found = False
+                batch = []
+                for asset_id in select():
+                    found = True
+                    batch.append(asset_id)
+                    if len(batch) >= chunk_size:
+                        yield batch
+                        batch = []
+                if batch:
+                    yield batch
+                if not found:
+                    return
+
+        if dry_run:
+            for _ in select():
+                pass
+            return {"matched": len(seen), "deleted": 0, "failed": 0}
+
+        def purge(ids):
+            try:
+                self.delete_assets(ids, force=True)
+                return len(ids), 0
+            except Exception as e:
+                print(f"Error purging {len(ids)} assets: {e}")
+                return 0, len(ids)
+
+        deleted = failed = 0
+        with tqdm(unit="asset", desc="Purging trash") as pbar:
+            for ok, bad in imap_ordered(purge, chunks(), concurrency):
+                deleted += ok
+                failed += bad
+                pbar.update(ok + bad)
+        return {"matched": len(seen), "deleted": deleted, "failed": failed}
+
     def empty_trash(self):
         """
         Permanently delete all items currently in the trash.
@@ -0,0 +1,300 @@
+"""
+Whole-server backup: list and download every user's library concurrently.
+
+Each user gets a listing thread that pages through search/metadata into a small
+bounded queue. A shared pool of download workers takes jobs from the users' queues
+round-robin, so a user with a huge library cannot starve the others, and all
+workers draw from one bandwidth budget. mirror_library does the same for one
+account's own and partner libraries, fetching each unique file once.
+"""
+
+import os
+import threading
+import time
+from queue import Empty, Queue
+from .utils import imap_ordered
+
+LISTING_BUFFER = 2000
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket limiting throughput to `rate` units per second.
+
+    Args:
+        rate (float | None): Sustained rate (e.g. bytes per second); None disables limiting.
+        burst (float, optional): Bucket capacity. Defaults to one second worth of tokens.
+    """
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or rate
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def consume(self, amount):
+        """Block until `amount` tokens are available, then take them."""
+        if not self.rate:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                # Requests larger than the bucket are allowed to drive it negative
+                if self.tokens >= min(amount, self.capacity):
+                    self.tokens -= amount
+                    return
+                wait = (min(amount, self.capacity) - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class _UserState:
+    """Listing queue and counters of one user during a backup."""
+    def __init__(self, name, client):
+        self.name = name
+        self.client = client
+        self.queue = Queue(maxsize=LISTING_BUFFER)
+        self.listing_done = False
+        self.report = {
+            "user": name,
+            "listed": 0,
+            "downloaded": 0,
+            "skipped": 0,
+            "failed": 0,
+            "bytes": 0,
+            "seconds": 0.0,
+            "error": None,
+        }
+        self.started = time.perf_counter()
+        self.active = 0
+
+
+def backup_path(root, user, asset):
+    """
+    Destination of an asset: <root>/<user>/<YYYY-MM>/<name>_<id prefix><ext>.
+
+    The id prefix keeps paths unique and stable between runs, so unchanged assets
+    can be skipped by comparing sizes.
+    """
+    month = (asset.get("fileCreatedAt") or "unknown")[:7]
+    stem, ext = os.path.splitext(asset.get("originalFileName") or asset["id"])
+    safe_user = user.replace(os.sep, "_")
+    return os.path.join(root, safe_user, month, f"{stem}_{asset['id'][:8]}{ext}")
+
+
+def fetch_asset(client, asset, path, bucket=None):
+    """
+    Download an asset's original to `path` unless a file of the expected size is already there.
+
+    The copy goes through ImmichClient.download_asset, which writes next to the
+    destination and renames once complete, so an interrupted run never leaves a
+    truncated file behind.
+
+    Args:
+        client (ImmichClient): Client with access to the asset.
+        asset (dict): Asset data (needs 'id'; exifInfo.fileSizeInByte enables skipping).
+        path (str): Destination file.
+        bucket (TokenBucket, optional): Shared bandwidth budget.
+
+    Returns:
+        tuple: ('downloaded' | 'skipped' | 'failed', bytes written).
+    """
+    expected = (asset.get("exifInfo") or {}).get("fileSizeInByte")
+    if expected and os.path.exists(path) and os.path.getsize(path) == expected:
+        return "skipped", 0
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    throttle = bucket.consume if bucket is not None else None
+    try:
+        if not client.download_asset(asset["id"], path, throttle=throttle, progress=False):
+            return "failed", 0
+    except Exception as e:
+        print(f"Error backing up {asset['id']} to {path}: {e}")
+        return "failed", 0
+    return "downloaded", os.path.getsize(path)
+
+
+class BackupOrchestrator:
+    """
+    Back up several users' libraries with one global concurrency and bandwidth budget.
+
+    Attributes:
+        users (list): Per-user state, in scheduling order.
+    """
+    def __init__(self, clients, output, concurrency=8, bandwidth=None, page_size=1000):
+        """
+        Args:
+            clients (dict): Authenticated clients keyed by user label.
+            output (str): Root directory of the backup.
+            concurrency (int): Total number of parallel downloads across all users.
+            bandwidth (float, optional): Global download limit in bytes per second.
+            page_size (int): search/metadata page size used for listings.
+        """
+        self.users = [_UserState(name, client) for name, client in clients.items()]
+        self.output = output
+        self.concurrency = concurrency
+        self.bucket = TokenBucket(bandwidth)
+        self.page_size = page_size
+        self.cursor = 0
+        self.cond = threading.Condition()
+
+    def _list(self, user):
+        try:
+            for asset in user.client.iter_assets(page_size=self.page_size, withExif=True):
+                user.report["listed"] += 1
+                # Blocks while the buffer is full, so listing never runs far ahead of downloads
+                user.queue.put(asset)
+                with self.cond:
+                    self.cond.notify()
+        except Exception as e:
+            user.report["error"] = str(e)
+        finally:
+            with self.cond:
+                user.listing_done = True
+                self.cond.notify_all()
+
+    def _next_job(self):
+        """Take the next asset, rotating over users; None once every user is exhausted."""
+        with self.cond:
+            while True:
+                pending = False
+                for offset in range(len(self.users)):
+                    user = self.users[(self.cursor + offset) % len(self.users)]
+                    try:
+                        asset = user.queue.get_nowait()
+                    except Empty:
+                        pending = pending or not user.listing_done
+                        continue
+                    self.cursor = (self.cursor + offset + 1) % len(self.users)
+                    user.active += 1
+                    return user, asset
+                if not pending:
+                    return None
+                self.cond.wait(0.5)
+
+    def _download(self, user, asset):
+        """Download one asset; returns ('downloaded' | 'skipped' | 'failed', bytes written)."""
+        return fetch_asset(user.client, asset, backup_path(self.output, user.name, asset), self.bucket)
+
+    def _work(self):
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            user, asset = job
+            outcome, written = "failed", 0
+            try:
+                outcome, written = self._download(user, asset)
+            finally:
+                with self.cond:
+                    user.report[outcome] += 1
+                    user.report["bytes"] += written
+                    user.active -= 1
+                    if user.listing_done and not user.active and user.queue.empty():
+                        user.report["seconds"] = time.perf_counter() - user.started
+
+    def run(self):
+        """
+        Run the backup to completion.
+
+        Returns:
+            dict: {"users": [per-user report], "totals": {...}, "seconds": float}.
+        """
+        start = time.perf_counter()
+        listers = [threading.Thread(target=self._list, args=(user,), daemon=True) for user in self.users]
+        workers = [threading.Thread(target=self._work, daemon=True) for _ in range(max(1, self.concurrency))]
+        for thread in listers + workers:
+            thread.start()
+        for thread in listers + workers:
+            thread.join()
+
+        reports = [user.report for user in self.users]
+        for report in reports:
+            if not report["seconds"]:
+                report["seconds"] = time.perf_counter() - start
+        totals = {
+            key: sum(report[key] for report in reports)
+            for key in ("listed", "downloaded", "skipped", "failed", "bytes")
+        }
+        return {"users": reports, "totals": totals, "seconds": time.perf_counter() - start}
+
+
+def resolve_credentials(admin_client, credentials):
+    """
+    Match per-user API keys against the server's user list.
+
+    Args:
+        admin_client (ImmichClient): Client used to list the server's users.
+        credentials (dict): API keys keyed by user email, name or id.
+
+    Returns:
+        tuple: ({email: api_key} for users with a key, [emails of users without one]).
+    """
+    matched, missing = {}, []
+    for user in admin_client.list_users():
+        key = None
+        for identifier in (user.get("email"), user.get("name"), user.get("id")):
+            if identifier in credentials:
+                key = credentials[identifier]
+                break
+        label = user.get("email") or user.get("id")
+        if key:
+            matched[label] = key
+        else:
+            missing.append(label)
+    return matched, missing
+
+
+def backup_all(clients, output, concurrency=8, bandwidth=None, page_size=1000):
+    """
+    Back up every given user's library into `output`.
+
+    Args:
+        clients (dict): Authenticated clients keyed by user label.
+        output (str): Root directory of the backup.
+        concurrency (int): Total number of parallel downloads across all users.
+        bandwidth (float, optional): Global download limit in bytes per second.
+        page_size (int): search/metadata page size used for listings.
+
+    Returns:
+        dict: Combined report (see BackupOrchestrator.run).
+    """
+    return BackupOrchestrator(clients, output, concurrency, bandwidth, page_size).run()
+
+
+def mirror_library(client, output, concurrency=8, bandwidth=None, page_size=1000, **kwargs):
+    """
+    Mirror your library and every partner library shared with you into `output`.
+
+    Assets come from ImmichClient.iter_combined_library, so a file present in
+    several family members' libraries is downloaded once, into your own folder
+    when you have a copy and otherwise into the folder of a single partner.
+
+    Args:
+        client (ImmichClient): Authenticated client.
+        output (str): Root directory of the mirror.
+        concurrency (int): Number of parallel downloads (and of listing windows).
+        bandwidth (float, optional): Download limit in bytes per second.
+        page_size (int): search/metadata page size used for the listing.
+        **kwargs: Extra search/metadata filters.
+
+    Returns:
+        dict: {"listed", "duplicates", "owners", "hidden", "downloaded", "skipped",
+        "failed", "bytes", "seconds"}.
+    """
+    start = time.perf_counter()
+    bucket = TokenBucket(bandwidth)
+    report = {}
+    assets = client.iter_combined_library(
+        concurrency=concurrency, page_size=page_size, report=report, withExif=True, **kwargs
+    )
+
+    def fetch(asset):
+        return fetch_asset(client, asset, backup_path(output, asset["owner"], asset), bucket)
+
+    report.update(downloaded=0, skipped=0, failed=0, bytes=0)
+    for outcome, written in imap_ordered(fetch, assets, concurrency):
+        report[outcome] += 1
+        report["bytes"] += written
+    report["seconds"] = time.perf_counter() - start
+    return report
@@ -1,25 +1,141 @@
 import requests
+import copy
+import json
 import os
+import threading
+import time
+from contextlib import nullcontext
+from datetime import timedelta
+from .endpoints import EndpointPool, GATEWAY_ERRORS, IDEMPOTENT_METHODS
+
+# Response encodings in order of preference (best ratio and decode speed first)
+ENCODING_PREFERENCE = ("zstd", "br", "gzip", "deflate")
+# Packages providing the optional decoders used by urllib3
+ENCODING_PACKAGES = {"zstd": "zstandard", "br": "brotli"}
+
+
+def supported_encodings():
+    """
+    Response encodings urllib3 can decode in this environment.
+
+    gzip and deflate are always available; br and zstd need the optional brotli
+    (or brotlicffi) and zstandard packages.
+
+    Returns:
+        list: Encoding names in order of preference.
+    """
+    try:
+        from urllib3.util.request import ACCEPT_ENCODING
+    except ImportError:
+        ACCEPT_ENCODING = "gzip,deflate"
+    available = {name.strip() for name in ACCEPT_ENCODING.split(",")}
+    return [name for name in ENCODING_PREFERENCE if name in available]
+
+
+def resolve_encodings(compression):
+    """
+    Turn a compression setting into the list of encodings to offer.
+
+    Args:
+        compression (str | list | None): "auto", None or "none", or encoding names
+            (a list or comma-separated string).
+
+    Returns:
+        list: Encoding names (empty to disable compression).
+
+    Raises:
+        ValueError: If an encoding is unknown or its decoder is not installed.
+    """
+    supported = supported_encodings()
+    if compression == "auto":
+        return supported
+    if compression in (None, "none", "identity"):
+        return []
+    if isinstance(compression, str):
+        compression = compression.split(",")
+    encodings = [name.strip().lower() for name in compression if name.strip()]
+    for name in encodings:
+        if name not in ENCODING_PREFERENCE:
+            raise ValueError(f"Unknown response encoding: {name}")
+        if name not in supported:
+            raise ValueError(
+                f"Response encoding '{name}' needs the {ENCODING_PACKAGES[name]} package; "
+                f"install it with 'pip install {ENCODING_PACKAGES[name]}'"
+            )
+    return encodings
+
+
+def _wire_bytes(response, decoded):
+    """Bytes of a fully read response body as received, before content decoding."""
+    read = getattr(response.raw, "tell", None)
+    try:
+        wire = read() if read is not None else None
+    except Exception:
+        wire = None
+    if isinstance(wire, int) and wire > 0:
+        return wire
+    try:
+        return int(response.headers.get("Content-Length"))
+    except (TypeError, ValueError):
+        return decoded
+
+
+class _Flight:
+    """An in-flight GET whose result is shared with identical concurrent calls."""
+    def __init__(self):
+        self.done = threading.Event()
+        self.followers = 0
+        self.copies = []
+        self.error = None
+
+
+def _copy_error(error):
+    """Copy an exception for another thread, falling back to a generic request error."""
+    try:
+        return copy.copy(error)
+    except Exception:
+        return requests.exceptions.RequestException(str(error))
+
 
 class ImmichBaseClient:
     """
     Base client for Immich API, handling authentication and low-level requests.
 
     Attributes:
-        server_url (str): The base URL of the Immich server.
+        server_url (str): The base URL of the Immich server (the endpoint that last answered
+            when several URLs are configured).
         api_url (str): The full URL for the API endpoints.
+        server_urls (list): All configured base URLs.
+        endpoints (EndpointPool | None): Health and latency tracking when several URLs are configured.
         headers (dict): Standard headers used for every request.
         session (requests.Session): Persistent session for HTTP requests.
+        stats (PhaseStats | None): When set, time spent per phase (HTTP, decode, ...) is recorded into it.
+        coalesce_gets (bool): Share one in-flight request between identical concurrent GETs (opt-in).
+        compression (list): Response encodings offered in Accept-Encoding (empty for none).
     """
-    def __init__(self, server_url, api_key):
+    # Connect timeout applied when failing over between several URLs, so a dead path is
+    # abandoned quickly instead of hanging until the OS gives up
+    connect_timeout = 3.05
+
+    def __init__(self, server_url, api_key, probe_interval=30.0, compression="auto", coalesce_gets=False):
         """
         Initialize the ImmichBaseClient.
 
         Args:
-            server_url (str): The base URL of the Immich server (e.g., http://immich.local:2283).
+            server_url (str | list): The base URL of the Immich server (e.g., http://immich.local:2283),
+                or several URLs reaching the same server (e.g. LAN and WAN). With several URLs,
+                requests go to the fastest healthy one and idempotent requests fail over to the others.
             api_key (str): The API key for authentication.
+            probe_interval (float): Seconds between background health probes of server/version
+                when several URLs are given (0 disables probing).
+            compression (str | list | None): Response encodings to accept (see set_compression).
+            coalesce_gets (bool): Let identical concurrent GETs share one in-flight request.
+                Off by default: a caller joining a request sent before its own write would
+                not see that write.
         """
-        self.server_url = server_url.rstrip("/")
+        urls = [server_url] if isinstance(server_url, str) else list(server_url)
+        self.server_urls = [url.rstrip("/") for url in urls]
+        self.server_url = self.server_urls[0]
         self.api_url = f"{self.server_url}/api"
         self.headers = {
             "x-api-key": api_key,
@@ -27,8 +143,159 @@ class ImmichBaseClient:
         }
         self.session = requests.Session()
         self.session.headers.update(self.headers)
+        self.set_compression(compression)
+        self.stats = None
+        self.coalesce_gets = coalesce_gets
+        self._flights = {}
+        self._flights_lock = threading.Lock()
+        self._coalescing = {"requests": 0, "coalesced": 0}
+        self.endpoints = None
+        if len(self.server_urls) > 1:
+            self.endpoints = EndpointPool(self.server_urls)
+            if probe_interval:
+                self.endpoints.start_probing(self.session, probe_interval)
+
+    def close(self):
+        """Stop background health probes and close the HTTP session."""
+        if self.endpoints is not None:
+            self.endpoints.stop()
+        self.session.close()
+
+    def set_compression(self, compression):
+        """
+        Choose the response encodings offered to the server.
+
+        Large JSON payloads (e.g. search/metadata pages) typically shrink 5-10x,
+        which matters on slow links; on a LAN, decompression may cost more CPU
+        than it saves in transfer time.
+
+        Args:
+            compression (str | list | None): "auto" for every encoding that can be
+                decoded here (zstd, br, gzip, deflate, best first), None or "none" to
+                disable compression, or encoding names (a list or comma-separated string).
+
+        Raises:
+            ValueError: If an encoding is unknown or its decoder is not installed.
+        """
+        self.compression = resolve_encodings(compression)
+        self.session.headers["Accept-Encoding"] = ", ".join(self.compression) or "identity"
+
+    def with_compression(self, compression):
+        """
+        Return a client sharing this one's session and caches but offering other encodings.
+
+        Unlike set_compression, this leaves the original client untouched, so it is
+        safe while other threads use it (e.g. commands served by the daemon).
+
+        Args:
+            compression (str | list | None): Encodings to accept (see set_compression).
+
+        Returns:
+            ImmichBaseClient: A shallow copy of the client.
+
+        Raises:
+            ValueError: If an encoding is unknown or its decoder is not installed.
+        """
+        client = copy.copy(self)
+        client.compression = resolve_encodings(compression)
+        return client
+
+    def measure(self, phase, nbytes=0):
+        """
+        Time a block of work under `phase` when instrumentation is enabled.
+
+        Args:
+            phase (str): Phase name ('http', 'decode', 'write', 'hash', 'progress').
+            nbytes (int): Bytes processed in the block.
+
+        Returns:
+            A context manager; a no-op one when `stats` is not set.
+        """
+        if self.stats is None:
+            return nullcontext()
+        return self.stats.measure(phase, nbytes)
+
+    def get_coalescing_stats(self):
+        """
+        Report how many GETs were sent and how many were served by an identical in-flight GET.
+
+        Returns:
+            dict: {"requests": int, "coalesced": int, "in_flight": int}.
+        """
+        with self._flights_lock:
+            return dict(self._coalescing, in_flight=len(self._flights))
 
     def _request(self, method, endpoint, **kwargs):
+        """
+        Perform a request, coalescing identical concurrent non-streaming GETs when enabled.
+
+        The first caller (the leader) sends the request; callers arriving while it is
+        in flight wait for it and receive a deep copy of its result (or a copy of its
+        exception), so a burst of identical lookups costs a single round trip. Any write
+        detaches the in-flight GETs, so a GET issued after a write never joins one sent
+        before it.
+
+        Args:
+            method (str): HTTP method (GET, POST, etc.).
+            endpoint (str): API endpoint relative to /api.
+            **kwargs: Additional arguments passed to requests.request.
+
+        Returns:
+            dict | bool | requests.Response: Parsed JSON, True if 204, or raw Response if streaming.
+
+        Raises:
+            requests.exceptions.HTTPError: If the request failed.
+        """
+        if not self.coalesce_gets:
+            return self._send(method, endpoint, **kwargs)
+        if method != "GET":
+            try:
+                return self._send(method, endpoint, **kwargs)
+            finally:
+                # The write may have changed what pending GETs are reading
+                with self._flights_lock:
+                    self._flights.clear()
+        if kwargs.get("stream"):
+            return self._send(method, endpoint, **kwargs)
+
+        key = (endpoint.lstrip("/"), json.dumps(kwargs, sort_keys=True, default=repr))
+        with self._flights_lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self._coalescing["requests"] += 1
+            else:
+                flight.followers += 1
+                self._coalescing["coalesced"] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                # Each waiter raises its own exception object; raising the shared one from
+                # several threads would interleave their tracebacks
+                raise _copy_error(flight.error) from flight.error
+            return flight.copies.pop()
+
+        result = None
+        try:
+            result = self._send(method, endpoint, **kwargs)
+            return result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._flights_lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+            if flight.error is None:
+                # Callers may mutate what they get back, so every follower gets its own
+                # copy, made before the leader's caller can touch the original
+                mutable = isinstance(result, (dict, list))
+                flight.copies = [copy.deepcopy(result) if mutable else result for _ in range(flight.followers)]
+            flight.done.set()
+
+    def _send(self, method, endpoint, **kwargs):
         """
         Internal helper to perform HTTP requests with error handling and response parsing.
 
@@ -43,12 +310,12 @@ class ImmichBaseClient:
         Raises:
             requests.exceptions.HTTPError: If the request failed.
         """
-        url = f"{self.api_url}/{endpoint.lstrip('/')}"
-        
         # Merge extra headers if provided
-        headers = kwargs.pop('headers', {})
+        headers = dict(kwargs.pop('headers', {}))
+        # Sent per request so clients sharing a session can offer different encodings
+        headers.setdefault('Accept-Encoding', ", ".join(self.compression) or "identity")
         
-        response = self.session.request(method, url, headers=headers, **kwargs)
+        response = self._send_http(method, endpoint.lstrip('/'), headers, kwargs)
         
         try:
             response.raise_for_status()
@@ -69,7 +336,47 @@ class ImmichBaseClient:
         if kwargs.get('stream') or 'application/json' not in response.headers.get('Content-Type', ''):
             return response
 
-        return response.json()
+        if self.stats is None:
+            return response.json()
+        decoded = len(response.content)
+        self.stats.add_transfer(_wire_bytes(response, decoded), decoded)
+        with self.stats.measure("decode", decoded):
+            return response.json()
+
+    def _send_http(self, method, path, headers, kwargs):
+        """Send the HTTP request, choosing and failing over between endpoints when several are configured."""
+        if self.endpoints is None:
+            with self.measure("http"):
+                return self.session.request(method, f"{self.api_url}/{path}", headers=headers, **kwargs)
+
+        kwargs.setdefault("timeout", (self.connect_timeout, None))
+        candidates = self.endpoints.candidates()
+        if method not in IDEMPOTENT_METHODS:
+            # The request may have reached the server, so it must not be replayed
+            candidates = candidates[:1]
+        for attempt, endpoint in enumerate(candidates):
+            is_last = attempt == len(candidates) - 1
+            start = time.perf_counter()
+            try:
+                with self.measure("http"):
+                    response = self.session.request(method, f"{endpoint.api_url}/{path}", headers=headers, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                self.endpoints.record_failure(endpoint)
+                if is_last:
+                    raise
+                continue
+            if response.status_code in GATEWAY_ERRORS:
+                self.endpoints.record_failure(endpoint)
+                if not is_last:
+                    response.close()
+                    continue
+                return response
+            # Time to headers, like the probes: a large body must not make a fast path look slow
+            elapsed = getattr(response, "elapsed", None)
+            latency = elapsed.total_seconds() if isinstance(elapsed, timedelta) else time.perf_counter() - start
+            self.endpoints.record_success(endpoint, latency)
+            self.server_url, self.api_url = endpoint.server_url, endpoint.api_url
+            return response
 
     def get(self, endpoint, **kwargs):
         """Perform a GET request."""
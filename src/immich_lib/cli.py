@@ -2,30 +2,51 @@ import os
 import sys
 import argparse
 import json
-from .client import ImmichClient
-
-# Try to import optional dependency (python-dotenv)
-try:
-    from dotenv import load_dotenv
-
-    load_dotenv()
-except ImportError:
-    # Optional dependency missing, attempt a simple manual check for .env
-    if os.path.exists(".env"):
-        with open(".env", "r") as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith("#"):
-                    if "=" in line:
-                        key, value = line.split("=", 1)
-                        value = value.strip().strip("'").strip('"')
-                        os.environ[key.strip()] = value
 
 # Global configuration from environment
 IMMICH_SERVER_URL = os.getenv("IMMICH_SERVER_URL")
 IMMICH_API_KEY = os.getenv("IMMICH_API_KEY")
 
 
+def __getattr__(name):
+    # ImmichClient pulls in requests, tqdm and every API mixin, so it is only
+    # imported once a subcommand actually needs a client.
+    if name == "ImmichClient":
+        from .client import ImmichClient
+        return ImmichClient
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def load_env():
+    """Load variables from a .env file into the environment"""
+    # Try to import optional dependency (python-dotenv)
+    try:
+        from dotenv import load_dotenv
+
+        load_dotenv()
+    except ImportError:
+        # Optional dependency missing, attempt a simple manual check for .env
+        if os.path.exists(".env"):
+            with open(".env", "r") as f:
+                for line in f:
+                    line = line.strip()
+                    if line and not line.startswith("#"):
+                        if "=" in line:
+                            key, value = line.split("=", 1)
+                            value = value.strip().strip("'").strip('"')
+                            os.environ[key.strip()] = value
+
+
+def create_client(url, key):
+    """Instantiate the API client, importing it on first use.
+
+    A comma-separated URL (e.g. "http://192.168.1.10:2283,https://photos.example.com")
+    configures several endpoints for the same server with automatic failover.
+    """
+    urls = [part.strip() for part in url.split(",") if part.strip()]
+    return getattr(sys.modules[__name__], "ImmichClient")(urls if len(urls) > 1 else url, key)
+
+
 def handle_check_auth(client, args):
     """Verify connection and API key validity"""
     info = client.check_auth()
@@ -37,31 +58,104 @@ def handle_check_auth(client, args):
         print("Authentication failed or connection error.")
 
 
+ALBUM_FIELDS = (["id", "albumName", "assetCount"], ["ID", "Name", "Assets"])
+ASSET_FIELDS = (["id", "originalFileName", "type"], ["ID", "File Name", "Type"])
+
+
+class RowWriter:
+    """
+    Write records to stdout one at a time as table, CSV or NDJSON rows.
+
+    Rows are emitted as soon as they are written, so output starts with the first
+    page of results and memory does not grow with the number of rows.
+
+    Attributes:
+        count (int): Number of rows written so far.
+    """
+    def __init__(self, fmt, fields=None, defaults=ASSET_FIELDS, stream=None):
+        """
+        Args:
+            fmt (str): 'table', 'csv' or 'ndjson'.
+            fields (list, optional): Dotted field paths to output. Defaults to the
+                                     command's table columns (whole records for ndjson).
+            defaults (tuple): Default (fields, table headers) of the command.
+            stream (io.TextIOBase, optional): Destination. Defaults to sys.stdout.
+        """
+        from .utils import get_field
+
+        self.get_field = get_field
+        self.fmt = fmt
+        self.fields = fields or (None if fmt == "ndjson" else defaults[0])
+        self.headers = defaults[1] if not fields else fields
+        self.stream = stream or sys.stdout
+        self.count = 0
+        self._csv = None
+        if self.fields:
+            # First column fits a UUID, middle columns are truncated, last is free-form
+            self._widths = [40] + [35] * (len(self.fields) - 2) + [0] if len(self.fields) > 1 else [0]
+
+    def _start(self):
+        if self.fmt == "table":
+            header = " | ".join(f"{h:<{w}}" if w else h for h, w in zip(self.headers, self._widths))
+            print(header, file=self.stream)
+            print("-" * 85, file=self.stream)
+        elif self.fmt == "csv":
+            import csv
+
+            self._csv = csv.writer(self.stream, lineterminator="\n")
+            self._csv.writerow(self.fields)
+
+    def write(self, record):
+        """Write a single record"""
+        if self.count == 0:
+            self._start()
+        self.count += 1
+        if self.fmt == "ndjson":
+            row = record if self.fields is None else {f: self.get_field(record, f) for f in self.fields}
+            self.stream.write(json.dumps(row, separators=(",", ":")) + "\n")
+        elif self.fmt == "csv":
+            values = [self.get_field(record, f) for f in self.fields]
+            self._csv.writerow(
+                ["" if v is None else json.dumps(v) if isinstance(v, (dict, list)) else v for v in values]
+            )
+        else:
+            cells = []
+            for field, width in zip(self.fields, self._widths):
+                value = self.get_field(record, field)
+                text = "Unknown" if value is None else str(value)
+                if width and field != self.fields[0]:
+                    text = text[:width]
+                cells.append(f"{text:<{width}}" if width else text)
+            print(" | ".join(cells), file=self.stream)
+
+
+def add_output_arguments(subparser):
+    """Register the --format and --fields options shared by list commands"""
+    subparser.add_argument(
+        "--format", choices=["table", "csv", "ndjson"], default="table", help="Output format"
+    )
+    subparser.add_argument(
+        "--fields",
+        type=lambda value: [f.strip() for f in value.split(",") if f.strip()],
+        help="Comma-separated fields to output (dotted paths such as exifInfo.make)",
+    )
+
+
 def handle_list_albums(client, args):
     """List all accessible albums"""
-    albums = client.list_albums()
-    if albums:
-        print(f"{'ID':<40} | {'Name':<35} | {'Assets'}")
-        print("-" * 85)
-        for album in albums:
-            name = album.get("albumName", "Unknown")
-            count = album.get("assetCount", 0)
-            print(f"{album['id']:<40} | {name[:35]:<35} | {count}")
-    else:
+    writer = RowWriter(args.format, args.fields, ALBUM_FIELDS)
+    for album in client.list_albums():
+        writer.write(album)
+    if not writer.count and args.format == "table":
         print("No albums found or error fetching albums.")
 
 
 def handle_list_assets(client, args):
     """List all accessible assets in the library"""
-    assets = client.list_assets()
-    if assets:
-        print(f"{'ID':<40} | {'File Name':<35} | {'Type'}")
-        print("-" * 85)
-        for asset in assets:
-            name = asset.get("originalFileName", asset.get("id", "Unknown"))
-            atype = asset.get("type", "Unknown")
-            print(f"{asset['id']:<40} | {name[:35]:<35} | {atype}")
-    else:
+    writer = RowWriter(args.format, args.fields, ASSET_FIELDS)
+    for asset in client.iter_assets():
+        writer.write(asset)
+    if not writer.count and args.format == "table":
         print("No assets found or error fetching assets.")
 
 
@@ -69,20 +163,18 @@ def handle_list_album_assets(client, args):
     """Show assets contained within a specific album"""
     album = client.find_album(args.album_id_or_name)
     if album:
-        album_detail = client.get_album(album["id"])
-        if album_detail and "assets" in album_detail:
-            assets = album_detail["assets"]
-            print(f"Assets in album '{album.get('albumName', 'Unknown')}':")
-            print(f"{'ID':<40} | {'File Name':<35} | {'Type'}")
-            print("-" * 85)
-            for asset in assets:
-                name = asset.get("originalFileName", asset.get("id", "Unknown"))
-                atype = asset.get("type", "Unknown")
-                print(f"{asset['id']:<40} | {name[:35]:<35} | {atype}")
-        else:
+        writer = None
+        for asset in client.iter_album_assets(album["id"]):
+            if writer is None:
+                if args.format == "table":
+                    print(f"Assets in album '{album.get('albumName', 'Unknown')}':")
+                writer = RowWriter(args.format, args.fields, ASSET_FIELDS)
+            writer.write(asset)
+        if writer is None and args.format == "table":
             print(f"No assets found in album '{album.get('albumName', 'Unknown')}'.")
     else:
-        print(f"Album '{args.album_id_or_name}' not found.")
+        out = sys.stdout if args.format == "table" else sys.stderr
+        print(f"Album '{args.album_id_or_name}' not found.", file=out)
 
 
 def handle_get_metadata(client, args):
@@ -101,20 +193,19 @@ def handle_download_album(client, args):
         print(f"Album '{args.album_id_or_name}' not found.")
         return
 
-    album_detail = client.get_album(album["id"])
+    album_detail = client.get_album(album["id"], without_assets=True)
     if not album_detail:
         print(
             f"Error: Could not retrieve details for album '{album.get('albumName', 'Unknown')}'."
         )
         return
 
-    assets = album_detail.get("assets", [])
-    if not assets:
+    if not album_detail.get("assetCount"):
         print(f"No assets found in album '{album_detail.get('albumName', 'Unknown')}'")
         return
 
     print(
-        f"Downloading {len(assets)} assets from album '{album_detail['albumName']}'..."
+        f"Downloading {album_detail['assetCount']} assets from album '{album_detail['albumName']}'..."
     )
     if args.clean:
         print("Cleaning up...")
@@ -128,12 +219,131 @@ def handle_download_album(client, args):
                         print(f"Error deleting {file_path}: {e}")
     os.makedirs(args.output, exist_ok=True)
 
-    for asset in assets:
+    # Assets are paged in as they are downloaded instead of being loaded all at once
+    for asset in client.iter_album_assets(album["id"], album=album_detail):
         filename = asset.get("originalFileName", f"{asset['id']}.jpg")
         output_path = os.path.join(args.output, filename)
         client.download_asset(asset["id"], output_path)
 
 
+def handle_sync_album(client, args):
+    """Incrementally sync an album with a local directory"""
+    from .sync import sync_album
+
+    album = client.find_album(args.album_id_or_name)
+    if not album:
+        print(f"Album '{args.album_id_or_name}' not found.")
+        return
+
+    try:
+        plan = sync_album(
+            client,
+            album["id"],
+            args.output,
+            delete=args.delete,
+            upload=args.upload,
+            concurrency=args.concurrency,
+            dry_run=args.dry_run,
+        )
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    if args.dry_run:
+        for asset_id, path in plan["download"]:
+            print(f"Would download {asset_id} -> {path}")
+        for asset_id in plan["remove"]:
+            print(f"Would remove {asset_id}")
+        for path in plan["upload"]:
+            print(f"Would upload {path}")
+    verb = "Would sync" if args.dry_run else "Synced"
+    print(
+        f"{verb} album '{album.get('albumName', 'Unknown')}': {len(plan['download'])} downloads, "
+        f"{len(plan['remove'])} removals, {len(plan['upload'])} uploads, {plan['unchanged']} unchanged."
+    )
+    failed = plan.get("failed", [])
+    if failed:
+        print(f"{len(failed)} transfers failed: {', '.join(failed)}")
+        sys.exit(1)
+
+
+def handle_backup_all(client, args):
+    """Back up the libraries of several users concurrently"""
+    from .backup import backup_all, resolve_credentials
+
+    with open(args.credentials) as f:
+        credentials = json.load(f)
+    try:
+        keys, missing = resolve_credentials(client, credentials)
+    except Exception:
+        # Without access to the user list, back up exactly the given credentials
+        keys, missing = dict(credentials), []
+    for label in missing:
+        print(f"Skipping {label}: no API key in {args.credentials}")
+    if not keys:
+        print("No users to back up.")
+        return
+
+    url = ",".join(client.server_urls)
+    clients = {label: create_client(url, key) for label, key in keys.items()}
+    bandwidth = args.bandwidth * 1024 * 1024 if args.bandwidth else None
+    report = backup_all(clients, args.output, concurrency=args.concurrency, bandwidth=bandwidth)
+
+    print(f"{'User':<35} {'Listed':>8} {'New':>8} {'Skipped':>8} {'Failed':>8} {'MB':>10} {'Seconds':>8}")
+    print("-" * 91)
+    for row in report["users"] + [dict(report["totals"], user="Total", seconds=report["seconds"])]:
+        print(
+            f"{row['user']:<35} {row['listed']:>8} {row['downloaded']:>8} {row['skipped']:>8} "
+            f"{row['failed']:>8} {row['bytes'] / (1024 * 1024):>10.1f} {row['seconds']:>8.1f}"
+        )
+        if row.get("error"):
+            print(f"  Listing failed: {row['error']}")
+    if report["totals"]["failed"] or any(row["error"] for row in report["users"]):
+        sys.exit(1)
+
+
+def handle_mirror_library(client, args):
+    """Mirror your library and your partners' libraries, each unique file once"""
+    from .backup import mirror_library
+
+    bandwidth = args.bandwidth * 1024 * 1024 if args.bandwidth else None
+    report = mirror_library(client, args.output, concurrency=args.concurrency, bandwidth=bandwidth)
+
+    for owner, count in sorted(report["owners"].items()):
+        print(f"{owner:<35} {count:>8} assets")
+    for owner in report["hidden"]:
+        print(f"Skipped {owner}: partner library is not shown in your timeline")
+    print(
+        f"Listed {report['listed']} assets, {report['duplicates']} shared duplicates; "
+        f"downloaded {report['downloaded']}, skipped {report['skipped']}, failed {report['failed']} "
+        f"({report['bytes'] / (1024 * 1024):.1f} MB in {report['seconds']:.1f}s)"
+    )
+    if report["failed"]:
+        sys.exit(1)
+
+
+def handle_verify(client, args):
+    """Check a local mirror against the server's checksums"""
+    from .verify import verify_mirror
+
+    report = verify_mirror(client, args.directory, concurrency=args.concurrency, repair=args.repair)
+
+    for label in ("missing", "corrupt", "extra"):
+        for path in report[label]:
+            print(f"{label.capitalize()}: {path}")
+    print(
+        f"Checked {report['checked']} assets: {report['ok']} ok, {len(report['missing'])} missing, "
+        f"{len(report['corrupt'])} corrupt, {len(report['extra'])} extra files "
+        f"({report['bytes'] / (1024 * 1024):.1f} MB verified in {report['seconds']:.1f}s)"
+    )
+    if args.repair:
+        print(f"Repaired {report['repaired']} files, {report['failed']} failed")
+        if report["failed"]:
+            sys.exit(1)
+    elif report["missing"] or report["corrupt"]:
+        sys.exit(1)
+
+
 def handle_download_asset(client, args):
     """Download a single specific asset"""
     info = client.get_asset_info(args.asset_id)
@@ -146,9 +356,165 @@ def handle_download_asset(client, args):
     client.download_asset(args.asset_id, filename)
 
 
-def main():
+def handle_auto_stack(client, args):
+    """Group bursts or RAW+JPEG pairs into stacks"""
+    stacks = client.auto_stack(
+        mode=args.mode,
+        max_gap=args.max_gap,
+        primary=args.primary,
+        dry_run=args.dry_run,
+        concurrency=args.concurrency,
+    )
+    if not stacks:
+        print("No stack candidates found.")
+        return
+    verb = "Would create" if args.dry_run else "Created"
+    for stack in stacks:
+        others = ", ".join(stack["assetIds"][1:])
+        print(f"{verb} stack {stack['primaryAssetId']} <- {others}")
+    print(f"{verb} {len(stacks)} stacks.")
+
+
+def handle_purge_trash(client, args):
+    """Permanently delete trashed assets selected by age or type"""
+    result = client.purge_trash(
+        older_than=args.older_than,
+        asset_type=args.type,
+        chunk_size=args.chunk_size,
+        concurrency=args.concurrency,
+        dry_run=args.dry_run,
+    )
+    if args.dry_run:
+        print(f"Would purge {result['matched']} trashed assets.")
+        return
+    print(f"Purged {result['deleted']} trashed assets.")
+    if result["failed"]:
+        print(f"Failed to purge {result['failed']} assets.")
+        sys.exit(1)
+
+
+def handle_find_duplicates(client, args):
+    """Report assets with identical content and optionally stack or trash them"""
+    from .duplicates import find_duplicates
+
+    filters = {"type": args.type} if args.type else {}
+    result = find_duplicates(
+        client, action=args.action, chunk_size=args.chunk_size, concurrency=args.concurrency, **filters
+    )
+    for group in result["groups"]:
+        print(
+            f"{group['keep']} <- {', '.join(group['duplicates'])} "
+            f"({group['reclaimable'] / (1024 * 1024):.1f} MB reclaimable)"
+        )
+    duplicates = sum(len(group["duplicates"]) for group in result["groups"])
+    print(
+        f"Scanned {result['assets']} assets: {len(result['groups'])} duplicate groups, "
+        f"{duplicates} duplicates, {result['reclaimable'] / (1024 * 1024):.1f} MB reclaimable."
+    )
+    if result.get("others"):
+        print(f"Ignored {result['others']} assets owned by partners.")
+    if args.action:
+        verb = "Stacked" if args.action == "stack" else "Trashed"
+        print(f"{verb} {duplicates - result['failed']} duplicates.")
+    if result["failed"]:
+        sys.exit(1)
+
+
+def handle_find_similar(client, args):
+    """Report visually similar images from perceptual hashes of their thumbnails"""
+    from .similar import find_similar
+
+    cache = None if args.no_cache else (args.cache or get_cache_path(f"similar-{args.method}.json"))
+    try:
+        result = find_similar(
+            client,
+            threshold=args.threshold,
+            method=args.method,
+            cache_path=cache,
+            concurrency=args.concurrency,
+            processes=args.processes,
+        )
+    except ImportError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    for group in result["groups"]:
+        print(", ".join(group))
+    print(
+        f"Scanned {result['assets']} images ({result['hashed']} hashed, {result['cached']} cached, "
+        f"{result['failed']} failed): {len(result['groups'])} groups of similar images."
+    )
+
+
+def get_cache_path(name):
+    """Return the path of a file in the per-user cache directory"""
+    cache_dir = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_dir, "immich-tool", name)
+
+
+def handle_activity_report(client, args):
+    """Rank albums by likes and comments"""
+    cache = None if args.no_cache else (args.cache or get_cache_path("activity-statistics.json"))
+    result = client.rollup_activity_statistics(
+        album_ids=args.album or None,
+        details=args.details,
+        concurrency=args.concurrency,
+        cache_path=cache,
+        max_age=args.max_age * 3600 if args.max_age else None,
+    )
+    rows = result["albums"][:args.limit] if args.limit else result["albums"]
+    print(f"{'Album':<40} {'Comments':>9} {'Likes':>7}")
+    print("-" * 58)
+    for row in rows:
+        likes = "-" if row["likes"] is None else row["likes"]
+        print(f"{(row['albumName'] or row['albumId'])[:40]:<40} {row['comments']:>9} {likes:>7}")
+        if args.details and row.get("users"):
+            top = sorted(row["users"].items(), key=lambda item: -item[1])[:3]
+            print(f"  Most active: {', '.join(f'{name} ({count})' for name, count in top)}; "
+                  f"last activity {row['lastActivity']}")
+    totals = result["totals"]
+    print(
+        f"{len(result['albums'])} albums, {totals['comments']} comments, {totals['likes']} likes "
+        f"({result['queried']} queried, {result['cached']} from cache)."
+    )
+    if result["failed"]:
+        sys.exit(1)
+
+
+def handle_export_metadata(client, args):
+    """Export all asset metadata to a columnar file"""
+    from .export import export_metadata
+
+    try:
+        count = export_metadata(client, args.output, format=args.format, batch_size=args.batch_size)
+    except ImportError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    print(f"Exported metadata of {count} assets to {args.output}")
+
+
+def handle_daemon(client, args):
+    """Serve forwarded commands with a warm client"""
+    from .daemon import serve
+
+    serve(get_socket_path(args), client, create_client)
+
+
+def get_socket_path(args):
+    """Return the daemon socket path from arguments, environment or the per-user default"""
+    if args.socket:
+        return args.socket
+    if os.getenv("IMMICH_TOOL_SOCKET"):
+        return os.getenv("IMMICH_TOOL_SOCKET")
+    runtime_dir = os.getenv("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "immich-tool.sock")
+    uid = os.getuid() if hasattr(os, "getuid") else "user"
+    return os.path.join("/tmp", f"immich-tool-{uid}.sock")
+
+
+def build_parser():
     """
-    Main entry point for the Immich CLI tool.
+    Build the argument parser for all CLI commands.
     """
     parser = argparse.ArgumentParser(description="Immich CLI Tool")
     parser.add_argument(
@@ -157,6 +523,35 @@ def main():
     parser.add_argument(
         "--key", help="Immich API Key (defaults to IMMICH_API_KEY env var)"
     )
+    parser.add_argument(
+        "--socket", help="Daemon socket path (defaults to IMMICH_TOOL_SOCKET env var)"
+    )
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        default=False,
+        help="Run locally even if an immich-tool daemon is listening",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=["cprofile", "wall", "tracemalloc"],
+        help="Profile the command and print a summary to stderr",
+    )
+    parser.add_argument(
+        "--profile-output",
+        help="Save the raw profile (pstats, speedscope JSON or tracemalloc snapshot)",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        default=False,
+        help="Print time spent per phase (HTTP, decode, write, hash) to stderr",
+    )
+    parser.add_argument(
+        "--compression",
+        help="Response encodings to accept: 'auto' (default), 'none', or a list such as 'zstd,gzip' "
+             "(defaults to IMMICH_COMPRESSION env var)",
+    )
 
     subparsers = parser.add_subparsers(dest="command", help="Commands")
 
@@ -170,12 +565,14 @@ def main():
     p_list_albums = subparsers.add_parser(
         "list-albums", help="List all accessible albums"
     )
+    add_output_arguments(p_list_albums)
     p_list_albums.set_defaults(func=handle_list_albums)
 
     # list-assets
     p_list_assets = subparsers.add_parser(
         "list-assets", help="List all accessible assets in the library"
     )
+    add_output_arguments(p_list_assets)
     p_list_assets.set_defaults(func=handle_list_assets)
 
     # list-album-assets
@@ -185,6 +582,7 @@ def main():
     p_list_album_assets.add_argument(
         "album_id_or_name", help="UUID or Name of the album"
     )
+    add_output_arguments(p_list_album_assets)
     p_list_album_assets.set_defaults(func=handle_list_album_assets)
 
     # get-metadata
@@ -206,6 +604,77 @@ def main():
 
     p_download_album.set_defaults(func=handle_download_album)
 
+    # backup-all
+    p_backup_all = subparsers.add_parser(
+        "backup-all", help="Back up every user's library with per-user API keys"
+    )
+    p_backup_all.add_argument(
+        "--credentials", required=True,
+        help="JSON file mapping user email (or name/id) to that user's API key",
+    )
+    p_backup_all.add_argument(
+        "--output", "-o", default="backup", help="Backup root directory"
+    )
+    p_backup_all.add_argument(
+        "--concurrency", type=int, default=8, help="Total parallel downloads across all users"
+    )
+    p_backup_all.add_argument(
+        "--bandwidth", type=float, help="Global download limit in MB/s"
+    )
+    p_backup_all.set_defaults(func=handle_backup_all)
+
+    # mirror-library
+    p_mirror_library = subparsers.add_parser(
+        "mirror-library", help="Mirror your library and partner libraries, each unique file once"
+    )
+    p_mirror_library.add_argument(
+        "--output", "-o", default="mirror", help="Mirror root directory"
+    )
+    p_mirror_library.add_argument(
+        "--concurrency", type=int, default=8, help="Number of parallel downloads"
+    )
+    p_mirror_library.add_argument(
+        "--bandwidth", type=float, help="Download limit in MB/s"
+    )
+    p_mirror_library.set_defaults(func=handle_mirror_library)
+
+    # verify
+    p_verify = subparsers.add_parser(
+        "verify", help="Check a local mirror against server checksums and sizes"
+    )
+    p_verify.add_argument("directory", help="Mirror root directory")
+    p_verify.add_argument(
+        "--concurrency", type=int, default=16, help="Number of files hashed in parallel"
+    )
+    p_verify.add_argument(
+        "--repair", action="store_true", default=False, help="Download missing and corrupt files again"
+    )
+    p_verify.set_defaults(func=handle_verify)
+
+    # sync-album
+    p_sync_album = subparsers.add_parser(
+        "sync-album", help="Download only new or changed assets of an album"
+    )
+    p_sync_album.add_argument("album_id_or_name", help="UUID or Name of the album")
+    p_sync_album.add_argument(
+        "--output", "-o", default="downloads", help="Output directory path"
+    )
+    p_sync_album.add_argument(
+        "--delete", action="store_true", default=False,
+        help="Remove local files whose asset left the album",
+    )
+    p_sync_album.add_argument(
+        "--upload", action="store_true", default=False,
+        help="Upload new local files into the album",
+    )
+    p_sync_album.add_argument(
+        "--concurrency", type=int, default=4, help="Number of parallel transfers"
+    )
+    p_sync_album.add_argument(
+        "--dry-run", action="store_true", default=False, help="Only print the planned changes"
+    )
+    p_sync_album.set_defaults(func=handle_sync_album)
+
     # download-asset
     p_download_asset = subparsers.add_parser(
         "download-asset", help="Download a single specific asset"
@@ -215,16 +684,177 @@ def main():
     p_download_asset.set_defaults(func=handle_download_asset)
     p_download_asset.set_defaults(func=handle_download_asset)
 
-    args = parser.parse_args()
+    # purge-trash
+    p_purge_trash = subparsers.add_parser(
+        "purge-trash", help="Permanently delete trashed assets selected by age or type"
+    )
+    p_purge_trash.add_argument(
+        "--older-than", type=float, help="Only assets trashed more than this many days ago"
+    )
+    p_purge_trash.add_argument(
+        "--type", choices=["IMAGE", "VIDEO", "AUDIO", "OTHER"], help="Only assets of this type"
+    )
+    p_purge_trash.add_argument(
+        "--chunk-size", type=int, default=500, help="Assets per delete request"
+    )
+    p_purge_trash.add_argument(
+        "--concurrency", type=int, default=4, help="Number of parallel delete requests"
+    )
+    p_purge_trash.add_argument(
+        "--dry-run", action="store_true", default=False, help="Only count the matching assets"
+    )
+    p_purge_trash.set_defaults(func=handle_purge_trash)
 
-    # Configuration precedence: argument > environment variable
-    url = args.url or IMMICH_SERVER_URL
-    key = args.key or IMMICH_API_KEY
+    # auto-stack
+    p_auto_stack = subparsers.add_parser(
+        "auto-stack", help="Group bursts or RAW+JPEG pairs into stacks"
+    )
+    p_auto_stack.add_argument(
+        "--mode", choices=["burst", "raw"], default="burst", help="Grouping strategy"
+    )
+    p_auto_stack.add_argument(
+        "--max-gap", type=float, default=1.0, help="Maximum seconds between shots of a stack"
+    )
+    p_auto_stack.add_argument(
+        "--primary",
+        choices=["jpeg", "raw", "first", "largest"],
+        default="jpeg",
+        help="Rule used to choose the primary asset",
+    )
+    p_auto_stack.add_argument(
+        "--dry-run", action="store_true", default=False, help="Only print the planned stacks"
+    )
+    p_auto_stack.add_argument(
+        "--concurrency", type=int, default=4, help="Number of parallel requests"
+    )
+    p_auto_stack.set_defaults(func=handle_auto_stack)
+
+    # activity-report
+    p_activity_report = subparsers.add_parser(
+        "activity-report", help="Rank albums by likes and comments"
+    )
+    p_activity_report.add_argument(
+        "--album", action="append", help="Album id to include (repeatable; default: all albums)"
+    )
+    p_activity_report.add_argument(
+        "--details", action="store_true", default=False, help="Include the most active users per album"
+    )
+    p_activity_report.add_argument(
+        "--limit", type=int, help="Only show the top N albums"
+    )
+    p_activity_report.add_argument(
+        "--concurrency", type=int, default=8, help="Number of parallel requests"
+    )
+    p_activity_report.add_argument(
+        "--cache", help="Statistics cache file (default: in the user cache directory)"
+    )
+    p_activity_report.add_argument(
+        "--no-cache", action="store_true", default=False, help="Query every album again"
+    )
+    p_activity_report.add_argument(
+        "--max-age", type=float, help="Refresh cached statistics older than this many hours"
+    )
+    p_activity_report.set_defaults(func=handle_activity_report)
+
+    # find-duplicates
+    p_find_duplicates = subparsers.add_parser(
+        "find-duplicates", help="Report assets with identical content across the library"
+    )
+    p_find_duplicates.add_argument(
+        "--action", choices=["stack", "trash"], help="Stack each group or move the duplicates to the trash"
+    )
+    p_find_duplicates.add_argument(
+        "--type", choices=["IMAGE", "VIDEO", "AUDIO", "OTHER"], help="Only assets of this type"
+    )
+    p_find_duplicates.add_argument(
+        "--chunk-size", type=int, default=500, help="Assets per trash request"
+    )
+    p_find_duplicates.add_argument(
+        "--concurrency", type=int, default=4, help="Number of parallel requests"
+    )
+    p_find_duplicates.set_defaults(func=handle_find_duplicates)
+
+    # find-similar
+    p_find_similar = subparsers.add_parser(
+        "find-similar", help="Report visually similar images (resized or re-encoded copies)"
+    )
+    p_find_similar.add_argument(
+        "--threshold", type=int, default=6, help="Maximum number of differing hash bits"
+    )
+    p_find_similar.add_argument(
+        "--method", choices=["dhash", "phash"], default="dhash", help="Perceptual hash algorithm"
+    )
+    p_find_similar.add_argument(
+        "--cache", help="Hash cache file (default: in the user cache directory)"
+    )
+    p_find_similar.add_argument(
+        "--no-cache", action="store_true", default=False, help="Hash every image again"
+    )
+    p_find_similar.add_argument(
+        "--concurrency", type=int, default=8, help="Number of parallel thumbnail downloads"
+    )
+    p_find_similar.add_argument(
+        "--processes", type=int, help="Number of hashing processes (default: one per CPU)"
+    )
+    p_find_similar.set_defaults(func=handle_find_similar)
+
+    # export-metadata
+    p_export_metadata = subparsers.add_parser(
+        "export-metadata", help="Export all asset metadata to Parquet or Arrow"
+    )
+    p_export_metadata.add_argument("output", help="Destination file path")
+    p_export_metadata.add_argument(
+        "--format", choices=["parquet", "arrow"], default="parquet", help="Columnar file format"
+    )
+    p_export_metadata.add_argument(
+        "--batch-size", type=int, default=50000, help="Rows per record batch"
+    )
+    p_export_metadata.set_defaults(func=handle_export_metadata)
+
+    # daemon
+    p_daemon = subparsers.add_parser(
+        "daemon", help="Keep a warm client running and serve forwarded commands"
+    )
+    p_daemon.set_defaults(func=handle_daemon)
+
+    return parser
+
+
+def main(argv=None):
+    """
+    Main entry point for the Immich CLI tool.
+
+    Args:
+        argv (list, optional): Command-line arguments. Defaults to sys.argv[1:].
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
 
     if not args.command:
         parser.print_help()
         return
 
+    # Configuration precedence: argument > environment variable > .env file.
+    # Loaded first so a forwarded command carries the caller's .env settings.
+    load_env()
+
+    # Hand the command to a running daemon when there is one
+    # Profiling and stats need the command to run in this process
+    local_only = args.no_daemon or args.profile or args.stats
+    if args.command != "daemon" and not local_only and os.name == "posix":
+        socket_path = get_socket_path(args)
+        if os.path.exists(socket_path):
+            from .daemon import forward
+
+            code = forward(socket_path, sys.argv[1:] if argv is None else argv)
+            if code is not None:
+                if code:
+                    sys.exit(code)
+                return
+
+    url = args.url or IMMICH_SERVER_URL or os.getenv("IMMICH_SERVER_URL")
+    key = args.key or IMMICH_API_KEY or os.getenv("IMMICH_API_KEY")
+
     if not url or not key:
         print(
             "Error: Immich URL and API Key must be provided via environment variables or arguments."
@@ -234,13 +864,36 @@ def main():
         )
         sys.exit(1)
 
-    client = ImmichClient(url, key)
+    client = create_client(url, key)
+    compression = args.compression or os.getenv("IMMICH_COMPRESSION")
+    if compression:
+        try:
+            client.set_compression(compression)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
 
-    # Execute the command handler
-    if hasattr(args, "func"):
-        args.func(client, args)
-    else:
+    if not hasattr(args, "func"):
         parser.print_help()
+        return
+
+    stats = None
+    if args.stats:
+        from .profiling import PhaseStats
+
+        stats = client.stats = PhaseStats()
+
+    # Execute the command handler
+    try:
+        if args.profile:
+            from .profiling import run_profiled
+
+            run_profiled(lambda: args.func(client, args), args.profile, args.profile_output)
+        else:
+            args.func(client, args)
+    finally:
+        if stats is not None:
+            print(stats.report(), file=sys.stderr)
 
 
 if __name__ == "__main__":
@@ -33,5 +33,5 @@ class ImmichClient(
     """
     Unified client for Immich API, combining all category mixins.
     """
-    def __init__(self, server_url, api_key):
-        super().__init__(server_url, api_key)
+    def __init__(self, server_url, api_key, **kwargs):
+        super().__init__(server_url, api_key, **kwargs)
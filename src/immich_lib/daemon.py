@@ -0,0 +1,252 @@
+"""
+Persistent immich-tool daemon.
+
+The daemon keeps warm ImmichClient instances (pooled HTTP session, tag index and
+other caches) behind a local Unix socket. CLI invocations forward their argument
+vector to it and relay the output, skipping interpreter start-up, TLS handshakes
+and client construction.
+
+Protocol: the caller sends one JSON line {"argv": [...], "cwd": str, "env": {...}};
+the daemon answers with JSON lines {"stdout": str} / {"stderr": str} and a final
+{"exit": int}.
+"""
+
+import io
+import json
+import os
+import socket
+import socketserver
+import stat
+import sys
+import threading
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+
+FORWARDED_ENV = ("IMMICH_SERVER_URL", "IMMICH_API_KEY", "IMMICH_COMPRESSION")
+
+
+class _FrameWriter(io.TextIOBase):
+    """Text stream that sends everything written to it as protocol frames."""
+    def __init__(self, wfile, stream):
+        self.wfile = wfile
+        self.stream = stream
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        if text:
+            self.wfile.write((json.dumps({self.stream: text}) + "\n").encode())
+        return len(text)
+
+    def flush(self):
+        self.wfile.flush()
+
+
+class _CommandHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline())
+        except ValueError:
+            return
+        stdout = _FrameWriter(self.wfile, "stdout")
+        stderr = _FrameWriter(self.wfile, "stderr")
+        code = self.server.execute(request, stdout, stderr)
+        self.wfile.write((json.dumps({"exit": code}) + "\n").encode())
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Unix socket server executing forwarded immich-tool commands.
+
+    Commands run one at a time: handlers print to the process-wide stdout and
+    resolve paths against the working directory, both of which are swapped for
+    the duration of each command.
+
+    Attributes:
+        clients (dict): Warm clients keyed by (server_url, api_key).
+    """
+    daemon_threads = True
+
+    def __init__(self, socket_path, client, client_factory):
+        """
+        Bind the daemon socket.
+
+        Args:
+            socket_path (str): Filesystem path of the Unix socket.
+            client (ImmichClient): Client used for commands without explicit credentials.
+            client_factory (callable): Builds a client from (url, key) for other credentials.
+        """
+        self.socket_path = socket_path
+        self.default_client = client
+        self.client_factory = client_factory
+        self.clients = {}
+        self.lock = threading.Lock()
+        _remove_stale_socket(socket_path)
+        old_umask = os.umask(0o177)
+        try:
+            super().__init__(socket_path, _CommandHandler)
+        finally:
+            os.umask(old_umask)
+
+    def get_client(self, url, key):
+        """Return a warm client for the given credentials, creating and caching it if needed."""
+        default = (",".join(self.default_client.server_urls), self.default_client.headers["x-api-key"])
+        if url:
+            url = ",".join(part.strip().rstrip("/") for part in url.split(",") if part.strip())
+        wanted = (url or default[0], key or default[1])
+        if wanted == default:
+            return self.default_client
+        if wanted not in self.clients:
+            self.clients[wanted] = self.client_factory(*wanted)
+        return self.clients[wanted]
+
+    def execute(self, request, stdout, stderr):
+        """
+        Run a forwarded command and return its exit code.
+
+        Args:
+            request (dict): Decoded request frame.
+            stdout (io.TextIOBase): Stream receiving the command's standard output.
+            stderr (io.TextIOBase): Stream receiving the command's error output.
+        """
+        from .cli import build_parser
+
+        with self.lock, redirect_stdout(stdout), redirect_stderr(stderr):
+            cwd = os.getcwd()
+            try:
+                os.chdir(request.get("cwd") or cwd)
+                args = build_parser().parse_args(request.get("argv", []))
+                if not getattr(args, "func", None) or args.command == "daemon":
+                    print("Error: command cannot be run through the daemon.", file=sys.stderr)
+                    return 2
+                env = request.get("env", {})
+                client = self.get_client(
+                    args.url or env.get("IMMICH_SERVER_URL"), args.key or env.get("IMMICH_API_KEY")
+                )
+                compression = args.compression or env.get("IMMICH_COMPRESSION")
+                if compression:
+                    # A per-command copy, so the shared warm client keeps its own setting
+                    client = client.with_compression(compression)
+                args.func(client, args)
+                return 0
+            except SystemExit as e:
+                return e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+            except Exception:
+                traceback.print_exc()
+                return 1
+            finally:
+                os.chdir(cwd)
+                sys.stdout.flush()
+
+    def server_close(self):
+        super().server_close()
+        _remove_stale_socket(self.socket_path)
+
+
+def is_private_socket(socket_path):
+    """
+    Check that a socket file belongs to the current user and is not accessible to others.
+
+    The default socket path may live in a shared directory such as /tmp, where
+    another local user could create it first to collect forwarded API keys.
+
+    Args:
+        socket_path (str): Filesystem path of the Unix socket.
+
+    Returns:
+        bool: True if the path is a socket owned by the current user with mode 0o600 or stricter.
+    """
+    if not hasattr(os, "getuid"):
+        return False
+    try:
+        info = os.lstat(socket_path)
+    except OSError:
+        return False
+    return (
+        stat.S_ISSOCK(info.st_mode)
+        and info.st_uid == os.getuid()
+        and not info.st_mode & (stat.S_IRWXG | stat.S_IRWXO)
+    )
+
+
+def _remove_stale_socket(socket_path):
+    """Delete a socket file left behind by a daemon that is no longer listening."""
+    if not os.path.lexists(socket_path):
+        return
+    if hasattr(os, "getuid") and os.lstat(socket_path).st_uid != os.getuid():
+        raise RuntimeError(f"Refusing to use {socket_path}: it belongs to another user")
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socket_path)
+    except OSError:
+        os.unlink(socket_path)
+    else:
+        raise RuntimeError(f"A daemon is already listening on {socket_path}")
+    finally:
+        probe.close()
+
+
+def serve(socket_path, client, client_factory):
+    """
+    Run the daemon until interrupted.
+
+    Args:
+        socket_path (str): Filesystem path of the Unix socket.
+        client (ImmichClient): Default warm client.
+        client_factory (callable): Builds a client from (url, key).
+    """
+    server = DaemonServer(socket_path, client, client_factory)
+    print(f"immich-tool daemon listening on {socket_path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def forward(socket_path, argv, timeout=None, stdout=None, stderr=None):
+    """
+    Send a command to a running daemon and relay its output.
+
+    Args:
+        socket_path (str): Filesystem path of the daemon's Unix socket.
+        argv (list): Command-line arguments (without the program name).
+        timeout (float, optional): Socket timeout in seconds.
+        stdout (io.TextIOBase, optional): Destination of the command's output. Defaults to sys.stdout.
+        stderr (io.TextIOBase, optional): Destination of the command's errors. Defaults to sys.stderr.
+
+    Returns:
+        int | None: The command's exit code, or None if no trusted daemon is listening.
+    """
+    stdout = stdout or sys.stdout
+    stderr = stderr or sys.stderr
+    if not is_private_socket(socket_path):
+        if os.path.lexists(socket_path):
+            print(f"Warning: ignoring {socket_path}: not a private socket of the current user.", file=stderr)
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(socket_path)
+    except OSError:
+        sock.close()
+        return None
+
+    env = {k: os.environ[k] for k in FORWARDED_ENV if k in os.environ}
+    request = {"argv": list(argv), "cwd": os.getcwd(), "env": env}
+    with sock, sock.makefile("rwb") as stream:
+        stream.write((json.dumps(request) + "\n").encode())
+        stream.flush()
+        for line in stream:
+            frame = json.loads(line)
+            if "stdout" in frame:
+                stdout.write(frame["stdout"])
+            elif "stderr" in frame:
+                stderr.write(frame["stderr"])
+            elif "exit" in frame:
+                stdout.flush()
+                return frame["exit"]
+    print("Error: connection to immich-tool daemon was lost.", file=stderr)
+    return 1
@@ -0,0 +1,195 @@
+"""
+Exact duplicate detection across the whole library from server-side checksums.
+
+Assets are streamed page by page and reduced to fixed-width binary records
+(20-byte SHA-1 checksum, 16-byte UUID, 8-byte size) packed into flat buffers,
+so an index of several million assets fits in a few hundred MB. Duplicates are
+found by sorting the records on their checksum rather than with a dict of
+Python objects.
+"""
+
+import base64
+import binascii
+import uuid
+from array import array
+from .utils import imap_ordered, import_numpy
+
+CHECKSUM_SIZE = 20
+ID_SIZE = 16
+
+
+class ChecksumIndex:
+    """
+    Append-only index of (checksum, asset id, size) records in compact buffers.
+
+    Attributes:
+        skipped (int): Assets ignored because they had no valid checksum or id.
+    """
+    def __init__(self):
+        self._checksums = bytearray()
+        self._ids = bytearray()
+        self._sizes = array("q")
+        self.skipped = 0
+
+    def __len__(self):
+        return len(self._sizes)
+
+    def add(self, checksum, asset_id, size=0):
+        """
+        Record one asset.
+
+        Args:
+            checksum (str): Base64 SHA-1 checksum as returned by the API.
+            asset_id (str): UUID of the asset.
+            size (int): File size in bytes.
+
+        Returns:
+            bool: False if the asset was skipped.
+        """
+        try:
+            key = base64.b64decode(checksum or "")
+            raw_id = uuid.UUID(asset_id).bytes
+        except (binascii.Error, ValueError, TypeError, AttributeError):
+            key = b""
+        if len(key) != CHECKSUM_SIZE:
+            self.skipped += 1
+            return False
+        self._checksums += key
+        self._ids += raw_id
+        self._sizes.append(size or 0)
+        return True
+
+    def add_asset(self, asset):
+        """Record an asset dictionary (needs 'checksum', 'id' and optionally exifInfo.fileSizeInByte)."""
+        size = (asset.get("exifInfo") or {}).get("fileSizeInByte")
+        return self.add(asset.get("checksum"), asset.get("id"), size)
+
+    def _duplicate_runs(self):
+        """Return the record indices of every run of two or more equal checksums."""
+        count = len(self)
+        np = import_numpy()
+        if np is not None:
+            # A 20-byte key is compared as three big-endian integer columns
+            columns = np.frombuffer(
+                bytes(self._checksums), dtype=np.dtype([("a", ">u8"), ("b", ">u8"), ("c", ">u4")])
+            )
+            order = np.lexsort((columns["c"], columns["b"], columns["a"]))
+            ordered = columns[order]
+            same = (
+                (ordered["a"][1:] == ordered["a"][:-1])
+                & (ordered["b"][1:] == ordered["b"][:-1])
+                & (ordered["c"][1:] == ordered["c"][:-1])
+            )
+            del ordered
+            starts = np.flatnonzero(np.concatenate(([True], ~same, [True])))
+            lengths = np.diff(starts)
+            # Only the (usually few) duplicate runs are converted to Python objects
+            return [order[start:start + length].tolist() for start, length in zip(starts[:-1][lengths > 1], lengths[lengths > 1])]
+
+        view = memoryview(self._checksums)
+        order = sorted(range(count), key=lambda i: view[i * CHECKSUM_SIZE:(i + 1) * CHECKSUM_SIZE].tobytes())
+        runs, current = [], order[:1]
+        for index in order[1:]:
+            if self._key(index) == self._key(current[0]):
+                current.append(index)
+            else:
+                if len(current) > 1:
+                    runs.append(current)
+                current = [index]
+        if len(current) > 1:
+            runs.append(current)
+        return runs
+
+    def _key(self, index):
+        return bytes(self._checksums[index * CHECKSUM_SIZE:(index + 1) * CHECKSUM_SIZE])
+
+    def _id(self, index):
+        return str(uuid.UUID(bytes=bytes(self._ids[index * ID_SIZE:(index + 1) * ID_SIZE])))
+
+    def groups(self):
+        """
+        Yield the groups of assets sharing a checksum.
+
+        Within a group the asset recorded first is kept; the others are duplicates.
+
+        Yields:
+            dict: {"checksum", "keep", "duplicates", "size", "reclaimable"}.
+        """
+        for run in self._duplicate_runs():
+            members = sorted(run)
+            keep = members[0]
+            yield {
+                "checksum": base64.b64encode(self._key(keep)).decode(),
+                "keep": self._id(keep),
+                "duplicates": [self._id(i) for i in members[1:]],
+                "size": self._sizes[keep],
+                "reclaimable": sum(self._sizes[i] for i in members[1:]),
+            }
+
+
+def find_duplicates(client, action=None, chunk_size=500, concurrency=4, page_size=1000, **kwargs):
+    """
+    Find assets with identical content across the library and optionally resolve them.
+
+    Args:
+        client (ImmichClient): Authenticated client.
+        action (str, optional): 'stack' to stack each group under the kept asset,
+            'trash' to move the duplicates to the trash, or None to only report.
+        chunk_size (int): Number of assets per trash request.
+        concurrency (int): Number of stack/trash requests in flight.
+        page_size (int): search/metadata page size used for the listing.
+        **kwargs: Extra search/metadata filters (e.g., type, takenAfter).
+
+    Only your own assets are indexed: search/metadata also returns the assets of
+    partners shown in your timeline, and a group mixing owners could keep the
+    partner's copy and trash yours, or fail to stack.
+
+    Returns:
+        dict: {"assets": int, "skipped": int, "others": partner assets ignored,
+        "groups": [group], "reclaimable": int, "failed": number of assets whose action failed}.
+
+    Raises:
+        ValueError: If the action is unknown.
+    """
+    if action not in (None, "stack", "trash"):
+        raise ValueError(f"Unknown duplicate action: {action}")
+
+    owner_id = client.get_me()["id"]
+    index = ChecksumIndex()
+    others = 0
+    for asset in client.iter_assets(page_size=page_size, withExif=True, **kwargs):
+        if asset.get("ownerId", owner_id) != owner_id:
+            others += 1
+            continue
+        index.add_asset(asset)
+    groups = list(index.groups())
+
+    batches = []
+    if action == "stack":
+        # One request per group, with the kept asset as the stack's primary
+        batches = [[group["keep"]] + group["duplicates"] for group in groups]
+    elif action == "trash":
+        ids = [asset_id for group in groups for asset_id in group["duplicates"]]
+        batches = [ids[i:i + chunk_size] for i in range(0, len(ids), chunk_size)]
+
+    def apply(ids):
+        try:
+            if action == "stack":
+                client.create_stack(ids[0], ids)
+            else:
+                client.delete_assets(ids)
+            return 0
+        except Exception as e:
+            print(f"Error applying '{action}' to {len(ids)} assets: {e}")
+            return len(ids)
+
+    failed = sum(imap_ordered(apply, batches, concurrency))
+
+    return {
+        "assets": len(index),
+        "skipped": index.skipped,
+        "others": others,
+        "groups": groups,
+        "reclaimable": sum(group["reclaimable"] for group in groups),
+        "failed": failed,
+    }
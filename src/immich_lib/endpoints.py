@@ -0,0 +1,137 @@
+"""
+Health tracking and selection for clients configured with several base URLs
+(e.g. a LAN address and a WAN reverse proxy for the same Immich instance).
+"""
+
+import threading
+import time
+
+# Methods that can safely be replayed against another endpoint. PUT is left out:
+# Immich uses it for commands such as starting a job, which must not run twice.
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "DELETE")
+# Statuses a reverse proxy returns when it cannot reach the server
+GATEWAY_ERRORS = (502, 503, 504)
+
+
+class Endpoint:
+    """
+    One base URL with its latency estimate and circuit breaker state.
+
+    Attributes:
+        server_url (str): Base URL of the server.
+        api_url (str): URL of the API root.
+        latency (float | None): Exponentially weighted moving average of response times.
+        failures (int): Consecutive failures.
+        opened_at (float | None): When the circuit opened, or None while it is closed.
+    """
+    def __init__(self, server_url):
+        self.server_url = server_url.rstrip("/")
+        self.api_url = f"{self.server_url}/api"
+        self.latency = None
+        self.failures = 0
+        self.opened_at = None
+
+    def __repr__(self):
+        return f"Endpoint({self.server_url!r}, latency={self.latency}, failures={self.failures})"
+
+
+class EndpointPool:
+    """
+    Chooses the fastest healthy endpoint and fails over to the others.
+
+    Each endpoint has a circuit breaker: after `failure_threshold` consecutive
+    failures it is skipped for `reset_timeout` seconds, then given one trial
+    request (half-open) which closes the circuit again on success. Latencies
+    come from real requests and from background probes of server/version.
+    """
+    def __init__(self, urls, failure_threshold=3, reset_timeout=30.0, smoothing=0.3):
+        """
+        Args:
+            urls (list): Base URLs, in order of preference when latencies are unknown.
+            failure_threshold (int): Consecutive failures that open an endpoint's circuit.
+            reset_timeout (float): Seconds before an open circuit allows a trial request.
+            smoothing (float): Weight of the newest sample in the latency average.
+        """
+        if not urls:
+            raise ValueError("At least one server URL is required")
+        self.endpoints = [Endpoint(url) for url in urls]
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.smoothing = smoothing
+        self.lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def candidates(self):
+        """
+        Endpoints to try, best first: closed circuits by latency (unknown latencies keep
+        their configured order after the measured ones), then endpoints due a trial, then
+        open circuits as a last resort.
+
+        Returns:
+            list: Endpoint objects.
+        """
+        now = time.monotonic()
+        closed, trial, open_ = [], [], []
+        with self.lock:
+            for index, endpoint in enumerate(self.endpoints):
+                if endpoint.opened_at is None:
+                    latency = endpoint.latency if endpoint.latency is not None else float("inf")
+                    closed.append((latency, index, endpoint))
+                elif now - endpoint.opened_at >= self.reset_timeout:
+                    trial.append(endpoint)
+                else:
+                    open_.append(endpoint)
+        return [endpoint for _, _, endpoint in sorted(closed, key=lambda item: item[:2])] + trial + open_
+
+    def record_success(self, endpoint, latency):
+        """Close the endpoint's circuit and fold a response time into its latency average."""
+        with self.lock:
+            endpoint.failures = 0
+            endpoint.opened_at = None
+            if endpoint.latency is None:
+                endpoint.latency = latency
+            else:
+                endpoint.latency += self.smoothing * (latency - endpoint.latency)
+
+    def record_failure(self, endpoint):
+        """Count a failure, opening (or re-opening) the circuit once the threshold is reached."""
+        with self.lock:
+            endpoint.failures += 1
+            if endpoint.failures >= self.failure_threshold or endpoint.opened_at is not None:
+                endpoint.opened_at = time.monotonic()
+
+    def probe(self, session, timeout=5.0):
+        """
+        Measure every endpoint once with GET server/version.
+
+        Args:
+            session (requests.Session): Session used for the probes.
+            timeout (float): Per-probe timeout in seconds.
+        """
+        for endpoint in list(self.endpoints):
+            start = time.perf_counter()
+            try:
+                response = session.get(f"{endpoint.api_url}/server/version", timeout=timeout)
+                healthy = response.status_code < 500
+            except Exception:
+                healthy = False
+            if healthy:
+                self.record_success(endpoint, time.perf_counter() - start)
+            else:
+                self.record_failure(endpoint)
+
+    def start_probing(self, session, interval=30.0):
+        """Probe all endpoints now and then every `interval` seconds from a daemon thread."""
+        def run():
+            while True:
+                self.probe(session)
+                if self._stop.wait(interval):
+                    return
+
+        self._thread = threading.Thread(target=run, name="immich-endpoint-probe", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop background probing."""
+        self._stop.set()
@@ -0,0 +1,187 @@
+import base64
+import binascii
+from .utils import get_field, parse_datetime
+
+# Column name, logical type and source path (dotted, relative to the asset) of the export schema.
+METADATA_COLUMNS = [
+    ("id", "string", "id"),
+    ("ownerId", "string", "ownerId"),
+    ("deviceId", "string", "deviceId"),
+    ("libraryId", "string", "libraryId"),
+    ("type", "string", "type"),
+    ("originalPath", "string", "originalPath"),
+    ("originalFileName", "string", "originalFileName"),
+    ("originalMimeType", "string", "originalMimeType"),
+    ("checksum", "binary", "checksum"),
+    ("fileCreatedAt", "timestamp", "fileCreatedAt"),
+    ("fileModifiedAt", "timestamp", "fileModifiedAt"),
+    ("localDateTime", "timestamp", "localDateTime"),
+    ("updatedAt", "timestamp", "updatedAt"),
+    ("isFavorite", "bool", "isFavorite"),
+    ("isArchived", "bool", "isArchived"),
+    ("isTrashed", "bool", "isTrashed"),
+    ("duration", "string", "duration"),
+    ("livePhotoVideoId", "string", "livePhotoVideoId"),
+    ("fileSizeInByte", "int64", "exifInfo.fileSizeInByte"),
+    ("width", "int64", "exifInfo.exifImageWidth"),
+    ("height", "int64", "exifInfo.exifImageHeight"),
+    ("orientation", "string", "exifInfo.orientation"),
+    ("dateTimeOriginal", "timestamp", "exifInfo.dateTimeOriginal"),
+    ("make", "string", "exifInfo.make"),
+    ("model", "string", "exifInfo.model"),
+    ("lensModel", "string", "exifInfo.lensModel"),
+    ("fNumber", "float64", "exifInfo.fNumber"),
+    ("focalLength", "float64", "exifInfo.focalLength"),
+    ("iso", "int64", "exifInfo.iso"),
+    ("exposureTime", "string", "exifInfo.exposureTime"),
+    ("latitude", "float64", "exifInfo.latitude"),
+    ("longitude", "float64", "exifInfo.longitude"),
+    ("city", "string", "exifInfo.city"),
+    ("state", "string", "exifInfo.state"),
+    ("country", "string", "exifInfo.country"),
+    ("rating", "int64", "exifInfo.rating"),
+    ("description", "string", "exifInfo.description"),
+]
+
+
+def _convert(value, kind):
+    """Convert a JSON value to the Python type matching a schema column."""
+    if value is None:
+        return None
+    if kind == "timestamp":
+        return parse_datetime(value)
+    if kind == "binary":
+        try:
+            return base64.b64decode(value)
+        except (binascii.Error, ValueError):
+            return None
+    if kind == "int64":
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+    if kind == "float64":
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+    if kind == "bool":
+        return bool(value)
+    return str(value)
+
+
+def asset_to_row(asset):
+    """
+    Convert an asset dictionary into a typed export row.
+
+    Args:
+        asset (dict): Asset data as returned by search/metadata with EXIF.
+
+    Returns:
+        dict: Typed values keyed by export column name.
+    """
+    return {name: _convert(get_field(asset, path), kind) for name, kind, path in METADATA_COLUMNS}
+
+
+def iter_metadata_batches(client, batch_size=50000, **kwargs):
+    """
+    Stream the library's asset metadata as columnar batches.
+
+    Args:
+        client (ImmichClient): Authenticated client.
+        batch_size (int): Maximum number of rows per batch.
+        **kwargs: Extra search/metadata filters.
+
+    Yields:
+        dict: A list of typed values per column name, at most batch_size long.
+    """
+    columns = {name: [] for name, _, _ in METADATA_COLUMNS}
+    count = 0
+    for asset in client.iter_assets(**dict({"withExif": True}, **kwargs)):
+        for name, kind, path in METADATA_COLUMNS:
+            columns[name].append(_convert(get_field(asset, path), kind))
+        count += 1
+        if count >= batch_size:
+            yield columns
+            columns = {name: [] for name, _, _ in METADATA_COLUMNS}
+            count = 0
+    if count:
+        yield columns
+
+
+def arrow_schema():
+    """
+    Build the pyarrow schema of the metadata export.
+
+    Returns:
+        pyarrow.Schema: The export schema.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+    """
+    pa = _pyarrow()
+    types = {
+        "string": pa.string(),
+        "binary": pa.binary(),
+        "timestamp": pa.timestamp("ms", tz="UTC"),
+        "int64": pa.int64(),
+        "float64": pa.float64(),
+        "bool": pa.bool_(),
+    }
+    return pa.schema([(name, types[kind]) for name, kind, _ in METADATA_COLUMNS])
+
+
+def export_metadata(client, path, format="parquet", batch_size=50000, **kwargs):
+    """
+    Export all asset metadata to a Parquet or Arrow IPC file.
+
+    Assets are paged from search/metadata and written as Arrow record batches, so
+    memory is bounded by batch_size regardless of library size.
+
+    Args:
+        client (ImmichClient): Authenticated client.
+        path (str): Destination file path.
+        format (str): 'parquet' or 'arrow' (Arrow IPC / Feather v2).
+        batch_size (int): Number of rows per record batch (and Parquet row group).
+        **kwargs: Extra search/metadata filters.
+
+    Returns:
+        int: Number of exported assets.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+        ValueError: If the format is unknown.
+    """
+    pa = _pyarrow()
+    schema = arrow_schema()
+    if format == "parquet":
+        import pyarrow.parquet as pq
+
+        writer = pq.ParquetWriter(path, schema, compression="zstd")
+    elif format == "arrow":
+        writer = pa.ipc.new_file(path, schema)
+    else:
+        raise ValueError(f"Unknown export format: {format}")
+
+    total = 0
+    try:
+        for columns in iter_metadata_batches(client, batch_size, **kwargs):
+            batch = pa.record_batch(
+                [pa.array(columns[field.name], type=field.type) for field in schema], schema=schema
+            )
+            with client.measure("write"):
+                writer.write_batch(batch)
+            total += batch.num_rows
+    finally:
+        writer.close()
+    return total
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError(
+            "pyarrow is required for columnar export; install it with 'pip install immich-lib[parquet]'"
+        )
+    return pyarrow
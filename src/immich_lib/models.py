@@ -0,0 +1,238 @@
+import sys
+
+_EMPTY = ()
+
+
+class Model:
+    """
+    Base class for the compact, slotted records returned by typed client calls.
+
+    Each subclass lists its fields as (attribute, JSON key) pairs. Only those keys
+    are kept, low-cardinality strings (types, owner and device ids, ...) are interned,
+    and equal strings within a record (e.g. identical timestamps) share one object.
+    Nested blocks listed in _lazy are packed into plain tuples and only turned into
+    records when first accessed, except lists of records that have nested blocks of
+    their own (album assets), which are built immediately.
+    """
+    __slots__ = ()
+    _fields = ()
+    _interned = ()
+    _lazy = ()
+
+    @classmethod
+    def _pack(cls, data, strings=None):
+        """Return the field values of an API dictionary as a tuple, in _fields order."""
+        strings = {} if strings is None else strings
+        values = []
+        for attr, key in cls._fields:
+            value = data.get(key)
+            if isinstance(value, str):
+                value = sys.intern(value) if attr in cls._interned else strings.setdefault(value, value)
+            values.append(value)
+        return tuple(values)
+
+    @classmethod
+    def _unpack(cls, values):
+        """Build a record from a tuple produced by _pack."""
+        obj = cls.__new__(cls)
+        for (attr, _), value in zip(cls._fields, values):
+            setattr(obj, attr, value)
+        for attr, _, _ in cls._lazy:
+            setattr(obj, "_" + attr, None)
+        return obj
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Build a record from an API response dictionary.
+
+        Args:
+            data (dict): The JSON object returned by the API.
+
+        Returns:
+            Model: The compact record.
+        """
+        strings = {}
+        obj = cls._unpack(cls._pack(data, strings))
+        for attr, key, model in cls._lazy:
+            value = data.get(key)
+            if isinstance(value, dict):
+                value = model._pack(value, strings)
+            elif isinstance(value, list) and not value:
+                # Share one empty tuple instead of keeping an empty list per record
+                value = _EMPTY
+            elif isinstance(value, list):
+                # Records with nested blocks of their own (album assets) are built eagerly
+                value = [model.from_dict(item) if model._lazy else model._pack(item) for item in value]
+            setattr(obj, "_" + attr, value)
+        return obj
+
+    @classmethod
+    def from_list(cls, items):
+        """Convert a list of API dictionaries into records."""
+        return [cls.from_dict(item) for item in items or []]
+
+    def to_dict(self):
+        """
+        Convert the record back to an API-style dictionary.
+
+        Returns:
+            dict: Field values keyed by their JSON name.
+        """
+        data = {key: getattr(self, attr) for attr, key in self._fields}
+        for attr, key, _ in self._lazy:
+            value = getattr(self, attr)
+            if isinstance(value, Model):
+                value = value.to_dict()
+            elif isinstance(value, (list, tuple)):
+                value = [v.to_dict() for v in value]
+            data[key] = value
+        return data
+
+    def _resolve(self, attr, model):
+        """Turn a packed nested block into records on first access and cache the result."""
+        packed = getattr(self, "_" + attr)
+        if isinstance(packed, tuple) and packed is not _EMPTY:
+            packed = model._unpack(packed)
+            setattr(self, "_" + attr, packed)
+        elif isinstance(packed, list) and packed and isinstance(packed[0], tuple):
+            packed = [model._unpack(values) for values in packed]
+            setattr(self, "_" + attr, packed)
+        return packed
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return f"{type(self).__name__}(id={getattr(self, 'id', None)!r})"
+
+
+class ExifInfo(Model):
+    """EXIF metadata of an asset."""
+    _fields = (
+        ("make", "make"),
+        ("model", "model"),
+        ("lens_model", "lensModel"),
+        ("date_time_original", "dateTimeOriginal"),
+        ("exif_image_width", "exifImageWidth"),
+        ("exif_image_height", "exifImageHeight"),
+        ("file_size_in_byte", "fileSizeInByte"),
+        ("orientation", "orientation"),
+        ("f_number", "fNumber"),
+        ("focal_length", "focalLength"),
+        ("iso", "iso"),
+        ("exposure_time", "exposureTime"),
+        ("latitude", "latitude"),
+        ("longitude", "longitude"),
+        ("city", "city"),
+        ("state", "state"),
+        ("country", "country"),
+        ("description", "description"),
+        ("rating", "rating"),
+    )
+    _interned = ("make", "model", "lens_model", "orientation", "city", "state", "country")
+    __slots__ = tuple(attr for attr, _ in _fields)
+
+
+class Person(Model):
+    """A recognised person."""
+    _fields = (
+        ("id", "id"),
+        ("name", "name"),
+        ("birth_date", "birthDate"),
+        ("thumbnail_path", "thumbnailPath"),
+        ("is_hidden", "isHidden"),
+        ("is_favorite", "isFavorite"),
+        ("updated_at", "updatedAt"),
+    )
+    __slots__ = tuple(attr for attr, _ in _fields)
+
+
+class Tag(Model):
+    """A user tag."""
+    _fields = (
+        ("id", "id"),
+        ("name", "name"),
+        ("value", "value"),
+        ("parent_id", "parentId"),
+        ("color", "color"),
+        ("created_at", "createdAt"),
+        ("updated_at", "updatedAt"),
+    )
+    _interned = ("parent_id",)
+    __slots__ = tuple(attr for attr, _ in _fields)
+
+
+class Asset(Model):
+    """
+    A photo or video.
+
+    The 'exif_info', 'people' and 'tags' blocks are converted to records on first access.
+    """
+    _fields = (
+        ("id", "id"),
+        ("owner_id", "ownerId"),
+        ("device_id", "deviceId"),
+        ("library_id", "libraryId"),
+        ("type", "type"),
+        ("visibility", "visibility"),
+        ("original_file_name", "originalFileName"),
+        ("original_path", "originalPath"),
+        ("original_mime_type", "originalMimeType"),
+        ("checksum", "checksum"),
+        ("file_created_at", "fileCreatedAt"),
+        ("file_modified_at", "fileModifiedAt"),
+        ("local_date_time", "localDateTime"),
+        ("updated_at", "updatedAt"),
+        ("is_favorite", "isFavorite"),
+        ("is_archived", "isArchived"),
+        ("is_trashed", "isTrashed"),
+        ("duration", "duration"),
+        ("live_photo_video_id", "livePhotoVideoId"),
+    )
+    _interned = ("owner_id", "device_id", "library_id", "type", "visibility", "original_mime_type", "duration")
+    _lazy = (("exif_info", "exifInfo", ExifInfo), ("people", "people", Person), ("tags", "tags", Tag))
+    __slots__ = tuple(attr for attr, _ in _fields) + ("_exif_info", "_people", "_tags")
+
+    @property
+    def exif_info(self):
+        """ExifInfo | None: EXIF metadata, parsed on first access."""
+        return self._resolve("exif_info", ExifInfo)
+
+    @property
+    def people(self):
+        """list | tuple | None: People recognised in the asset, parsed on first access."""
+        return self._resolve("people", Person)
+
+    @property
+    def tags(self):
+        """list | tuple | None: Tags assigned to the asset, parsed on first access."""
+        return self._resolve("tags", Tag)
+
+
+class Album(Model):
+    """
+    An album. The 'assets' block is converted to Asset records when the album is
+    built; each asset's own nested blocks are still parsed on first access.
+    """
+    _fields = (
+        ("id", "id"),
+        ("album_name", "albumName"),
+        ("description", "description"),
+        ("owner_id", "ownerId"),
+        ("asset_count", "assetCount"),
+        ("album_thumbnail_asset_id", "albumThumbnailAssetId"),
+        ("shared", "shared"),
+        ("created_at", "createdAt"),
+        ("updated_at", "updatedAt"),
+        ("start_date", "startDate"),
+        ("end_date", "endDate"),
+    )
+    _interned = ("owner_id",)
+    _lazy = (("assets", "assets", Asset),)
+    __slots__ = tuple(attr for attr, _ in _fields) + ("_assets",)
+
+    @property
+    def assets(self):
+        """list | tuple | None: Asset records of the album."""
+        return self._resolve("assets", Asset)
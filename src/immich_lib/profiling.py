@@ -0,0 +1,290 @@
+"""
+Lightweight instrumentation and profilers used by `immich-tool --stats/--profile`.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+PROFILE_MODES = ("cprofile", "wall", "tracemalloc")
+
+
+class PhaseStats:
+    """
+    Thread-safe accumulator of time and bytes spent per phase.
+
+    Clients record into it when their `stats` attribute is set; phases used by the
+    library are 'http' (waiting for and reading responses), 'decode' (JSON parsing),
+    'write' (local file writes), 'hash' (checksumming) and 'progress' (progress bars).
+    Phases may overlap when work runs on several threads.
+
+    JSON responses also record their size on the wire and after content decoding,
+    which shows how much response compression saves.
+    """
+    def __init__(self):
+        self.phases = {}
+        self.wire_bytes = 0
+        self.decoded_bytes = 0
+        self.lock = threading.Lock()
+        self.started = time.perf_counter()
+
+    def add(self, phase, seconds, nbytes=0):
+        """
+        Record time (and optionally bytes) spent in a phase.
+
+        Args:
+            phase (str): Phase name.
+            seconds (float): Elapsed time.
+            nbytes (int): Bytes processed during that time.
+        """
+        with self.lock:
+            entry = self.phases.setdefault(phase, [0.0, 0, 0])
+            entry[0] += seconds
+            entry[1] += 1
+            entry[2] += nbytes
+
+    def add_transfer(self, wire, decoded):
+        """
+        Record the size of a response body on the wire and after decoding.
+
+        Args:
+            wire (int): Bytes received (compressed if the server applied an encoding).
+            decoded (int): Bytes after content decoding.
+        """
+        with self.lock:
+            self.wire_bytes += wire
+            self.decoded_bytes += decoded
+
+    @contextmanager
+    def measure(self, phase, nbytes=0):
+        """Context manager recording the time spent in its block under `phase`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(phase, time.perf_counter() - start, nbytes)
+
+    def timed_iter(self, phase, iterable):
+        """
+        Wrap an iterable (e.g. a response body stream), recording the time spent
+        waiting for each item and its length under `phase`.
+        """
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            self.add(phase, time.perf_counter() - start, len(item))
+            yield item
+
+    def as_dict(self):
+        """
+        Returns:
+            dict: {phase: {"seconds", "calls", "bytes"}} plus the total wall time and
+            the wire/decoded response sizes.
+        """
+        with self.lock:
+            phases = {
+                name: {"seconds": seconds, "calls": calls, "bytes": nbytes}
+                for name, (seconds, calls, nbytes) in self.phases.items()
+            }
+            transfer = {"wire_bytes": self.wire_bytes, "decoded_bytes": self.decoded_bytes}
+        return {"wall": time.perf_counter() - self.started, "phases": phases, "transfer": transfer}
+
+    def report(self):
+        """
+        Format the per-phase breakdown as a table.
+
+        Returns:
+            str: Human-readable report.
+        """
+        data = self.as_dict()
+        wall = data["wall"] or 1e-9
+        lines = [f"{'phase':<10}{'seconds':>10}{'% wall':>8}{'calls':>9}{'MB':>10}", "-" * 47]
+        accounted = 0.0
+        for name, entry in sorted(data["phases"].items(), key=lambda item: -item[1]["seconds"]):
+            accounted += entry["seconds"]
+            lines.append(
+                f"{name:<10}{entry['seconds']:>10.3f}{entry['seconds'] / wall:>8.1%}"
+                f"{entry['calls']:>9}{entry['bytes'] / (1024 * 1024):>10.1f}"
+            )
+        lines.append(f"{'other':<10}{max(wall - accounted, 0.0):>10.3f}{max(wall - accounted, 0.0) / wall:>8.1%}")
+        lines.append(f"{'wall':<10}{data['wall']:>10.3f}")
+        transfer = data["transfer"]
+        if transfer["decoded_bytes"]:
+            lines.append(
+                f"JSON responses: {transfer['wire_bytes'] / (1024 * 1024):.1f} MB on the wire, "
+                f"{transfer['decoded_bytes'] / (1024 * 1024):.1f} MB decoded "
+                f"({transfer['decoded_bytes'] / max(transfer['wire_bytes'], 1):.1f}x)"
+            )
+        return "\n".join(lines)
+
+
+class SamplingProfiler:
+    """
+    Wall-clock sampling profiler writing speedscope JSON.
+
+    A background thread snapshots every thread's stack at a fixed interval, so time
+    spent blocked on the network or disk shows up just like CPU time.
+    """
+    def __init__(self, interval=0.005):
+        """
+        Args:
+            interval (float): Seconds between samples.
+        """
+        self.interval = interval
+        self.frames = []
+        self.frame_index = {}
+        self.samples = {}
+        self._stop = threading.Event()
+        self._thread = None
+        self.started = None
+        self.stopped = None
+
+    def _frame_id(self, code):
+        key = (code.co_name, code.co_filename, code.co_firstlineno)
+        if key not in self.frame_index:
+            self.frame_index[key] = len(self.frames)
+            self.frames.append({"name": code.co_name, "file": code.co_filename, "line": code.co_firstlineno})
+        return self.frame_index[key]
+
+    def _sample(self):
+        own = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(self._frame_id(frame.f_code))
+                    frame = frame.f_back
+                if ident not in names:
+                    names = {thread.ident: thread.name for thread in threading.enumerate()}
+                stack.reverse()
+                self.samples.setdefault((ident, names.get(ident, str(ident))), []).append((stack, now - last))
+            last = now
+
+    def start(self):
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(target=self._sample, name="immich-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.stopped = time.perf_counter()
+
+    def to_speedscope(self, name="immich-tool"):
+        """
+        Returns:
+            dict: Profile in the speedscope file format (https://www.speedscope.app).
+        """
+        profiles = []
+        for (_, thread_name), samples in self.samples.items():
+            profiles.append({
+                "type": "sampled",
+                "name": thread_name,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": sum(weight for _, weight in samples),
+                "samples": [stack for stack, _ in samples],
+                "weights": [weight for _, weight in samples],
+            })
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "immich-tool",
+            "shared": {"frames": self.frames},
+            "profiles": profiles,
+        }
+
+    def top(self, limit=20):
+        """
+        Returns:
+            list: (function label, seconds) pairs ordered by inclusive wall time.
+        """
+        totals = {}
+        for samples in self.samples.values():
+            for stack, weight in samples:
+                for frame_id in set(stack):
+                    totals[frame_id] = totals.get(frame_id, 0.0) + weight
+        ranked = sorted(totals.items(), key=lambda item: -item[1])[:limit]
+        return [
+            (f"{self.frames[i]['name']} ({os.path.basename(self.frames[i]['file'])}:{self.frames[i]['line']})", seconds)
+            for i, seconds in ranked
+        ]
+
+
+def run_profiled(func, mode, output=None, stream=None):
+    """
+    Run `func` under a profiler and print a summary.
+
+    Args:
+        func (callable): Zero-argument callable to profile.
+        mode (str): 'cprofile', 'wall' or 'tracemalloc'.
+        output (str, optional): File for the raw profile: pstats for cprofile,
+            speedscope JSON for wall, a tracemalloc snapshot for tracemalloc.
+        stream (io.TextIOBase, optional): Where to print the summary. Defaults to sys.stderr.
+
+    Returns:
+        The return value of `func`.
+
+    Raises:
+        ValueError: If the mode is unknown.
+    """
+    stream = stream or sys.stderr
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"Unknown profile mode: {mode}")
+
+    if mode == "cprofile":
+        import cProfile
+        import pstats
+
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(func)
+        finally:
+            stats = pstats.Stats(profiler, stream=stream)
+            stats.sort_stats("cumulative").print_stats(25)
+            if output:
+                stats.dump_stats(output)
+                print(f"cProfile stats written to {output}", file=stream)
+
+    if mode == "wall":
+        profiler = SamplingProfiler()
+        profiler.start()
+        try:
+            return func()
+        finally:
+            profiler.stop()
+            print(f"Wall-clock profile ({profiler.stopped - profiler.started:.3f}s, inclusive time):", file=stream)
+            for label, seconds in profiler.top():
+                print(f"{seconds:>10.3f}  {label}", file=stream)
+            if output:
+                with open(output, "w") as f:
+                    json.dump(profiler.to_speedscope(), f)
+                print(f"Speedscope profile written to {output}", file=stream)
+
+    import tracemalloc
+
+    tracemalloc.start(25)
+    try:
+        return func()
+    finally:
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"Memory: current {current / (1024 * 1024):.1f} MB, peak {peak / (1024 * 1024):.1f} MB", file=stream)
+        for stat in snapshot.statistics("lineno")[:20]:
+            print(f"  {stat}", file=stream)
+        if output:
+            snapshot.dump(output)
+            print(f"tracemalloc snapshot written to {output}", file=stream)
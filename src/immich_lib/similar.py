@@ -0,0 +1,434 @@
+"""
+Near-duplicate detection from perceptual hashes of asset thumbnails.
+
+Thumbnails are downloaded concurrently, decoded and hashed in batches in a
+process pool (dHash or pHash, vectorized with NumPy when it is installed), and
+indexed in a multi-index hash table so that Hamming-radius queries do not
+compare every pair.
+Hashes are cached by asset id and updatedAt, so a re-scan only hashes assets
+that are new or changed.
+"""
+
+import io
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from .utils import chunked, imap_ordered, import_numpy
+
+HASH_METHODS = ("dhash", "phash")
+CACHE_VERSION = 1
+PHASH_SIZE = 32
+PHASH_LOW = 8
+
+
+def _pillow():
+    try:
+        from PIL import Image
+    except ImportError:
+        raise ImportError(
+            "Pillow is required for perceptual hashing; install it with 'pip install immich-lib[similar]'"
+        )
+    return Image
+
+
+def hamming(a, b):
+    """Number of differing bits between two integer hashes."""
+    return _popcount(a ^ b)
+
+
+# int.bit_count is only available from Python 3.10
+_popcount = getattr(int, "bit_count", None) or (lambda value: bin(value).count("1"))
+
+
+def _resize_shape(method):
+    """(width, height) images are reduced to before hashing."""
+    if method == "dhash":
+        return 9, 8
+    if method == "phash":
+        return PHASH_SIZE, PHASH_SIZE
+    raise ValueError(f"Unknown hash method: {method}")
+
+
+def _bits_to_int(bits):
+    value = 0
+    for bit in bits:
+        value = (value << 1) | bool(bit)
+    return value
+
+
+def _dct_matrix(n):
+    """Orthonormal DCT-II matrix as a list of rows."""
+    import math
+
+    rows = []
+    for k in range(n):
+        scale = math.sqrt((1 if k == 0 else 2) / n)
+        rows.append([scale * math.cos(math.pi * (2 * i + 1) * k / (2 * n)) for i in range(n)])
+    return rows
+
+
+def hash_pixels(images, method="dhash"):
+    """
+    Compute 64-bit perceptual hashes of grayscale images already reduced to the method's size.
+
+    dHash compares horizontally adjacent pixels of a 9x8 image. pHash takes the 8x8
+    lowest frequencies of the 2-D DCT of a 32x32 image and compares them to their
+    median. With NumPy a whole batch is hashed with a few array operations.
+
+    Args:
+        images (list | numpy.ndarray): Images as rows of pixel values, or an array of
+            shape (n, height, width).
+        method (str): 'dhash' or 'phash'.
+
+    Returns:
+        list: One integer hash per image.
+
+    Raises:
+        ValueError: If the method is unknown.
+    """
+    _resize_shape(method)
+    if len(images) == 0:
+        return []
+    np = import_numpy()
+    if np is not None:
+        pixels = np.asarray(images, dtype=np.float64)
+        if method == "dhash":
+            bits = pixels[:, :, 1:] > pixels[:, :, :-1]
+        else:
+            dct = np.asarray(_dct_matrix(pixels.shape[1]))
+            low = (dct @ pixels @ dct.T)[:, :PHASH_LOW, :PHASH_LOW]
+            bits = low > np.median(low.reshape(len(pixels), -1), axis=1)[:, None, None]
+        weights = np.left_shift(np.uint64(1), np.arange(63, -1, -1, dtype=np.uint64))
+        packed = (bits.reshape(len(pixels), 64).astype(np.uint64) * weights).sum(axis=1, dtype=np.uint64)
+        return [int(value) for value in packed]
+
+    hashes = []
+    for image in images:
+        if method == "dhash":
+            bits = [row[x + 1] > row[x] for row in image for x in range(len(row) - 1)]
+        else:
+            dct = _dct_matrix(len(image))
+            # Only the low-frequency corner of D @ X @ D.T is needed
+            partial = [[sum(d[i] * image[i][x] for i in range(len(image))) for x in range(len(image))]
+                       for d in dct[:PHASH_LOW]]
+            low = [sum(row[x] * d[x] for x in range(len(row))) for row in partial for d in dct[:PHASH_LOW]]
+            ordered = sorted(low)
+            median = (ordered[31] + ordered[32]) / 2
+            bits = [value > median for value in low]
+        hashes.append(_bits_to_int(bits))
+    return hashes
+
+
+def _load_pixels(data, method):
+    """Decode an image, convert it to grayscale and shrink it for hashing."""
+    Image = _pillow()
+    with Image.open(io.BytesIO(data)) as image:
+        image = image.convert("L").resize(_resize_shape(method), Image.BILINEAR)
+        width, height = image.size
+        values = list(image.getdata())
+    return [values[row * width:(row + 1) * width] for row in range(height)]
+
+
+def hash_images(blobs, method="dhash"):
+    """
+    Decode and hash a batch of encoded images (runs in worker processes).
+
+    Args:
+        blobs (list): Encoded image bytes.
+        method (str): 'dhash' or 'phash'.
+
+    Returns:
+        list: One hash per blob, None where the image could not be decoded.
+    """
+    decoded, positions = [], []
+    for position, data in enumerate(blobs):
+        try:
+            decoded.append(_load_pixels(data, method))
+            positions.append(position)
+        except ImportError:
+            raise
+        except Exception:
+            continue
+    results = [None] * len(blobs)
+    for position, value in zip(positions, hash_pixels(decoded, method)):
+        results[position] = value
+    return results
+
+
+class MultiIndexHash:
+    """
+    Multi-index hash table answering Hamming-radius queries over 64-bit hashes.
+
+    Each hash is split into `chunks` 16-bit substrings, each indexed in its own
+    table. By the pigeonhole principle, two hashes within `radius` bits agree to
+    within radius // chunks bits on at least one substring, so a query only probes
+    the substrings' near neighbours and verifies the few candidates found there.
+    (A BK-tree prunes almost nothing on 64-bit hashes, whose pairwise distances
+    cluster around 32.)
+    """
+    def __init__(self, radius, chunks=4):
+        """
+        Args:
+            radius (int): Maximum Hamming distance the table will be queried with.
+            chunks (int): Number of substrings per hash.
+        """
+        self.radius = radius
+        self.chunks = chunks
+        self.width = 64 // chunks
+        self.values = []
+        self.tables = [{} for _ in range(chunks)]
+        # XOR masks of every substring within radius // chunks bits
+        self.masks = [0]
+        for _ in range(radius // chunks):
+            self.masks = sorted(set(self.masks) | {m | (1 << bit) for m in self.masks for bit in range(self.width)})
+
+    def _parts(self, value):
+        mask = (1 << self.width) - 1
+        return [(value >> (i * self.width)) & mask for i in range(self.chunks)]
+
+    def add(self, value):
+        """Insert a hash and return its index."""
+        index = len(self.values)
+        self.values.append(value)
+        for table, part in zip(self.tables, self._parts(value)):
+            table.setdefault(part, []).append(index)
+        return index
+
+    def query(self, value, radius=None):
+        """
+        Find the stored hashes within `radius` (at most the table's radius) of `value`.
+
+        Returns:
+            list: Indices of the matching hashes.
+        """
+        radius = self.radius if radius is None else radius
+        found = set()
+        for table, part in zip(self.tables, self._parts(value)):
+            for mask in self.masks:
+                for index in table.get(part ^ mask, ()):
+                    if index not in found and hamming(value, self.values[index]) <= radius:
+                        found.add(index)
+        return sorted(found)
+
+    def pairs(self):
+        """
+        Find every pair of stored hashes within the table's radius.
+
+        With NumPy each (substring, mask) probe is a vectorized sort-and-search join
+        over all hashes instead of one dictionary lookup per hash.
+
+        Returns:
+            list: (i, j) index pairs with i < j.
+        """
+        np = import_numpy()
+        if np is None:
+            return [(i, j) for i, value in enumerate(self.values) for j in self.query(value) if j > i]
+
+        values = np.array(self.values, dtype=np.uint64)
+        indices = np.arange(len(values))
+        found = set()
+        for chunk in range(self.chunks):
+            parts = (values >> np.uint64(chunk * self.width)) & np.uint64((1 << self.width) - 1)
+            order = np.argsort(parts, kind="stable")
+            ordered = parts[order]
+            for mask in self.masks:
+                probes = parts ^ np.uint64(mask)
+                low = np.searchsorted(ordered, probes, side="left")
+                counts = np.searchsorted(ordered, probes, side="right") - low
+                total = int(counts.sum())
+                if not total:
+                    continue
+                left = np.repeat(indices, counts)
+                offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+                right = order[np.repeat(low, counts) + offsets]
+                keep = left < right
+                left, right = left[keep], right[keep]
+                close = _popcount_array(np, values[left] ^ values[right]) <= self.radius
+                found.update(zip(left[close].tolist(), right[close].tolist()))
+        return sorted(found)
+
+
+def _popcount_array(np, values):
+    """Per-element bit counts of a uint64 array."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(values)
+    table = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+    return table[values.view(np.uint8)].reshape(len(values), 8).sum(axis=1)
+
+
+class HashCache:
+    """
+    Perceptual hashes persisted in a JSON file, keyed by asset id and valid for one updatedAt.
+    """
+    def __init__(self, path, method):
+        """
+        Args:
+            path (str | None): Cache file; None keeps the cache in memory only.
+            method (str): Hash method; a cache written with another method is ignored.
+        """
+        self.path = path
+        self.method = method
+        self.entries = {}
+        if path and os.path.exists(path):
+            with open(path) as f:
+                data = json.load(f)
+            if data.get("version") == CACHE_VERSION and data.get("method") == method:
+                self.entries = data.get("hashes", {})
+
+    def get(self, asset_id, updated_at):
+        """Return the cached hash, or None if missing or stale."""
+        entry = self.entries.get(asset_id)
+        if entry is None or entry[0] != updated_at:
+            return None
+        return int(entry[1], 16)
+
+    def set(self, asset_id, updated_at, value):
+        self.entries[asset_id] = [updated_at, f"{value:016x}"]
+
+    def save(self, keep=None):
+        """
+        Atomically write the cache.
+
+        Args:
+            keep (set, optional): Only keep these asset ids (drops deleted assets).
+        """
+        if not self.path:
+            return
+        if keep is not None:
+            self.entries = {k: v for k, v in self.entries.items() if k in keep}
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"version": CACHE_VERSION, "method": self.method, "hashes": self.entries}, f)
+        os.replace(tmp_path, self.path)
+
+
+def group_similar(hashes, threshold):
+    """
+    Cluster assets whose hashes are within `threshold` bits of each other.
+
+    Clusters are connected components (single linkage): two assets land in one
+    group if a chain of close pairs joins them.
+
+    Args:
+        hashes (dict): {asset_id: hash}.
+        threshold (int): Maximum Hamming distance of a close pair.
+
+    Returns:
+        list: Groups of two or more asset ids, largest first.
+    """
+    index = MultiIndexHash(threshold)
+    # Identical hashes are indexed and queried once
+    slots = {value: index.add(value) for value in dict.fromkeys(hashes.values())}
+    parent = list(range(len(slots)))
+
+    def find(item):
+        root = item
+        while parent[root] != root:
+            root = parent[root]
+        while parent[item] != root:
+            parent[item], item = root, parent[item]
+        return root
+
+    for i, j in index.pairs():
+        a, b = find(i), find(j)
+        if a != b:
+            parent[b] = a
+
+    groups = {}
+    for asset_id in hashes:
+        groups.setdefault(find(slots[hashes[asset_id]]), []).append(asset_id)
+    return sorted((sorted(g) for g in groups.values() if len(g) > 1), key=lambda g: (-len(g), g))
+
+
+def find_similar(client, threshold=6, method="dhash", cache_path=None, concurrency=8,
+                 processes=None, batch_size=64, page_size=1000, **kwargs):
+    """
+    Find visually similar images (resized or re-encoded copies) across the library.
+
+    Args:
+        client (ImmichClient): Authenticated client.
+        threshold (int): Maximum Hamming distance between hashes of similar images.
+        method (str): 'dhash' or 'phash'.
+        cache_path (str, optional): JSON file caching hashes between runs.
+        concurrency (int): Number of thumbnail downloads in flight.
+        processes (int, optional): Hashing worker processes; None uses one per CPU,
+            0 hashes in the calling process.
+        batch_size (int): Thumbnails per hashing task.
+        page_size (int): search/metadata page size used for the listing.
+        **kwargs: Extra search/metadata filters (e.g., takenAfter, albumIds).
+
+    Returns:
+        dict: {"assets", "cached", "hashed", "failed": counts, "groups": [[asset ids]]}.
+
+    Raises:
+        ImportError: If thumbnails need hashing and Pillow is not installed.
+        ValueError: If the method is unknown.
+    """
+    _resize_shape(method)
+    cache = HashCache(cache_path, method)
+    hashes, todo = {}, []
+    for asset in client.iter_assets(page_size=page_size, type="IMAGE", **kwargs):
+        cached = cache.get(asset["id"], asset.get("updatedAt"))
+        if cached is None:
+            todo.append((asset["id"], asset.get("updatedAt")))
+        else:
+            hashes[asset["id"]] = cached
+    cached_count = len(hashes)
+    if todo:
+        _pillow()
+
+    def fetch(item):
+        try:
+            return item, client.view_asset(item[0], size="thumbnail").content
+        except Exception:
+            return item, None
+
+    failed = 0
+
+    def collect(items, values):
+        nonlocal failed
+        for (asset_id, updated_at), value in zip(items, values):
+            if value is None:
+                failed += 1
+                continue
+            hashes[asset_id] = value
+            cache.set(asset_id, updated_at, value)
+
+    downloads = imap_ordered(fetch, todo, concurrency)
+    if processes == 0:
+        for batch in chunked(downloads, batch_size):
+            collect([item for item, _ in batch], _hash_downloaded(batch, method))
+    else:
+        workers = processes or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = deque()
+            for batch in chunked(downloads, batch_size):
+                pending.append(([item for item, _ in batch], pool.submit(_hash_downloaded, batch, method)))
+                # Keep a bounded number of batches in flight so thumbnails do not pile up in memory
+                if len(pending) > 2 * workers:
+                    items, future = pending.popleft()
+                    collect(items, future.result())
+            while pending:
+                items, future = pending.popleft()
+                collect(items, future.result())
+
+    # Filtered scans only see part of the library, so only full scans prune the cache
+    cache.save(keep=None if kwargs else set(hashes))
+    return {
+        "assets": cached_count + len(todo),
+        "cached": cached_count,
+        "hashed": len(todo) - failed,
+        "failed": failed,
+        "groups": group_similar(hashes, threshold),
+    }
+
+
+def _hash_downloaded(batch, method):
+    """Hash (item, bytes) pairs, with None for thumbnails that failed to download."""
+    blobs = [data for _, data in batch if data is not None]
+    values = iter(hash_images(blobs, method))
+    return [next(values) if data is not None else None for _, data in batch]
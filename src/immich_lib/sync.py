@@ -0,0 +1,214 @@
+"""
+Incremental album synchronisation between an Immich album and a local directory.
+
+A state file (.immich-sync.json) in the directory remembers which local file
+belongs to which asset and the checksum it was downloaded with, so each run
+only costs one album listing plus the transfers for what actually changed.
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+from .utils import file_checksum, run_concurrently
+
+STATE_FILE = ".immich-sync.json"
+STATE_VERSION = 1
+DEVICE_ID = "immich-tool"
+
+
+def load_state(directory):
+    """
+    Read the sync state of a directory.
+
+    Args:
+        directory (str): The synced directory.
+
+    Returns:
+        dict: The state ({"albumId", "assets": {asset_id: entry}}), empty if missing.
+    """
+    path = os.path.join(directory, STATE_FILE)
+    if not os.path.exists(path):
+        return {"version": STATE_VERSION, "albumId": None, "assets": {}}
+    with open(path) as f:
+        state = json.load(f)
+    state.setdefault("assets", {})
+    return state
+
+
+def save_state(directory, state):
+    """Atomically write the sync state of a directory."""
+    path = os.path.join(directory, STATE_FILE)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def _unique_name(name, asset_id, taken):
+    """Return `name`, or `name_<id prefix>` if another asset already uses it."""
+    if name not in taken:
+        return name
+    stem, ext = os.path.splitext(name)
+    return f"{stem}_{asset_id[:8]}{ext}"
+
+
+def _local_size(directory, entry):
+    try:
+        return os.path.getsize(os.path.join(directory, entry["path"]))
+    except OSError:
+        return None
+
+
+def plan_sync(remote, state, directory, delete=False, upload=False):
+    """
+    Diff the album's assets against the local state.
+
+    Args:
+        remote (dict): {asset_id: asset} for the assets currently in the album.
+        state (dict): State as returned by load_state.
+        directory (str): The synced directory.
+        delete (bool): Plan removal of local files whose asset left the album.
+        upload (bool): Plan upload of local files not tracked by the state.
+
+    Returns:
+        dict: {"download": [(asset_id, relative path)], "remove": [asset_id],
+        "upload": [relative path], "unchanged": int}.
+    """
+    tracked = state["assets"]
+    owned = {entry["path"] for entry in tracked.values()}
+    # Untracked local files are never overwritten: new downloads get another name
+    local = set(os.listdir(directory)) if os.path.isdir(directory) else set()
+    taken = owned | local
+    plan = {"download": [], "remove": [], "upload": [], "unchanged": 0}
+
+    for asset_id, asset in remote.items():
+        entry = tracked.get(asset_id)
+        if entry is None:
+            name = asset.get("originalFileName") or f"{asset_id}.bin"
+            path = _unique_name(name, asset_id, taken)
+            taken.add(path)
+            owned.add(path)
+            plan["download"].append((asset_id, path))
+        elif entry.get("checksum") != asset.get("checksum") or _local_size(directory, entry) != entry.get("size"):
+            # Changed on the server, or the local copy is missing or was modified
+            plan["download"].append((asset_id, entry["path"]))
+        else:
+            plan["unchanged"] += 1
+
+    if delete:
+        plan["remove"] = sorted(asset_id for asset_id in tracked if asset_id not in remote)
+
+    if upload:
+        for name in sorted(os.listdir(directory)):
+            if name.startswith(".") or name.endswith(".part") or name in owned:
+                continue
+            if os.path.isfile(os.path.join(directory, name)):
+                plan["upload"].append(name)
+    return plan
+
+
+def sync_album(client, album_id, directory, delete=False, upload=False, concurrency=4, dry_run=False):
+    """
+    Bring a local directory in line with an album, transferring only the delta.
+
+    New and changed assets are downloaded (to a '.part' file, then renamed). With
+    `delete`, files whose asset left the album are removed; only files recorded in
+    the state are ever deleted. With `upload`, untracked local files are uploaded
+    and added to the album.
+
+    Args:
+        client (ImmichClient): Authenticated client.
+        album_id (str): UUID of the album.
+        directory (str): Local directory to sync.
+        delete (bool): Remove local files of assets that left the album.
+        upload (bool): Upload untracked local files into the album.
+        concurrency (int): Number of parallel transfers.
+        dry_run (bool): Only compute the plan.
+
+    Returns:
+        dict: The plan, plus "failed" (asset ids or paths) when not a dry run.
+    """
+    os.makedirs(directory, exist_ok=True)
+    state = load_state(directory)
+    if state.get("albumId") not in (None, album_id):
+        raise ValueError(f"{directory} is already synced with album {state['albumId']}")
+    state["albumId"] = album_id
+
+    remote = {}
+    for asset in client.iter_album_assets(album_id):
+        # Keep only what the diff needs so memory stays small for large albums
+        remote[asset["id"]] = {
+            "originalFileName": asset.get("originalFileName"),
+            "checksum": asset.get("checksum"),
+            "updatedAt": asset.get("updatedAt"),
+        }
+
+    plan = plan_sync(remote, state, directory, delete=delete, upload=upload)
+    if dry_run:
+        return plan
+
+    tracked = state["assets"]
+    failed = []
+
+    def download(item):
+        asset_id, path = item
+        full_path = os.path.join(directory, path)
+        part_path = full_path + ".part"
+        if not client.download_asset(asset_id, part_path):
+            if os.path.exists(part_path):
+                os.remove(part_path)
+            return None
+        os.replace(part_path, full_path)
+        return asset_id, {
+            "path": path,
+            "checksum": remote[asset_id]["checksum"],
+            "updatedAt": remote[asset_id]["updatedAt"],
+            "size": os.path.getsize(full_path),
+        }
+
+    for item, result in zip(plan["download"], run_concurrently(download, plan["download"], concurrency)):
+        if result is None:
+            failed.append(item[0])
+        else:
+            tracked[result[0]] = result[1]
+
+    for asset_id in plan["remove"]:
+        entry = tracked.pop(asset_id)
+        try:
+            os.remove(os.path.join(directory, entry["path"]))
+        except FileNotFoundError:
+            pass
+
+    if plan["upload"]:
+        def send(path):
+            full_path = os.path.join(directory, path)
+            info = os.stat(full_path)
+            with client.measure("hash", info.st_size):
+                checksum = file_checksum(full_path)
+            modified = datetime.fromtimestamp(info.st_mtime, timezone.utc).isoformat()
+            try:
+                result = client.upload_asset(
+                    full_path,
+                    deviceAssetId=f"{path}-{info.st_size}",
+                    deviceId=DEVICE_ID,
+                    fileCreatedAt=modified,
+                    fileModifiedAt=modified,
+                )
+            except Exception as e:
+                print(f"Error uploading {path}: {e}")
+                return None
+            return result["id"], {"path": path, "checksum": checksum, "updatedAt": None, "size": info.st_size}
+
+        uploaded = []
+        for path, result in zip(plan["upload"], run_concurrently(send, plan["upload"], concurrency)):
+            if result is None:
+                failed.append(path)
+            else:
+                tracked[result[0]] = result[1]
+                uploaded.append(result[0])
+        if uploaded:
+            client.add_assets_to_album(album_id, uploaded)
+
+    save_state(directory, state)
+    plan["failed"] = failed
+    return plan
@@ -0,0 +1,247 @@
+import base64
+import codecs
+import hashlib
+import json
+import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from itertools import islice
+
+_FRACTION = re.compile(r"\.(\d+)")
+
+
+def import_numpy():
+    """Import NumPy on first use so the client does not pay for it at startup; None if unavailable."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def chunked(iterable, size):
+    """
+    Split an iterable into lists of at most `size` items.
+
+    Args:
+        iterable (iterable): The items to split.
+        size (int): Maximum number of items per chunk.
+
+    Yields:
+        list: The next chunk of items.
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run_concurrently(func, items, concurrency=4):
+    """
+    Call `func` on every item using a thread pool.
+
+    Args:
+        func (callable): Function taking a single item.
+        items (iterable): Items to process.
+        concurrency (int): Maximum number of calls in flight.
+
+    Returns:
+        list: Results in the same order as `items`.
+    """
+    items = list(items)
+    if concurrency <= 1 or len(items) <= 1:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(items))) as executor:
+        return list(executor.map(func, items))
+
+
+def imap_ordered(func, iterable, concurrency=4):
+    """
+    Lazily call `func` on every item with a bounded thread pool, yielding results in input order.
+
+    At most `concurrency` calls are in flight, so memory stays bounded even for
+    very long or infinite iterables.
+
+    Args:
+        func (callable): Function taking a single item.
+        iterable (iterable): Items to process.
+        concurrency (int): Maximum number of calls in flight.
+
+    Yields:
+        The result of each call, in the order of `iterable`.
+    """
+    if concurrency <= 1:
+        for item in iterable:
+            yield func(item)
+        return
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        pending = deque()
+        for item in iterable:
+            pending.append(executor.submit(func, item))
+            if len(pending) >= concurrency:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def get_field(record, path):
+    """
+    Look up a dotted field path (e.g. 'exifInfo.make') in a nested dictionary.
+
+    Args:
+        record (dict): The record to read from.
+        path (str): Dot-separated keys.
+
+    Returns:
+        The value, or None if any part of the path is missing.
+    """
+    value = record
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def parse_datetime(value):
+    """
+    Parse an ISO 8601 timestamp as returned by the Immich API.
+
+    Handles the trailing 'Z' and arbitrary fractional precision, which
+    datetime.fromisoformat only accepts from Python 3.11 onwards.
+
+    Args:
+        value (str): The timestamp string.
+
+    Returns:
+        datetime | None: The parsed datetime, or None if value is empty or invalid.
+    """
+    if not value:
+        return None
+    text = value.strip()
+    if text.endswith("Z"):
+        text = text[:-1] + "+00:00"
+    match = _FRACTION.search(text)
+    if match:
+        text = text[:match.start()] + "." + match.group(1)[:6].ljust(6, "0") + text[match.end():]
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        return None
+
+
+def file_checksum(path, chunk_size=1024 * 1024):
+    """
+    Compute the checksum Immich stores for an asset: base64 of the file's SHA-1.
+
+    Args:
+        path (str): Local file path.
+        chunk_size (int): Bytes read per iteration.
+
+    Returns:
+        str: Base64-encoded SHA-1 digest.
+    """
+    digest = hashlib.sha1()
+    # One reusable buffer: hashlib releases the GIL on large updates, so several
+    # threads can hash files in parallel without allocating a block per read
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    with open(path, "rb", buffering=0) as f:
+        for size in iter(lambda: f.readinto(buffer), 0):
+            digest.update(view[:size])
+    return base64.b64encode(digest.digest()).decode()
+
+
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",:]}"
+
+
+def iter_json_array(chunks, key):
+    """
+    Stream the items of one array field of a JSON object, without parsing the whole document.
+
+    The top-level object is scanned key by key; other values are decoded and discarded
+    (they are expected to be small), and the items of `key` are decoded and yielded one
+    at a time, so memory is bounded by the largest item rather than the response.
+
+    Args:
+        chunks (iterable): Bytes of the JSON document (e.g. response.iter_content()).
+        key (str): Name of the top-level array field to stream.
+
+    Yields:
+        The decoded array items, in order.
+
+    Raises:
+        ValueError: If the document is not a JSON object or is truncated.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    chunks = iter(chunks)
+    buffer, pos, eof = "", 0, False
+
+    def fill():
+        nonlocal buffer, pos, eof
+        chunk = next(chunks, None)
+        if chunk is None:
+            eof = True
+            buffer = buffer[pos:] + text_decoder.decode(b"", final=True)
+        else:
+            buffer = buffer[pos:] + text_decoder.decode(chunk)
+        pos = 0
+
+    def peek():
+        # Next significant character, reading more input as needed ("" at the end)
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(buffer) or eof:
+                return buffer[pos:pos + 1]
+            fill()
+
+    def expect(chars):
+        nonlocal pos
+        char = peek()
+        if not char or char not in chars:
+            raise ValueError(f"Malformed JSON: expected one of {chars!r}, got {char!r}")
+        pos += 1
+        return char
+
+    def value():
+        # Inside an object or array a complete value is always followed by a delimiter,
+        # which keeps truncated numbers (e.g. "1" of "1.5") out
+        nonlocal pos
+        peek()
+        while True:
+            try:
+                result, end = decoder.raw_decode(buffer, pos)
+                if eof or (end < len(buffer) and buffer[end] in _DELIMITERS):
+                    pos = end
+                    return result
+            except ValueError:
+                if eof:
+                    raise
+            fill()
+
+    expect("{")
+    if peek() == "}":
+        return
+    while True:
+        name = value()
+        expect(":")
+        if name == key and peek() == "[":
+            expect("[")
+            if peek() == "]":
+                pos += 1
+            else:
+                while True:
+                    yield value()
+                    if expect(",]") == "]":
+                        break
+        else:
+            value()
+        if expect(",}") == "}":
+            return
@@ -0,0 +1,114 @@
+"""
+Integrity check of a local mirror against the server's checksums.
+
+The mirror is expected in the layout written by backup-all and mirror-library
+(<root>/<owner>/<YYYY-MM>/<name>_<id prefix><ext>). Server metadata is streamed
+and every local file is hashed by a bounded pool of threads, so many reads are
+in flight at once while memory stays flat however large the library is.
+"""
+
+import os
+import time
+from .backup import backup_path, fetch_asset
+from .utils import file_checksum, imap_ordered
+
+
+def _check(path, asset):
+    """Compare one local file with its asset: 'ok', 'missing' or 'corrupt'."""
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return "missing"
+    expected = (asset.get("exifInfo") or {}).get("fileSizeInByte")
+    # A size mismatch is conclusive without reading the file
+    if expected and size != expected:
+        return "corrupt"
+    try:
+        checksum = file_checksum(path)
+    except OSError as e:
+        print(f"Error reading {path}: {e}")
+        return "corrupt"
+    if asset.get("checksum") and checksum != asset["checksum"]:
+        return "corrupt"
+    return "ok"
+
+
+def _extra_files(root, expected):
+    """Yield files under `root` that do not belong to any listed asset."""
+    for directory, _, files in os.walk(root):
+        for name in files:
+            path = os.path.join(directory, name)
+            if path not in expected:
+                yield path
+
+
+def verify_mirror(client, root, concurrency=16, repair=False, page_size=1000, **kwargs):
+    """
+    Check a local mirror of your own and your partners' libraries against the server.
+
+    A file shared by several libraries is only stored once by mirror-library, so an
+    asset counts as missing only when no file with its checksum was found.
+
+    Args:
+        client (ImmichClient): Authenticated client.
+        root (str): Root directory of the mirror.
+        concurrency (int): Number of files hashed in parallel.
+        repair (bool): Download missing and corrupt files again.
+        page_size (int): search/metadata page size used for the listing.
+        **kwargs: Extra search/metadata filters.
+
+    Returns:
+        dict: {"checked": int, "ok": int, "missing": [path], "corrupt": [path],
+        "extra": [path], "repaired": int, "failed": int, "bytes": int, "seconds": float}.
+    """
+    start = time.perf_counter()
+    report = {"checked": 0, "ok": 0, "missing": [], "corrupt": [], "extra": [],
+              "repaired": 0, "failed": 0, "bytes": 0, "seconds": 0.0}
+    expected = set()
+    present = set()
+    absent = {}
+    bad = []
+
+    def jobs():
+        for asset in client.iter_combined_library(
+            concurrency=min(concurrency, 4), dedupe=False, page_size=page_size, withExif=True, **kwargs
+        ):
+            path = backup_path(root, asset["owner"], asset)
+            expected.add(path)
+            yield path, asset
+
+    def check(job):
+        path, asset = job
+        return path, asset, _check(path, asset)
+
+    for path, asset, outcome in imap_ordered(check, jobs(), concurrency):
+        report["checked"] += 1
+        key = asset.get("checksum") or asset["id"]
+        if outcome == "missing":
+            absent.setdefault(key, (path, asset))
+            continue
+        present.add(key)
+        if outcome == "ok":
+            report["ok"] += 1
+            report["bytes"] += (asset.get("exifInfo") or {}).get("fileSizeInByte") or 0
+        else:
+            report["corrupt"].append(path)
+            bad.append((path, asset))
+
+    missing = [absent[key] for key in absent if key not in present]
+    report["missing"] = [path for path, _ in missing]
+    report["extra"] = sorted(_extra_files(root, expected)) if os.path.isdir(root) else []
+
+    if repair:
+        def fetch(job):
+            path, asset = job
+            if os.path.exists(path):
+                # Same-size corrupt files would otherwise be skipped as up to date
+                os.remove(path)
+            return fetch_asset(client, asset, path)[0]
+
+        for outcome in imap_ordered(fetch, bad + missing, concurrency):
+            report["repaired" if outcome == "downloaded" else "failed"] += 1
+
+    report["seconds"] = time.perf_counter() - start
+    return report
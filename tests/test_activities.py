@@ -0,0 +1,87 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from immich_lib.client import ImmichClient
+from immich_lib.api.activities import summarize_activities
+
+
+class TestActivityRollup(unittest.TestCase):
+    def setUp(self):
+        self.client = ImmichClient("http://localhost:2283", "key")
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = os.path.join(self.tmp.name, "stats.json")
+        self.albums = [
+            {"id": "a1", "albumName": "Quiet", "updatedAt": "t1"},
+            {"id": "a2", "albumName": "Busy", "updatedAt": "t1"},
+            {"id": "a3", "albumName": "Empty", "updatedAt": "t1"},
+        ]
+        self.counts = {"a1": {"comments": 1, "likes": 0}, "a2": {"comments": 5, "likes": 7}, "a3": {"comments": 0}}
+        patchers = [
+            patch.object(ImmichClient, "list_albums", side_effect=lambda: [dict(a) for a in self.albums]),
+            patch.object(ImmichClient, "get_activity_statistics", side_effect=lambda album_id: self.counts[album_id]),
+        ]
+        self.mock_list, self.mock_stats = [p.start() for p in patchers]
+        for p in patchers:
+            self.addCleanup(p.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_rollup_all_albums(self):
+        """Test rolling up statistics of every album"""
+        result = self.client.rollup_activity_statistics(concurrency=2)
+        self.assertEqual([row["albumName"] for row in result["albums"]], ["Busy", "Quiet", "Empty"])
+        self.assertEqual(result["totals"], {"comments": 6, "likes": 7})
+        self.assertIsNone(result["albums"][2]["likes"])
+        self.assertEqual((result["queried"], result["cached"], result["failed"]), (3, 0, 0))
+
+    def test_cache_only_requeries_changed_albums(self):
+        """Test that the cache skips albums whose updatedAt is unchanged"""
+        self.client.rollup_activity_statistics(cache_path=self.cache)
+        self.mock_stats.reset_mock()
+        self.albums[1]["updatedAt"] = "t2"
+        self.counts["a2"] = {"comments": 6, "likes": 7}
+        result = self.client.rollup_activity_statistics(cache_path=self.cache)
+        self.mock_stats.assert_called_once_with("a2")
+        self.assertEqual((result["queried"], result["cached"]), (1, 2))
+        self.assertEqual(result["totals"]["comments"], 7)
+
+        # An expired entry is refreshed even though the album did not change
+        self.mock_stats.reset_mock()
+        self.client.rollup_activity_statistics(album_ids=["a1"], cache_path=self.cache, max_age=0)
+        self.mock_stats.assert_called_once_with("a1")
+
+    @patch.object(ImmichClient, "get_activities")
+    def test_details(self, mock_activities):
+        """Test that details mode counts likes and comments per user"""
+        mock_activities.return_value = [
+            {"type": "like", "user": {"name": "Ann"}, "createdAt": "2024-01-02T00:00:00Z"},
+            {"type": "comment", "user": {"name": "Bob"}, "createdAt": "2024-01-03T00:00:00Z"},
+            {"type": "like", "user": {"name": "Bob"}, "createdAt": "2024-01-01T00:00:00Z"},
+        ]
+        result = self.client.rollup_activity_statistics(album_ids=["a3"], details=True)
+        row = result["albums"][0]
+        self.assertEqual((row["comments"], row["likes"]), (1, 2))
+        self.assertEqual(row["users"], {"Ann": 1, "Bob": 2})
+        self.assertEqual(row["lastActivity"], "2024-01-03T00:00:00Z")
+        mock_activities.assert_called_once_with("a3")
+        self.mock_stats.assert_not_called()
+
+    def test_failures_are_counted(self):
+        """Test that failed albums are counted and skipped"""
+        self.mock_stats.side_effect = Exception("boom")
+        with patch("sys.stdout"):
+            result = self.client.rollup_activity_statistics(album_ids=["a1"])
+        self.assertEqual((result["failed"], result["albums"]), (1, []))
+
+    def test_summarize_activities(self):
+        """Test summarizing a list of activities"""
+        self.assertEqual(
+            summarize_activities([{"type": "comment", "user": {"id": "u1"}}]),
+            {"comments": 1, "likes": 0, "users": {"u1": 1}, "lastActivity": None},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+import json
 import unittest
 from unittest.mock import patch, MagicMock
 from immich_lib.client import ImmichClient
@@ -37,6 +38,58 @@ class TestApiMixins(unittest.TestCase):
         self.client.get_album("alb1")
         mock_get.assert_called_with("albums/alb1")
 
+        self.client.get_album("alb1", without_assets=True)
+        mock_get.assert_called_with("albums/alb1", params={"withoutAssets": "true"})
+
+    @patch.object(ImmichClient, 'get')
+    @patch.object(ImmichClient, 'post')
+    def test_iter_album_assets(self, mock_post, mock_get):
+        """Test that an unshared album is streamed from the metadata search"""
+        mock_get.return_value = {"id": "alb1", "shared": False, "albumUsers": [], "assetCount": 2}
+        mock_post.side_effect = [
+            {"assets": {"items": [{"id": "a1"}], "nextPage": "2"}},
+            {"assets": {"items": [{"id": "a2"}], "nextPage": None}},
+        ]
+        ids = [asset["id"] for asset in self.client.iter_album_assets("alb1", page_size=1)]
+        self.assertEqual(ids, ["a1", "a2"])
+        mock_post.assert_called_with("search/metadata", json={"albumIds": ["alb1"], "page": 2, "size": 1})
+        mock_get.assert_called_once_with("albums/alb1", params={"withoutAssets": "true"})
+
+    @staticmethod
+    def _album_response(album, chunk_size=7):
+        body = json.dumps(album).encode()
+        response = MagicMock()
+        response.iter_content.return_value = [body[i:i + chunk_size] for i in range(0, len(body), chunk_size)]
+        return response
+
+    @patch.object(ImmichClient, 'get')
+    @patch.object(ImmichClient, 'post')
+    def test_iter_album_assets_shared_album(self, mock_post, mock_get):
+        """Test that a shared album streams assets added by other members from GET albums/{id}"""
+        members = [{"id": "a1"}, {"id": "other-member-asset"}]
+        response = self._album_response(
+            {"id": "alb1", "albumUsers": [{"user": {"id": "u2"}}], "assets": members, "assetCount": 2}
+        )
+        mock_get.side_effect = lambda path, params=None, stream=False: (
+            response if stream else {"id": "alb1", "shared": True, "albumUsers": [{"user": {"id": "u2"}}], "assetCount": 2}
+        )
+        ids = [asset["id"] for asset in self.client.iter_album_assets("alb1")]
+        self.assertEqual(ids, ["a1", "other-member-asset"])
+        mock_post.assert_not_called()
+        response.close.assert_called_once()
+
+    @patch.object(ImmichClient, 'get')
+    @patch.object(ImmichClient, 'post')
+    def test_iter_album_assets_falls_back_when_search_is_short(self, mock_post, mock_get):
+        """Test that assets missing from the search are completed from GET albums/{id}"""
+        album = {"id": "alb1", "shared": False, "assetCount": 2}
+        response = self._album_response(dict(album, assets=[{"id": "a1"}, {"id": "hidden-partner-asset"}]))
+        mock_get.return_value = response
+        mock_post.return_value = {"assets": {"items": [{"id": "a1"}], "nextPage": None}}
+        assets = list(self.client.iter_album_assets("alb1", typed=True, album=album))
+        self.assertEqual([asset.id for asset in assets], ["a1", "hidden-partner-asset"])
+        mock_get.assert_called_once_with("albums/alb1", stream=True)
+
     @patch.object(ImmichClient, 'post')
     @patch.object(ImmichClient, 'delete')
     @patch.object(ImmichClient, 'patch')
@@ -66,6 +119,8 @@ class TestApiMixins(unittest.TestCase):
         # delete_assets
         self.client.delete_assets(["ast1"])
         mock_delete.assert_called_with("assets", json={"ids": ["ast1"]})
+        self.client.delete_assets(["ast1"], force=True)
+        mock_delete.assert_called_with("assets", json={"ids": ["ast1"], "force": True})
 
         # list_assets calls search/metadata
         mock_post.return_value = {"assets": {"items": []}}
@@ -1,6 +1,7 @@
 import unittest
 from unittest.mock import patch, MagicMock
 import requests
+import io
 import os
 import tempfile
 from immich_lib.client import ImmichClient
@@ -63,6 +64,20 @@ class TestAssetsMixin(unittest.TestCase):
         result = self.client.list_assets()
         self.assertEqual(result, [])
 
+    @patch.object(ImmichClient, "post")
+    def test_iter_assets_follows_next_page(self, mock_post):
+        """Test that iter_assets walks every search page"""
+        mock_post.side_effect = [
+            {"assets": {"items": [{"id": "asset1"}, {"id": "asset2"}], "nextPage": "2"}},
+            {"assets": {"items": [{"id": "asset3"}], "nextPage": None}},
+        ]
+
+        result = [a["id"] for a in self.client.iter_assets(page_size=2, isFavorite=True)]
+        self.assertEqual(result, ["asset1", "asset2", "asset3"])
+        mock_post.assert_called_with(
+            "search/metadata", json={"isFavorite": True, "page": 2, "size": 2}
+        )
+
     @patch("requests.Session.request")
     def test_get_asset_info_success(self, mock_request):
         """Test successful get asset info"""
@@ -138,7 +153,7 @@ class TestAssetsMixin(unittest.TestCase):
         mock_response.iter_content.return_value = [b"test data"]
 
         # Mock file operations
-        with patch("builtins.open", MagicMock()) as mock_open:
+        with patch("builtins.open", MagicMock()) as mock_open, patch("immich_lib.api.assets.os.replace"):
             # Mock tqdm class directly since it's imported in the client module
             with patch("immich_lib.api.assets.tqdm") as mock_tqdm:
                 mock_tqdm_instance = MagicMock()
@@ -154,6 +169,67 @@ class TestAssetsMixin(unittest.TestCase):
                     # Should return True to indicate success
                     self.assertTrue(result)
 
+    def _raw_response(self, data, **headers):
+        response = MagicMock()
+        response.status_code = 200
+        response.headers = dict({"Content-Type": "video/mp4", "content-length": str(len(data))}, **headers)
+        response.raw = io.BytesIO(data)
+        response.iter_content.return_value = [data]
+        return response
+
+    @patch("requests.Session.request")
+    def test_download_asset_readinto_path(self, mock_request):
+        """Large bodies are copied from the raw stream with batched progress updates"""
+        data = os.urandom(3 * 1024 * 1024 + 123)
+        mock_request.return_value = self._raw_response(data)
+        with patch("immich_lib.api.assets.tqdm") as mock_tqdm, tempfile.TemporaryDirectory() as tmpdir:
+            pbar = mock_tqdm.return_value.__enter__.return_value
+            path = os.path.join(tmpdir, "video.mp4")
+            self.assertTrue(self.client.download_asset("asset123", path))
+            with open(path, "rb") as f:
+                self.assertEqual(f.read(), data)
+        mock_request.return_value.iter_content.assert_not_called()
+        self.assertEqual(sum(c.args[0] for c in pbar.update.call_args_list), len(data))
+        self.assertLessEqual(pbar.update.call_count, 2)
+
+    @patch("requests.Session.request")
+    def test_download_asset_encoded_body_uses_iter_content(self, mock_request):
+        """Content-encoded bodies must be decoded by requests, so the raw stream is not used"""
+        mock_request.return_value = self._raw_response(b"decoded", **{"content-encoding": "gzip"})
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "a.jpg")
+            self.assertTrue(self.client.download_asset("asset123", path))
+            with open(path, "rb") as f:
+                self.assertEqual(f.read(), b"decoded")
+        mock_request.return_value.iter_content.assert_called_once()
+
+    @patch("requests.Session.request")
+    def test_download_asset_fsync_policy(self, mock_request):
+        """fsync=<bytes> syncs periodically; preallocate reserves the file size"""
+        data = os.urandom(1024 * 1024)
+        mock_request.return_value = self._raw_response(data)
+        with patch("immich_lib.api.assets.os.fsync") as mock_fsync, \
+                patch("immich_lib.api.assets.os.posix_fallocate", create=True) as mock_fallocate, \
+                tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "a.jpg")
+            self.assertTrue(self.client.download_asset("asset123", path, preallocate=True, fsync=256 * 1024))
+        self.assertEqual(mock_fallocate.call_args.args[1:], (0, len(data)))
+        self.assertGreaterEqual(mock_fsync.call_count, 2)
+
+    @patch("requests.Session.request")
+    def test_download_asset_failure_leaves_no_file(self, mock_request):
+        """Test that a failed transfer removes the preallocated partial file and closes the response"""
+        response = self._raw_response(b"")
+        response.headers["content-length"] = str(1024 * 1024)
+        response.raw = None
+        response.iter_content.side_effect = requests.exceptions.ConnectionError("reset")
+        mock_request.return_value = response
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "a.mp4")
+            self.assertFalse(self.client.download_asset("asset123", path, preallocate=True))
+            self.assertEqual(os.listdir(tmpdir), [])
+        response.close.assert_called_once()
+
     @patch("requests.Session.request")
     def test_download_asset_success_no_path(self, mock_request):
         """Test asset download without file path (returns response)"""
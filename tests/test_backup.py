@@ -0,0 +1,173 @@
+import io
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+from immich_lib import backup
+
+
+def make_asset(user, index, size=4):
+    return {
+        "id": f"{user}-{index:04d}-asset",
+        "originalFileName": f"IMG_{index}.jpg",
+        "fileCreatedAt": "2024-05-01T10:00:00.000Z",
+        "exifInfo": {"fileSizeInByte": size},
+    }
+
+
+def make_client(user, count, log=None, fail=()):
+    client = MagicMock()
+    client.iter_assets.side_effect = lambda **kwargs: iter([make_asset(user, i) for i in range(count)])
+
+    def download(asset_id, output_path, throttle=None, progress=True):
+        if log is not None:
+            log.append(asset_id)
+        if asset_id in fail:
+            raise RuntimeError("boom")
+        with open(output_path, "wb") as f:
+            f.write(b"data")
+        return True
+
+    client.download_asset.side_effect = download
+    return client
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_unlimited_does_not_block(self):
+        """Test that a bucket without a rate never waits"""
+        bucket = backup.TokenBucket(None)
+        start = time.monotonic()
+        for _ in range(1000):
+            bucket.consume(1024 * 1024)
+        self.assertLess(time.monotonic() - start, 0.5)
+
+    def test_rate_is_enforced(self):
+        """Test that consumption beyond the burst is throttled"""
+        bucket = backup.TokenBucket(1000)
+        start = time.monotonic()
+        for _ in range(3):
+            bucket.consume(300)  # within the initial burst
+        bucket.consume(400)  # needs 300 more tokens at 1000/s
+        self.assertGreaterEqual(time.monotonic() - start, 0.25)
+
+
+class TestBackupOrchestrator(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.out = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_backs_up_all_users(self):
+        """Test that every user's assets are downloaded into their folder"""
+        clients = {"alice@example.com": make_client("alice", 3), "bob@example.com": make_client("bob", 2)}
+        report = backup.backup_all(clients, self.out, concurrency=4)
+        self.assertEqual(report["totals"]["downloaded"], 5)
+        self.assertEqual(report["totals"]["bytes"], 20)
+        self.assertEqual([user["user"] for user in report["users"]], list(clients))
+        path = backup.backup_path(self.out, "bob@example.com", make_asset("bob", 1))
+        self.assertEqual(path, os.path.join(self.out, "bob@example.com", "2024-05", "IMG_1_bob-0001.jpg"))
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), b"data")
+        clients["alice@example.com"].iter_assets.assert_called_with(page_size=1000, withExif=True)
+
+    def test_round_robin_across_users(self):
+        """Test that downloads alternate between users"""
+        log = []
+        clients = {
+            "big": make_client("big", 20, log),
+            "small": make_client("small", 3, log),
+        }
+        orchestrator = backup.BackupOrchestrator(clients, self.out, concurrency=1)
+        # Let both listings fill their queues before the single worker starts
+        for user in orchestrator.users:
+            orchestrator._list(user)
+        orchestrator._work()
+        self.assertEqual(log[:6], ["big-0000-asset", "small-0000-asset", "big-0001-asset",
+                                   "small-0001-asset", "big-0002-asset", "small-0002-asset"])
+        self.assertEqual(len(log), 23)
+
+    def test_existing_files_are_skipped(self):
+        """Test that files already present with the right size are skipped"""
+        clients = {"alice": make_client("alice", 2)}
+        backup.backup_all(clients, self.out)
+        clients["alice"].download_asset.reset_mock()
+        report = backup.backup_all(clients, self.out)
+        self.assertEqual(report["totals"]["skipped"], 2)
+        self.assertEqual(report["totals"]["downloaded"], 0)
+        clients["alice"].download_asset.assert_not_called()
+
+    def test_failures_are_counted_and_cleaned_up(self):
+        """Test that failed downloads are counted and leave no partial file"""
+        clients = {"alice": make_client("alice", 2, fail=("alice-0001-asset",))}
+        report = backup.backup_all(clients, self.out)
+        self.assertEqual(report["users"][0]["downloaded"], 1)
+        self.assertEqual(report["users"][0]["failed"], 1)
+        month = os.path.join(self.out, "alice", "2024-05")
+        self.assertEqual(os.listdir(month), ["IMG_0_alice-00.jpg"])
+
+    @patch("requests.Session.request")
+    def test_fetch_asset_uses_client_download(self, mock_request):
+        """Test that fetch_asset streams through download_asset, throttled, and closes the response"""
+        from immich_lib.client import ImmichClient
+        data = os.urandom(300 * 1024)
+        response = MagicMock()
+        response.status_code = 200
+        response.headers = {"content-length": str(len(data))}
+        response.raw = io.BytesIO(data)
+        mock_request.return_value = response
+        bucket = backup.TokenBucket(None)
+        bucket.consume = MagicMock()
+        path = os.path.join(self.out, "me", "2024-05", "a.jpg")
+
+        outcome = backup.fetch_asset(ImmichClient("http://localhost:2283", "key"), {"id": "a1"}, path, bucket)
+        self.assertEqual(outcome, ("downloaded", len(data)))
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), data)
+        self.assertEqual(sum(c.args[0] for c in bucket.consume.call_args_list), len(data))
+        response.close.assert_called_once()
+
+    def test_listing_error_is_reported(self):
+        """Test that one user's listing error does not stop the others"""
+        client = make_client("alice", 0)
+        client.iter_assets.side_effect = RuntimeError("forbidden")
+        report = backup.backup_all({"alice": client, "bob": make_client("bob", 1)}, self.out)
+        self.assertEqual(report["users"][0]["error"], "forbidden")
+        self.assertEqual(report["users"][1]["downloaded"], 1)
+
+
+    def test_mirror_library_fetches_each_asset_once(self):
+        """Test that the mirror downloads each unique asset into its owner's folder"""
+        client = make_client("me", 0)
+        assets = [dict(make_asset("me", 0), owner="me@example.com"), dict(make_asset("anna", 1), owner="anna@example.com")]
+
+        def combined(report=None, **kwargs):
+            report.update(listed=3, duplicates=1, owners={"me@example.com": 1, "anna@example.com": 1}, hidden=[])
+            return iter(assets)
+
+        client.iter_combined_library.side_effect = combined
+        report = backup.mirror_library(client, self.out, concurrency=2)
+        self.assertEqual(report["downloaded"], 2)
+        self.assertEqual(report["duplicates"], 1)
+        self.assertTrue(os.path.exists(backup.backup_path(self.out, "anna@example.com", assets[1])))
+        self.assertEqual(client.iter_combined_library.call_args[1]["withExif"], True)
+
+
+class TestResolveCredentials(unittest.TestCase):
+    def test_matches_by_email_name_or_id(self):
+        """Test matching credentials by email, name or id"""
+        admin = MagicMock()
+        admin.list_users.return_value = [
+            {"id": "u1", "email": "alice@example.com", "name": "Alice"},
+            {"id": "u2", "email": "bob@example.com", "name": "Bob"},
+            {"id": "u3", "email": "carol@example.com", "name": "Carol"},
+        ]
+        matched, missing = backup.resolve_credentials(admin, {"alice@example.com": "k1", "Bob": "k2"})
+        self.assertEqual(matched, {"alice@example.com": "k1", "bob@example.com": "k2"})
+        self.assertEqual(missing, ["carol@example.com"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,7 +3,9 @@ from unittest.mock import patch, MagicMock
 import requests
 import io
 import sys
-from immich_lib.base import ImmichBaseClient
+import threading
+import time
+from immich_lib.base import ENCODING_PREFERENCE, ImmichBaseClient, supported_encodings
 
 class TestImmichBaseClient(unittest.TestCase):
     def setUp(self):
@@ -99,5 +101,171 @@ class TestImmichBaseClient(unittest.TestCase):
         self.client.patch("test", json={"a": 3})
         mock_req.assert_called_with("PATCH", "test", json={"a": 3})
 
+
+class TestGetCoalescing(unittest.TestCase):
+    def setUp(self):
+        self.client = ImmichBaseClient("http://localhost:2283", "test-api-key", coalesce_gets=True)
+        self.release = threading.Event()
+
+    def _slow_response(self, payload):
+        def request(method, url, **kwargs):
+            self.release.wait(5)
+            response = MagicMock()
+            response.status_code = 200
+            response.headers = {"Content-Type": "application/json"}
+            response.json.side_effect = lambda: dict(payload)
+            return response
+        return request
+
+    def _burst(self, count, call):
+        results, errors = [], []
+
+        def worker():
+            try:
+                results.append(call())
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        deadline = time.time() + 5
+        while self.client.get_coalescing_stats()["coalesced"] < count - 1 and time.time() < deadline:
+            time.sleep(0.001)
+        self.release.set()
+        for thread in threads:
+            thread.join()
+        return results, errors
+
+    @patch('requests.Session.request')
+    def test_identical_gets_share_one_request(self, mock_request):
+        """Test that identical concurrent GETs share one request"""
+        mock_request.side_effect = self._slow_response({"id": "alb1"})
+        results, errors = self._burst(8, lambda: self.client.get("albums/alb1"))
+        self.assertEqual(errors, [])
+        self.assertEqual(mock_request.call_count, 1)
+        self.assertEqual(results, [{"id": "alb1"}] * 8)
+        # Every caller gets its own object
+        self.assertEqual(len({id(r) for r in results}), 8)
+        self.assertEqual(self.client.get_coalescing_stats(), {"requests": 1, "coalesced": 7, "in_flight": 0})
+
+    @patch('requests.Session.request')
+    def test_errors_are_shared(self, mock_request):
+        """Test that an error reaches every caller waiting on the request"""
+        def failing(method, url, **kwargs):
+            self.release.wait(5)
+            raise requests.exceptions.ConnectionError("down")
+        mock_request.side_effect = failing
+        results, errors = self._burst(4, lambda: self.client.get("albums/alb1"))
+        self.assertEqual(results, [])
+        self.assertEqual(len(errors), 4)
+        self.assertTrue(all(isinstance(e, requests.exceptions.ConnectionError) for e in errors))
+        # Every caller raises its own exception object
+        self.assertEqual(len({id(e) for e in errors}), 4)
+        self.assertEqual(mock_request.call_count, 1)
+
+    @patch('requests.Session.request')
+    def test_write_detaches_in_flight_gets(self, mock_request):
+        """Test that a GET issued after a write never joins a GET sent before it"""
+        def request(method, url, **kwargs):
+            if method == "GET":
+                self.release.wait(5)
+            response = MagicMock()
+            response.status_code = 200
+            response.headers = {"Content-Type": "application/json"}
+            response.json.return_value = {"method": method}
+            return response
+        mock_request.side_effect = request
+
+        results = []
+        first = threading.Thread(target=lambda: results.append(self.client.get("albums/alb1")))
+        first.start()
+        while mock_request.call_count < 1:
+            time.sleep(0.001)
+        self.client.put("albums/alb1", json={"albumName": "renamed"})
+        second = threading.Thread(target=lambda: results.append(self.client.get("albums/alb1")))
+        second.start()
+        deadline = time.time() + 5
+        while mock_request.call_count < 3 and time.time() < deadline:
+            time.sleep(0.001)
+        self.release.set()
+        first.join()
+        second.join()
+        self.assertEqual(len(results), 2)
+        self.assertEqual(self.client.get_coalescing_stats(), {"requests": 2, "coalesced": 0, "in_flight": 0})
+
+    @patch('requests.Session.request')
+    def test_disabled_by_default(self, mock_request):
+        """Test that coalescing is opt-in"""
+        self.client = ImmichBaseClient("http://localhost:2283", "test-api-key")
+        mock_request.side_effect = self._slow_response({"id": "alb1"})
+        self.release.set()
+        self.assertFalse(self.client.coalesce_gets)
+        self.client.get("albums/alb1")
+        self.assertEqual(self.client.get_coalescing_stats()["requests"], 0)
+
+    @patch('requests.Session.request')
+    def test_not_coalesced(self, mock_request):
+        """Test that other parameters, writes and streams are never coalesced"""
+        self.release.set()
+        mock_request.side_effect = self._slow_response({})
+        self.client.get("albums", params={"shared": "true"})
+        self.client.get("albums", params={"shared": "false"})
+        self.client.post("albums", json={})
+        self.client.get("albums", stream=True)
+        self.client.coalesce_gets = False
+        self.client.get("albums")
+        self.assertEqual(mock_request.call_count, 5)
+        self.assertEqual(self.client.get_coalescing_stats()["requests"], 2)
+
+
+class TestCompression(unittest.TestCase):
+    def test_auto_offers_every_supported_encoding(self):
+        """Test that 'auto' offers every decodable encoding"""
+        client = ImmichBaseClient("http://localhost:2283", "key")
+        self.assertIn("gzip", client.compression)
+        self.assertEqual(client.session.headers["Accept-Encoding"], ", ".join(supported_encodings()))
+
+    def test_explicit_and_disabled(self):
+        """Test explicit encodings and disabling compression"""
+        client = ImmichBaseClient("http://localhost:2283", "key", compression="GZIP, deflate")
+        self.assertEqual(client.compression, ["gzip", "deflate"])
+        self.assertEqual(client.session.headers["Accept-Encoding"], "gzip, deflate")
+        client.set_compression(None)
+        self.assertEqual(client.compression, [])
+        self.assertEqual(client.session.headers["Accept-Encoding"], "identity")
+
+    @patch("immich_lib.base.supported_encodings", return_value=["gzip", "deflate"])
+    def test_missing_decoder(self, mock_supported):
+        """Test that encodings without an installed decoder are rejected"""
+        client = ImmichBaseClient("http://localhost:2283", "key")
+        self.assertEqual(client.compression, ["gzip", "deflate"])
+        with self.assertRaises(ValueError) as ctx:
+            client.set_compression(["zstd", "gzip"])
+        self.assertIn("zstandard", str(ctx.exception))
+        with self.assertRaises(ValueError):
+            client.set_compression("lz4")
+
+    @patch("requests.Session.request")
+    def test_with_compression_leaves_shared_client_untouched(self, mock_request):
+        """Test that a per-command copy sends its own Accept-Encoding over the shared session"""
+        mock_request.return_value = MagicMock(status_code=204, headers={})
+        client = ImmichBaseClient("http://localhost:2283", "key", compression="gzip")
+        per_command = client.with_compression("none")
+        self.assertIs(per_command.session, client.session)
+        self.assertEqual(client.compression, ["gzip"])
+
+        per_command.delete("assets")
+        self.assertEqual(mock_request.call_args[1]["headers"]["Accept-Encoding"], "identity")
+        client.delete("assets")
+        self.assertEqual(mock_request.call_args[1]["headers"]["Accept-Encoding"], "gzip")
+
+    def test_supported_encodings_order(self):
+        """Test that supported encodings follow the preference order"""
+        encodings = supported_encodings()
+        self.assertEqual(encodings, sorted(encodings, key=ENCODING_PREFERENCE.index))
+        self.assertIn("deflate", encodings)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,132 @@
+import io
+import os
+import socket
+import sys
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+from immich_lib.daemon import DaemonServer, forward
+from immich_lib.cli import main
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"), "Unix sockets not available")
+class TestDaemon(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.socket_path = os.path.join(self.tmpdir, "d.sock")
+        self.client = MagicMock()
+        self.client.server_url = "http://immich"
+        self.client.server_urls = ["http://immich"]
+        self.client.headers = {"x-api-key": "k"}
+        self.client.list_albums.return_value = [{"id": "a1", "albumName": "Warm", "assetCount": 3}]
+        self.other_client = MagicMock()
+        self.factory = MagicMock(return_value=self.other_client)
+        self.server = DaemonServer(self.socket_path, self.client, self.factory)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        os.rmdir(self.tmpdir)
+
+    def test_forward_runs_command_with_warm_client(self):
+        """Test that a forwarded command reuses the daemon's client"""
+        out = io.StringIO()
+        code = forward(self.socket_path, ["list-albums"], stdout=out)
+        self.assertEqual(code, 0)
+        self.assertIn("Warm", out.getvalue())
+        self.client.list_albums.assert_called_once()
+        self.factory.assert_not_called()
+
+    def test_forward_other_credentials_and_errors(self):
+        """Test per-credential clients and exit codes of failing commands"""
+        self.other_client.check_auth.return_value = None
+        out = io.StringIO()
+        code = forward(self.socket_path, ["--key", "other", "check-auth"], stdout=out)
+        self.assertEqual(code, 0)
+        self.assertIn("Authentication failed", out.getvalue())
+        self.factory.assert_called_once_with("http://immich", "other")
+
+        err = io.StringIO()
+        self.assertEqual(forward(self.socket_path, ["no-such-command"], stderr=err), 2)
+        self.assertIn("invalid choice", err.getvalue())
+
+    def test_forward_compression_uses_per_command_client(self):
+        """Test that --compression does not change the shared warm client"""
+        per_command = self.client.with_compression.return_value
+        per_command.list_albums.return_value = []
+        self.assertEqual(forward(self.socket_path, ["--compression", "none", "list-albums"], stdout=io.StringIO()), 0)
+        self.client.with_compression.assert_called_once_with("none")
+        self.client.set_compression.assert_not_called()
+        per_command.list_albums.assert_called_once()
+
+    def test_main_forwards_when_socket_exists(self):
+        """Test that the CLI hands commands to the daemon"""
+        with patch("sys.stdout", new_callable=io.StringIO) as out:
+            main(["--socket", self.socket_path, "list-albums"])
+        self.assertIn("Warm", out.getvalue())
+
+    def test_main_forwards_env_file_settings(self):
+        """Test that credentials and compression from the caller's .env reach the daemon"""
+        self.other_client.with_compression.return_value.list_albums.return_value = []
+        workdir = tempfile.mkdtemp()
+        with open(os.path.join(workdir, ".env"), "w") as f:
+            f.write("IMMICH_SERVER_URL=http://family\nIMMICH_API_KEY=env-key\nIMMICH_COMPRESSION=none\n")
+        cwd = os.getcwd()
+        env = {k: v for k, v in os.environ.items() if not k.startswith("IMMICH_")}
+        try:
+            os.chdir(workdir)
+            # Use the built-in .env reader, which looks in the working directory
+            with patch.dict(os.environ, env, clear=True), patch.dict(sys.modules, {"dotenv": None}):
+                main(["--socket", self.socket_path, "list-albums"])
+        finally:
+            os.chdir(cwd)
+            os.remove(os.path.join(workdir, ".env"))
+            os.rmdir(workdir)
+        self.factory.assert_called_once_with("http://family", "env-key")
+        self.other_client.with_compression.assert_called_once_with("none")
+        self.client.list_albums.assert_not_called()
+
+    def test_second_daemon_refuses_live_socket(self):
+        """Test that a live socket is never removed"""
+        with self.assertRaises(RuntimeError):
+            DaemonServer(self.socket_path, self.client, self.factory)
+
+    def test_forward_ignores_socket_accessible_to_others(self):
+        """Test that credentials are never sent to a socket other users can reach"""
+        os.chmod(self.socket_path, 0o666)
+        err = io.StringIO()
+        self.assertIsNone(forward(self.socket_path, ["list-albums"], stderr=err))
+        self.assertIn("not a private socket", err.getvalue())
+        self.client.list_albums.assert_not_called()
+
+    def test_forward_ignores_socket_of_other_user(self):
+        """Test that a socket created by another user is not trusted"""
+        with patch("os.getuid", return_value=os.getuid() + 1):
+            self.assertIsNone(forward(self.socket_path, ["list-albums"], stderr=io.StringIO()))
+        self.client.list_albums.assert_not_called()
+
+    def test_server_refuses_path_of_other_user(self):
+        """Test that the daemon does not take over a path owned by another user"""
+        path = os.path.join(self.tmpdir, "other.sock")
+        open(path, "w").close()
+        try:
+            with patch("os.getuid", return_value=os.getuid() + 1):
+                with self.assertRaises(RuntimeError):
+                    DaemonServer(path, self.client, self.factory)
+            self.assertTrue(os.path.exists(path))
+        finally:
+            os.remove(path)
+
+
+class TestForwardWithoutDaemon(unittest.TestCase):
+    def test_forward_returns_none_without_daemon(self):
+        """Test fallback when nothing is listening"""
+        self.assertIsNone(forward(os.path.join(tempfile.gettempdir(), "missing-immich.sock"), ["list-albums"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+import base64
+import hashlib
+import unittest
+import uuid
+from unittest.mock import MagicMock, patch
+from immich_lib import duplicates
+
+
+def checksum(content):
+    return base64.b64encode(hashlib.sha1(content.encode()).digest()).decode()
+
+
+def make_asset(index, content, size=100, owner="me"):
+    return {
+        "id": str(uuid.UUID(int=index)),
+        "ownerId": owner,
+        "checksum": checksum(content),
+        "exifInfo": {"fileSizeInByte": size},
+    }
+
+
+class TestChecksumIndex(unittest.TestCase):
+    def build(self):
+        index = duplicates.ChecksumIndex()
+        for asset in [
+            make_asset(1, "a"), make_asset(2, "b"), make_asset(3, "a"),
+            make_asset(4, "c", 50), make_asset(5, "c", 50), make_asset(6, "a"),
+        ]:
+            index.add_asset(asset)
+        return index
+
+    def check_groups(self, index):
+        groups = sorted(index.groups(), key=lambda g: g["keep"])
+        self.assertEqual(len(groups), 2)
+        self.assertEqual(groups[0]["keep"], str(uuid.UUID(int=1)))
+        self.assertEqual(groups[0]["duplicates"], [str(uuid.UUID(int=3)), str(uuid.UUID(int=6))])
+        self.assertEqual(groups[0]["checksum"], checksum("a"))
+        self.assertEqual(groups[0]["reclaimable"], 200)
+        self.assertEqual(groups[1]["duplicates"], [str(uuid.UUID(int=5))])
+        self.assertEqual(groups[1]["reclaimable"], 50)
+
+    def test_groups(self):
+        """Test grouping assets with equal checksums"""
+        self.check_groups(self.build())
+
+    def test_groups_without_numpy(self):
+        """Test the pure-Python grouping fallback"""
+        with patch.object(duplicates, "import_numpy", return_value=None):
+            self.check_groups(self.build())
+
+    def test_compact_storage(self):
+        """Test that records are stored in fixed-width buffers"""
+        index = self.build()
+        self.assertEqual(len(index), 6)
+        self.assertEqual(len(index._checksums), 6 * duplicates.CHECKSUM_SIZE)
+        self.assertEqual(len(index._ids), 6 * duplicates.ID_SIZE)
+
+    def test_invalid_records_are_skipped(self):
+        """Test that assets without a valid checksum or id are skipped"""
+        index = duplicates.ChecksumIndex()
+        self.assertFalse(index.add(None, str(uuid.UUID(int=1))))
+        self.assertFalse(index.add("not base64!", str(uuid.UUID(int=1))))
+        self.assertFalse(index.add(checksum("a"), "not-a-uuid"))
+        self.assertEqual((len(index), index.skipped), (0, 3))
+        self.assertEqual(list(index.groups()), [])
+
+
+class TestFindDuplicates(unittest.TestCase):
+    def setUp(self):
+        self.client = MagicMock()
+        self.client.get_me.return_value = {"id": "me"}
+        self.assets = [make_asset(i, "same" if i < 4 else str(i)) for i in range(1, 7)]
+        self.client.iter_assets.side_effect = lambda **kwargs: iter(self.assets)
+
+    def test_report_only(self):
+        """Test reporting duplicates without changing anything"""
+        result = duplicates.find_duplicates(self.client, type="IMAGE")
+        self.client.iter_assets.assert_called_with(page_size=1000, withExif=True, type="IMAGE")
+        self.assertEqual(result["assets"], 6)
+        self.assertEqual(len(result["groups"]), 1)
+        self.assertEqual(result["reclaimable"], 200)
+        self.client.delete_assets.assert_not_called()
+        self.client.create_stack.assert_not_called()
+
+    def test_trash_in_batches(self):
+        """Test trashing duplicates in chunks"""
+        result = duplicates.find_duplicates(self.client, action="trash", chunk_size=1, concurrency=1)
+        self.assertEqual(
+            [c[0][0] for c in self.client.delete_assets.call_args_list],
+            [[str(uuid.UUID(int=2))], [str(uuid.UUID(int=3))]],
+        )
+        self.assertEqual(result["failed"], 0)
+
+    def test_stack_failures_are_counted(self):
+        """Test that failed stack requests are counted"""
+        self.client.create_stack.side_effect = Exception("boom")
+        result = duplicates.find_duplicates(self.client, action="stack")
+        keep, *others = [str(uuid.UUID(int=i)) for i in range(1, 4)]
+        self.client.create_stack.assert_called_with(keep, [keep] + others)
+        self.assertEqual(result["failed"], 3)
+
+    def test_partner_copies_are_ignored(self):
+        """Test that a partner's copy of your file is neither kept nor trashed"""
+        self.assets.insert(0, make_asset(100, "same", owner="partner"))
+        result = duplicates.find_duplicates(self.client, action="trash", concurrency=1)
+        self.assertEqual(result["others"], 1)
+        self.assertEqual(result["groups"][0]["keep"], str(uuid.UUID(int=1)))
+        trashed = [asset_id for c in self.client.delete_assets.call_args_list for asset_id in c[0][0]]
+        self.assertNotIn(str(uuid.UUID(int=100)), trashed)
+        self.assertEqual(sorted(trashed), [str(uuid.UUID(int=2)), str(uuid.UUID(int=3))])
+
+    def test_unknown_action(self):
+        """Test that an unknown action is rejected"""
+        with self.assertRaises(ValueError):
+            duplicates.find_duplicates(self.client, action="delete")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import requests
+from datetime import timedelta
+from immich_lib.base import ImmichBaseClient
+from immich_lib.endpoints import EndpointPool
+
+
+def json_response(status=200, payload=None):
+    response = MagicMock()
+    response.status_code = status
+    response.headers = {"Content-Type": "application/json"}
+    response.json.return_value = payload if payload is not None else {}
+    if status >= 400:
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError(f"{status}")
+    return response
+
+
+class TestEndpointPool(unittest.TestCase):
+    def test_latency_ordering(self):
+        """Test that the fastest endpoint is tried first"""
+        pool = EndpointPool(["http://lan", "http://wan", "http://backup"])
+        lan, wan, backup = pool.endpoints
+        self.assertEqual(pool.candidates(), [lan, wan, backup])
+        pool.record_success(wan, 0.01)
+        pool.record_success(lan, 0.2)
+        self.assertEqual(pool.candidates(), [wan, lan, backup])
+        # Latency is smoothed, so one fast sample does not flip the order immediately
+        pool.record_success(lan, 0.001)
+        self.assertAlmostEqual(lan.latency, 0.2 + 0.3 * (0.001 - 0.2))
+        self.assertEqual(pool.candidates()[0], wan)
+
+    def test_circuit_breaker(self):
+        """Test that failing endpoints are skipped, then given a trial request"""
+        pool = EndpointPool(["http://lan", "http://wan"], failure_threshold=2, reset_timeout=60)
+        lan, wan = pool.endpoints
+        pool.record_failure(lan)
+        self.assertEqual(pool.candidates(), [lan, wan])
+        pool.record_failure(lan)
+        self.assertEqual(pool.candidates(), [wan, lan])
+
+        # After the reset timeout the endpoint gets a trial; success closes the circuit
+        pool.reset_timeout = 0
+        self.assertEqual(pool.candidates(), [wan, lan])
+        pool.record_success(lan, 0.001)
+        self.assertIsNone(lan.opened_at)
+        self.assertEqual(lan.failures, 0)
+
+    def test_probe(self):
+        """Test that probes record failures and latencies"""
+        pool = EndpointPool(["http://lan", "http://wan"], failure_threshold=1)
+        session = MagicMock()
+        session.get.side_effect = [requests.exceptions.ConnectionError("down"), json_response()]
+        pool.probe(session)
+        session.get.assert_called_with("http://wan/api/server/version", timeout=5.0)
+        self.assertIsNotNone(pool.endpoints[0].opened_at)
+        self.assertIsNotNone(pool.endpoints[1].latency)
+
+
+class TestClientFailover(unittest.TestCase):
+    def setUp(self):
+        self.client = ImmichBaseClient(["http://lan:2283/", "https://wan.example.com"], "key", probe_interval=0)
+
+    def test_single_url_unchanged(self):
+        """Test that a single URL keeps the plain request path"""
+        client = ImmichBaseClient("http://localhost:2283", "key")
+        self.assertIsNone(client.endpoints)
+        self.assertEqual(client.server_urls, ["http://localhost:2283"])
+
+    @patch("requests.Session.request")
+    def test_idempotent_failover(self, mock_request):
+        """Test that GETs fail over to the next endpoint"""
+        def request(method, url, **kwargs):
+            if url.startswith("http://lan"):
+                raise requests.exceptions.ConnectTimeout("no route")
+            return json_response(payload={"ok": True})
+        mock_request.side_effect = request
+
+        self.assertEqual(self.client.get("server/version"), {"ok": True})
+        self.assertEqual(self.client.server_url, "https://wan.example.com")
+        self.assertEqual(self.client.api_url, "https://wan.example.com/api")
+        self.assertEqual(mock_request.call_args.kwargs["timeout"], (self.client.connect_timeout, None))
+        self.assertEqual(self.client.endpoints.endpoints[0].failures, 1)
+
+    @patch("requests.Session.request")
+    def test_gateway_error_failover(self, mock_request):
+        """Test failover on proxy gateway errors"""
+        mock_request.side_effect = [json_response(502), json_response(payload=[])]
+        self.assertEqual(self.client.get("tags"), [])
+        self.assertEqual(mock_request.call_count, 2)
+
+    @patch("requests.Session.request")
+    def test_put_is_not_replayed(self, mock_request):
+        """Test that a PUT such as a job command is never sent to a second endpoint"""
+        mock_request.side_effect = requests.exceptions.ConnectionError("reset")
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            self.client.put("jobs/thumbnailGeneration", json={"command": "start"})
+        self.assertEqual(mock_request.call_count, 1)
+
+    @patch("requests.Session.request")
+    def test_latency_is_time_to_headers(self, mock_request):
+        """Test that endpoint latency comes from the response headers, not the body transfer"""
+        response = json_response(payload={"ok": True})
+        response.elapsed = timedelta(milliseconds=20)
+        mock_request.return_value = response
+        self.client.get("server/version")
+        self.assertAlmostEqual(self.client.endpoints.endpoints[0].latency, 0.02)
+
+    @patch("requests.Session.request")
+    def test_post_is_not_replayed(self, mock_request):
+        """Test that a POST is never sent to a second endpoint"""
+        mock_request.side_effect = requests.exceptions.ConnectionError("reset")
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            self.client.post("assets", json={})
+        self.assertEqual(mock_request.call_count, 1)
+
+    @patch("requests.Session.request")
+    def test_all_endpoints_down(self, mock_request):
+        """Test that the last error is raised when every endpoint fails"""
+        mock_request.side_effect = requests.exceptions.ConnectionError("down")
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            self.client.get("albums")
+        self.assertEqual(mock_request.call_count, 2)
+
+    @patch("immich_lib.cli.ImmichClient")
+    def test_cli_comma_separated_urls(self, MockClient):
+        """Test that comma-separated URLs create a multi-endpoint client"""
+        from immich_lib.cli import create_client
+        create_client("http://lan:2283, https://wan.example.com", "key")
+        MockClient.assert_called_with(["http://lan:2283", "https://wan.example.com"], "key")
+        create_client("http://lan:2283", "key")
+        MockClient.assert_called_with("http://lan:2283", "key")
+
+
+if __name__ == "__main__":
+    unittest.main()
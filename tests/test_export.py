@@ -0,0 +1,77 @@
+import base64
+import os
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import patch
+from immich_lib.client import ImmichClient
+from immich_lib import export
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+ASSET = {
+    "id": "a1",
+    "type": "IMAGE",
+    "checksum": base64.b64encode(b"\x01" * 20).decode(),
+    "fileCreatedAt": "2024-05-01T12:00:00.000Z",
+    "isFavorite": True,
+    "exifInfo": {"fileSizeInByte": 2048, "make": "Canon", "fNumber": 2.8, "iso": "400"},
+}
+
+
+class TestExport(unittest.TestCase):
+    def setUp(self):
+        self.client = ImmichClient("http://localhost:2283", "test-api-key")
+
+    def test_asset_to_row_types(self):
+        """Test typed conversion of a single asset"""
+        row = export.asset_to_row(ASSET)
+        self.assertEqual(row["checksum"], b"\x01" * 20)
+        self.assertEqual(row["fileCreatedAt"], datetime(2024, 5, 1, 12, tzinfo=timezone.utc))
+        self.assertEqual((row["fileSizeInByte"], row["iso"], row["fNumber"]), (2048, 400, 2.8))
+        self.assertIsNone(row["latitude"])
+        self.assertEqual(set(row), {name for name, _, _ in export.METADATA_COLUMNS})
+
+    @patch.object(ImmichClient, "iter_assets")
+    def test_iter_metadata_batches(self, mock_iter):
+        """Test that rows are grouped into bounded columnar batches"""
+        mock_iter.return_value = iter([dict(ASSET, id=f"a{i}") for i in range(5)])
+
+        batches = list(export.iter_metadata_batches(self.client, batch_size=2, isFavorite=True))
+        self.assertEqual([len(b["id"]) for b in batches], [2, 2, 1])
+        self.assertEqual(batches[2]["id"], ["a4"])
+        mock_iter.assert_called_once_with(withExif=True, isFavorite=True)
+
+    @patch.object(export, "_pyarrow", side_effect=ImportError("pyarrow is required"))
+    def test_export_requires_pyarrow(self, _):
+        """Test the error raised without the optional dependency"""
+        with self.assertRaises(ImportError):
+            export.export_metadata(self.client, "out.parquet")
+
+    @unittest.skipIf(pyarrow is None, "pyarrow not installed")
+    @patch.object(ImmichClient, "iter_assets")
+    def test_export_parquet_and_arrow(self, mock_iter):
+        """Test writing Parquet and Arrow IPC files"""
+        import pyarrow.parquet as pq
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            mock_iter.return_value = iter([ASSET, dict(ASSET, id="a2", exifInfo=None)])
+            path = os.path.join(tmpdir, "meta.parquet")
+            self.assertEqual(export.export_metadata(self.client, path, batch_size=1), 2)
+            table = pq.read_table(path)
+            self.assertEqual(table.column("id").to_pylist(), ["a1", "a2"])
+            self.assertEqual(table.column("fileSizeInByte").to_pylist(), [2048, None])
+            self.assertEqual(table.schema, export.arrow_schema())
+
+            mock_iter.return_value = iter([ASSET])
+            path = os.path.join(tmpdir, "meta.arrow")
+            self.assertEqual(export.export_metadata(self.client, path, format="arrow"), 1)
+            with pyarrow.ipc.open_file(path) as reader:
+                self.assertEqual(reader.read_all().column("checksum").to_pylist(), [b"\x01" * 20])
+
+
+if __name__ == "__main__":
+    unittest.main()
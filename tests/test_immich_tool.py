@@ -135,11 +135,13 @@ class TestImmichClient(unittest.TestCase):
         mock_response.iter_content.return_value = [b'0123456789']
         mock_request.return_value = mock_response
 
-        with patch('immich_lib.api.assets.tqdm'):
+        with patch('immich_lib.api.assets.tqdm'), patch('immich_lib.api.assets.os.replace') as mock_replace:
             result = self.client.download_asset("p1", "local.jpg")
 
         self.assertTrue(result)
+        mock_file.assert_called_with("local.jpg.part", 'wb')
         mock_file().write.assert_called_with(b'0123456789')
+        mock_replace.assert_called_once_with("local.jpg.part", "local.jpg")
 
 class TestMain(unittest.TestCase):
     """Test suite for the main CLI entry point."""
@@ -168,7 +170,7 @@ class TestMain(unittest.TestCase):
     def test_main_list_assets(self, mock_stdout, MockClient):
         """Test CLI output for 'list-assets'."""
         mock_instance = MockClient.return_value
-        mock_instance.list_assets.return_value = [{'id': 'p1', 'originalFileName': 'test.jpg', 'type': 'IMAGE'}]
+        mock_instance.iter_assets.return_value = iter([{'id': 'p1', 'originalFileName': 'test.jpg', 'type': 'IMAGE'}])
         
         with patch('sys.argv', ['immich-tool', '--url', 'u', '--key', 'k', 'list-assets']):
             main()
@@ -184,9 +186,7 @@ class TestMain(unittest.TestCase):
         # Use simple return values for nested calls
         mock_instance = MockClient.return_value
         mock_instance.find_album.return_value = {'id': 'a1', 'albumName': 'MyAlbum'}
-        mock_instance.get_album.return_value = {
-            'id': 'a1', 'assets': [{'id': 'p1', 'originalFileName': 'img.jpg', 'type': 'IMAGE'}]
-        }
+        mock_instance.iter_album_assets.return_value = iter([{'id': 'p1', 'originalFileName': 'img.jpg', 'type': 'IMAGE'}])
         
         with patch('sys.argv', ['immich-tool', '--url', 'u', '--key', 'k', 'list-album-assets', 'MyAlbum']):
             main()
@@ -247,15 +247,170 @@ class TestMain(unittest.TestCase):
         """Test 'download-album' command dispatch."""
         mock_instance = MockClient.return_value
         mock_instance.find_album.return_value = {'id': 'a1', 'albumName': 'Album'}
-        mock_instance.get_album.return_value = {
-            'id': 'a1', 'albumName': 'Album', 'assets': [{'id': 'p1', 'originalFileName': 'f.jpg'}]
-        }
+        mock_instance.get_album.return_value = {'id': 'a1', 'albumName': 'Album', 'assetCount': 1}
+        mock_instance.iter_album_assets.return_value = iter([{'id': 'p1', 'originalFileName': 'f.jpg'}])
         
         with patch('sys.argv', ['immich-tool', '--url', 'u', '--key', 'k', 'download-album', 'Album']):
             with patch('os.makedirs'):
                 main()
         
-        mock_instance.download_asset.assert_called()
+        mock_instance.get_album.assert_called_once_with('a1', without_assets=True)
+        mock_instance.iter_album_assets.assert_called_with('a1', album=mock_instance.get_album.return_value)
+        mock_instance.download_asset.assert_called_with('p1', os.path.join('downloads', 'f.jpg'))
+
+    @patch('immich_lib.cli.ImmichClient')
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_main_sync_album_dry_run(self, mock_stdout, MockClient):
+        """Test 'sync-album --dry-run' prints the plan without downloading."""
+        import tempfile
+        mock_instance = MockClient.return_value
+        mock_instance.find_album.return_value = {'id': 'a1', 'albumName': 'Album'}
+        mock_instance.iter_album_assets.return_value = iter([{'id': 'p1', 'originalFileName': 'f.jpg', 'checksum': 'c'}])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            main(['--url', 'u', '--key', 'k', 'sync-album', 'Album', '-o', tmp, '--dry-run'])
+
+        mock_instance.download_asset.assert_not_called()
+        output = mock_stdout.getvalue()
+        self.assertIn("Would download p1 -> f.jpg", output)
+        self.assertIn("Would sync album 'Album': 1 downloads", output)
+
+    @patch('immich_lib.backup.backup_all')
+    @patch('immich_lib.cli.ImmichClient')
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_main_backup_all(self, mock_stdout, MockClient, mock_backup_all):
+        """Test 'backup-all' matches credentials to users and prints the report."""
+        import json
+        import tempfile
+        mock_instance = MockClient.return_value
+        mock_instance.server_urls = ['u']
+        mock_instance.list_users.return_value = [
+            {'id': 'u1', 'email': 'alice@example.com'},
+            {'id': 'u2', 'email': 'bob@example.com'},
+        ]
+        row = {'listed': 2, 'downloaded': 2, 'skipped': 0, 'failed': 0, 'bytes': 10, 'seconds': 1.0}
+        mock_backup_all.return_value = {
+            'users': [dict(row, user='alice@example.com', error=None)],
+            'totals': {k: v for k, v in row.items() if k != 'seconds'},
+            'seconds': 1.0,
+        }
+
+        with tempfile.TemporaryDirectory() as tmp:
+            creds = os.path.join(tmp, 'keys.json')
+            with open(creds, 'w') as f:
+                json.dump({'alice@example.com': 'alice-key'}, f)
+            main(['--url', 'u', '--key', 'k', 'backup-all', '--credentials', creds, '-o', tmp, '--bandwidth', '2'])
+
+        MockClient.assert_called_with('u', 'alice-key')
+        clients = mock_backup_all.call_args[0][0]
+        self.assertEqual(list(clients), ['alice@example.com'])
+        self.assertEqual(mock_backup_all.call_args[1]['bandwidth'], 2 * 1024 * 1024)
+        output = mock_stdout.getvalue()
+        self.assertIn('Skipping bob@example.com', output)
+        self.assertIn('Total', output)
+
+    @patch('immich_lib.backup.mirror_library')
+    @patch('immich_lib.cli.ImmichClient')
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_main_mirror_library(self, mock_stdout, MockClient, mock_mirror):
+        """Test 'mirror-library' prints owners, hidden partners and totals."""
+        mock_mirror.return_value = {
+            'listed': 3, 'duplicates': 1, 'owners': {'me@example.com': 2}, 'hidden': ['Ben'],
+            'downloaded': 2, 'skipped': 0, 'failed': 0, 'bytes': 10, 'seconds': 1.0,
+        }
+        main(['--url', 'u', '--key', 'k', 'mirror-library', '-o', 'out', '--bandwidth', '1'])
+
+        self.assertEqual(mock_mirror.call_args[0][1], 'out')
+        self.assertEqual(mock_mirror.call_args[1]['bandwidth'], 1024 * 1024)
+        output = mock_stdout.getvalue()
+        self.assertIn('Skipped Ben', output)
+        self.assertIn('1 shared duplicates', output)
+
+    @patch('immich_lib.verify.verify_mirror')
+    @patch('immich_lib.cli.ImmichClient')
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_main_verify(self, mock_stdout, MockClient, mock_verify):
+        """Test 'verify' lists problems and exits non-zero when files are bad."""
+        mock_verify.return_value = {
+            'checked': 2, 'ok': 1, 'missing': ['m.jpg'], 'corrupt': [], 'extra': ['x.jpg'],
+            'repaired': 0, 'failed': 0, 'bytes': 10, 'seconds': 1.0,
+        }
+        with self.assertRaises(SystemExit):
+            main(['--url', 'u', '--key', 'k', 'verify', 'mirror', '--concurrency', '8'])
+
+        self.assertEqual(mock_verify.call_args[0][1], 'mirror')
+        self.assertEqual(mock_verify.call_args[1]['concurrency'], 8)
+        output = mock_stdout.getvalue()
+        self.assertIn('Missing: m.jpg', output)
+        self.assertIn('Extra: x.jpg', output)
+
+    @patch('immich_lib.duplicates.find_duplicates')
+    @patch('immich_lib.cli.ImmichClient')
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_main_find_duplicates(self, mock_stdout, MockClient, mock_find):
+        """Test 'find-duplicates' prints groups and the reclaimable total."""
+        mock_find.return_value = {
+            'assets': 3, 'skipped': 0, 'failed': 0, 'reclaimable': 2 * 1024 * 1024,
+            'groups': [{'keep': 'a1', 'duplicates': ['a2', 'a3'], 'reclaimable': 2 * 1024 * 1024}],
+        }
+        main(['--url', 'u', '--key', 'k', 'find-duplicates', '--action', 'trash', '--type', 'IMAGE'])
+
+        self.assertEqual(mock_find.call_args[1]['action'], 'trash')
+        self.assertEqual(mock_find.call_args[1]['type'], 'IMAGE')
+        output = mock_stdout.getvalue()
+        self.assertIn('a1 <- a2, a3 (2.0 MB reclaimable)', output)
+        self.assertIn('1 duplicate groups, 2 duplicates, 2.0 MB reclaimable', output)
+        self.assertIn('Trashed 2 duplicates.', output)
+
+    @patch('immich_lib.similar.find_similar')
+    @patch('immich_lib.cli.ImmichClient')
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_main_find_similar(self, mock_stdout, MockClient, mock_find):
+        """Test 'find-similar' uses the per-user cache and prints groups."""
+        mock_find.return_value = {'assets': 3, 'hashed': 1, 'cached': 2, 'failed': 0, 'groups': [['a1', 'a2']]}
+        with patch.dict(os.environ, {'XDG_CACHE_HOME': '/tmp/cache-home'}):
+            main(['--url', 'u', '--key', 'k', 'find-similar', '--method', 'phash'])
+
+        self.assertEqual(
+            mock_find.call_args[1]['cache_path'], os.path.join('/tmp/cache-home', 'immich-tool', 'similar-phash.json')
+        )
+        output = mock_stdout.getvalue()
+        self.assertIn('a1, a2', output)
+        self.assertIn('1 groups of similar images', output)
+
+    @patch('immich_lib.cli.ImmichClient')
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_main_compression(self, mock_stdout, MockClient):
+        """Test '--compression' configures the client and reports unavailable decoders."""
+        mock_instance = MockClient.return_value
+        mock_instance.list_albums.return_value = []
+        main(['--url', 'u', '--key', 'k', '--no-daemon', '--compression', 'gzip', 'list-albums'])
+        mock_instance.set_compression.assert_called_with('gzip')
+
+        mock_instance.set_compression.side_effect = ValueError("Response encoding 'zstd' needs the zstandard package")
+        with self.assertRaises(SystemExit):
+            main(['--url', 'u', '--key', 'k', '--no-daemon', '--compression', 'zstd', 'list-albums'])
+        self.assertIn("needs the zstandard package", mock_stdout.getvalue())
+
+    @patch('immich_lib.cli.ImmichClient')
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_main_activity_report(self, mock_stdout, MockClient):
+        """Test 'activity-report' passes options through and prints the ranking."""
+        mock_instance = MockClient.return_value
+        mock_instance.rollup_activity_statistics.return_value = {
+            'albums': [{'albumId': 'a1', 'albumName': 'Trip', 'comments': 3, 'likes': 4}],
+            'totals': {'comments': 3, 'likes': 4}, 'queried': 1, 'cached': 0, 'failed': 0,
+        }
+        main(['--url', 'u', '--key', 'k', '--no-daemon', 'activity-report', '--album', 'a1',
+              '--no-cache', '--max-age', '24'])
+
+        kwargs = mock_instance.rollup_activity_statistics.call_args[1]
+        self.assertEqual(kwargs['album_ids'], ['a1'])
+        self.assertIsNone(kwargs['cache_path'])
+        self.assertEqual(kwargs['max_age'], 24 * 3600)
+        output = mock_stdout.getvalue()
+        self.assertIn('Trip', output)
+        self.assertIn('1 albums, 3 comments, 4 likes (1 queried, 0 from cache)', output)
 
     @patch('immich_lib.cli.ImmichClient')
     def test_main_download_asset(self, MockClient):
@@ -268,5 +423,69 @@ class TestMain(unittest.TestCase):
         
         mock_instance.download_asset.assert_called_with('p1', 'f.jpg')
 
+    @patch('immich_lib.cli.ImmichClient')
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_main_auto_stack_dry_run(self, mock_stdout, MockClient):
+        """Test 'auto-stack --dry-run' prints the plan."""
+        mock_instance = MockClient.return_value
+        mock_instance.auto_stack.return_value = [{'primaryAssetId': 'p1', 'assetIds': ['p1', 'p2']}]
+
+        with patch('sys.argv', ['immich-tool', '--url', 'u', '--key', 'k', 'auto-stack', '--dry-run']):
+            main()
+
+        self.assertIn("Would create stack p1 <- p2", mock_stdout.getvalue())
+        self.assertTrue(mock_instance.auto_stack.call_args.kwargs['dry_run'])
+
+    @patch('immich_lib.cli.ImmichClient')
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_main_list_assets_ndjson_fields(self, mock_stdout, MockClient):
+        """Test streaming NDJSON output with selected nested fields."""
+        mock_instance = MockClient.return_value
+        mock_instance.iter_assets.return_value = iter([
+            {'id': 'p1', 'type': 'IMAGE', 'exifInfo': {'make': 'Canon'}},
+            {'id': 'p2', 'type': 'VIDEO'},
+        ])
+
+        with patch('sys.argv', ['immich-tool', '--url', 'u', '--key', 'k', 'list-assets',
+                                '--format', 'ndjson', '--fields', 'id,exifInfo.make']):
+            main()
+
+        lines = [json.loads(line) for line in mock_stdout.getvalue().splitlines()]
+        self.assertEqual(lines, [{'id': 'p1', 'exifInfo.make': 'Canon'}, {'id': 'p2', 'exifInfo.make': None}])
+
+    @patch('immich_lib.cli.ImmichClient')
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_main_list_albums_csv(self, mock_stdout, MockClient):
+        """Test CSV output with the default album columns."""
+        mock_instance = MockClient.return_value
+        mock_instance.list_albums.return_value = [{'id': 'a1', 'albumName': 'Trip, 2024', 'assetCount': 2}]
+
+        with patch('sys.argv', ['immich-tool', '--url', 'u', '--key', 'k', 'list-albums', '--format', 'csv']):
+            main()
+
+        self.assertEqual(mock_stdout.getvalue(), 'id,albumName,assetCount\na1,"Trip, 2024",2\n')
+
+    @patch('immich_lib.cli.ImmichClient')
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_main_list_assets_empty_ndjson(self, mock_stdout, MockClient):
+        """Test that machine-readable formats print nothing for empty results."""
+        MockClient.return_value.iter_assets.return_value = iter([])
+
+        with patch('sys.argv', ['immich-tool', '--url', 'u', '--key', 'k', 'list-assets', '--format', 'ndjson']):
+            main()
+
+        self.assertEqual(mock_stdout.getvalue(), '')
+
+    @patch('immich_lib.export.export_metadata', return_value=3)
+    @patch('immich_lib.cli.ImmichClient')
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_main_export_metadata(self, mock_stdout, MockClient, mock_export):
+        """Test 'export-metadata' dispatch."""
+        with patch('sys.argv', ['immich-tool', '--url', 'u', '--key', 'k', 'export-metadata', 'out.arrow', '--format', 'arrow']):
+            main()
+
+        mock_export.assert_called_once_with(MockClient.return_value, 'out.arrow', format='arrow', batch_size=50000)
+        self.assertIn("Exported metadata of 3 assets", mock_stdout.getvalue())
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,57 @@
+"""
+Cold-start checks for the immich-tool CLI.
+
+Each check runs in a fresh interpreter so modules cached by other tests do not
+hide regressions. Import cost is checked through which modules get loaded rather
+than wall-clock time, which varies too much on shared CI runners.
+"""
+
+import subprocess
+import sys
+import unittest
+
+HEAVY_MODULES = (
+    "requests", "urllib3", "tqdm", "dotenv", "numpy",
+    "immich_lib.client", "immich_lib.base", "immich_lib.api",
+)
+
+
+def _run(code):
+    return subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+
+def _loaded_after(statement):
+    """Heavy modules present in sys.modules after running `statement` in a fresh interpreter."""
+    code = f"import sys\n{statement}\nprint(sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n"
+    return _run(code).stdout.strip().splitlines()[-1]
+
+
+class TestImportTime(unittest.TestCase):
+    def test_package_import_skips_heavy_modules(self):
+        """Test that importing the package loads neither the HTTP stack nor the API mixins"""
+        self.assertEqual(_loaded_after("import immich_lib"), "[]")
+
+    def test_cli_import_skips_heavy_modules(self):
+        """Test that importing the CLI loads neither the HTTP stack nor the API mixins"""
+        self.assertEqual(_loaded_after("import immich_lib.cli"), "[]")
+
+    def test_help_does_not_load_client(self):
+        """Test that --help never imports the HTTP stack"""
+        statement = (
+            "from immich_lib.cli import main\n"
+            "sys.argv = ['immich-tool', '--help']\n"
+            "try:\n"
+            "    main()\n"
+            "except SystemExit:\n"
+            "    pass"
+        )
+        self.assertEqual(_loaded_after(statement), "[]")
+
+    def test_package_exports_client_lazily(self):
+        """Test that the package still exposes ImmichClient on demand"""
+        code = "from immich_lib import ImmichClient; print(ImmichClient.__name__)"
+        self.assertEqual(_run(code).stdout.strip(), "ImmichClient")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+from unittest.mock import patch
+from immich_lib.client import ImmichClient
+
+
+def _jobs(active, waiting, completed=0, is_active=True):
+    return {
+        "faceDetection": {
+            "jobCounts": {"active": active, "waiting": waiting, "delayed": 0, "completed": completed, "failed": 0},
+            "queueStatus": {"isActive": is_active, "isPaused": False},
+        },
+        "thumbnailGeneration": {
+            "jobCounts": {"active": 0, "waiting": 0, "delayed": 0, "completed": 0, "failed": 0},
+            "queueStatus": {"isActive": False, "isPaused": False},
+        },
+    }
+
+
+class TestJobsMixin(unittest.TestCase):
+    def setUp(self):
+        self.client = ImmichClient("http://localhost:2283", "test-api-key")
+        self.clock = [0.0]
+        self.sleeps = []
+
+        def fake_sleep(seconds):
+            self.sleeps.append(seconds)
+            self.clock[0] += seconds
+
+        patcher = patch("immich_lib.api.jobs.time")
+        mock_time = patcher.start()
+        mock_time.monotonic.side_effect = lambda: self.clock[0]
+        mock_time.sleep.side_effect = fake_sleep
+        self.addCleanup(patcher.stop)
+
+    @patch.object(ImmichClient, "list_jobs")
+    def test_watch_jobs_rate_and_backoff(self, mock_list):
+        """Test throughput, ETA and adaptive polling interval"""
+        mock_list.side_effect = [_jobs(2, 98), _jobs(2, 48), _jobs(2, 48), _jobs(2, 48)]
+
+        watcher = self.client.watch_jobs("faceDetection", min_interval=1.0, max_interval=3.0, smoothing=1.0)
+        first = next(watcher)
+        self.assertEqual(list(first), ["faceDetection"])
+        self.assertEqual(first["faceDetection"]["pending"], 100)
+        self.assertIsNone(first["faceDetection"]["eta"])
+
+        second = next(watcher)["faceDetection"]
+        self.assertEqual(second["rate"], 50.0)
+        self.assertEqual(second["eta"], 1.0)
+
+        next(watcher)
+        next(watcher)
+        self.assertEqual(self.sleeps, [1.0, 1.0, 2.0])
+
+    @patch.object(ImmichClient, "list_jobs")
+    def test_wait_for_jobs_returns_when_idle(self, mock_list):
+        """Test waiting until a queue drains"""
+        mock_list.side_effect = [_jobs(1, 5), _jobs(0, 0, is_active=False), _jobs(0, 0, is_active=False)]
+
+        snapshot = self.client.wait_for_jobs(["faceDetection"], min_interval=0.5)
+        self.assertEqual(snapshot["faceDetection"]["pending"], 0)
+        self.assertEqual(mock_list.call_count, 3)
+
+    @patch.object(ImmichClient, "list_jobs")
+    def test_wait_for_jobs_timeout(self, mock_list):
+        """Test that a busy queue raises TimeoutError"""
+        mock_list.return_value = _jobs(1, 5)
+
+        with self.assertRaises(TimeoutError):
+            self.client.wait_for_jobs("faceDetection", timeout=5, min_interval=1.0, max_interval=1.0)
+
+    @patch.object(ImmichClient, "list_jobs")
+    def test_wait_for_jobs_timeout_is_not_overshot(self, mock_list):
+        """Test that sleeps are capped at the time left before the deadline"""
+        mock_list.return_value = _jobs(1, 5)
+
+        with self.assertRaises(TimeoutError):
+            self.client.wait_for_jobs("faceDetection", timeout=5, min_interval=4.0, max_interval=10.0)
+        self.assertEqual(self.clock[0], 5.0)
+
+    @patch.object(ImmichClient, "list_jobs")
+    def test_wait_for_jobs_unknown_id(self, mock_list):
+        """Test that a misspelled job id raises ValueError instead of counting as drained"""
+        mock_list.return_value = _jobs(0, 0, is_active=False)
+
+        with self.assertRaises(ValueError):
+            self.client.wait_for_jobs(["faceDetecton"])
+
+
+if __name__ == "__main__":
+    unittest.main()
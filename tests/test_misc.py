@@ -1,7 +1,9 @@
 import unittest
 from unittest.mock import patch, MagicMock
 import requests
+from array import array
 from immich_lib.client import ImmichClient
+from immich_lib.api.misc import decode_timeline_bucket
 
 
 class TestMiscellaneousMixin(unittest.TestCase):
@@ -104,6 +106,49 @@ class TestMiscellaneousMixin(unittest.TestCase):
         result = self.client.cleanup_library()
         self.assertTrue(result)
 
+    @patch.object(ImmichClient, "get")
+    def test_iter_timeline_chronological(self, mock_get):
+        """Test that buckets are fetched with shared filters and yielded oldest first"""
+        buckets = {
+            "2024-02-01T00:00:00.000Z": {"id": ["a3"], "isImage": [True]},
+            "2024-01-01T00:00:00.000Z": {"id": ["a1", "a2"], "isImage": [True, False]},
+        }
+
+        def fake_get(endpoint, params=None):
+            if endpoint == "timeline/buckets":
+                return [{"timeBucket": key, "count": len(body["id"])} for key, body in buckets.items()]
+            return buckets[params["timeBucket"]]
+
+        mock_get.side_effect = fake_get
+
+        result = list(self.client.iter_timeline(concurrency=2, isFavorite=True))
+        self.assertEqual([b["timeBucket"][:7] for b in result], ["2024-01", "2024-02"])
+        self.assertEqual(result[0]["columns"]["id"], ["a1", "a2"])
+        self.assertEqual(result[0]["columns"]["isImage"], array("b", [1, 0]))
+        mock_get.assert_any_call("timeline/buckets", params={"isFavorite": True, "size": "MONTH"})
+        mock_get.assert_any_call(
+            "timeline/bucket",
+            params={"isFavorite": True, "size": "MONTH", "timeBucket": "2024-02-01T00:00:00.000Z"},
+        )
+
+    def test_decode_timeline_bucket(self):
+        """Test columnar and legacy row payload decoding"""
+        columns = decode_timeline_bucket({
+            "id": ["a1", "a2"],
+            "ratio": [1.5, None],
+            "duration": [None, "0:00:05"],
+            "localOffsetHours": [1, 2],
+            "stack": [None, ["s1", 2]],
+        })
+        self.assertEqual(columns["localOffsetHours"], array("q", [1, 2]))
+        self.assertEqual(columns["ratio"].typecode, "d")
+        self.assertEqual(columns["duration"], [None, "0:00:05"])
+        self.assertEqual(columns["stack"], [None, ["s1", 2]])
+
+        legacy = decode_timeline_bucket([{"id": "a1", "isFavorite": True}, {"id": "a2", "isFavorite": False}])
+        self.assertEqual(legacy["id"], ["a1", "a2"])
+        self.assertEqual(legacy["isFavorite"], array("b", [1, 0]))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,147 @@
+import json
+import sys
+import unittest
+from unittest.mock import patch
+from immich_lib.client import ImmichClient
+from immich_lib.models import Album, Asset, ExifInfo, Person, Tag
+
+
+def make_asset(i, **extra):
+    asset = {
+        "id": f"asset-{i}",
+        "ownerId": "owner-1",
+        "deviceId": "device-1",
+        "type": "IMAGE",
+        "originalFileName": f"IMG_{i:04d}.JPG",
+        "originalMimeType": "image/jpeg",
+        "fileCreatedAt": "2024-05-01T10:00:00.000Z",
+        "localDateTime": "2024-05-01T10:00:00.000Z",
+        "isFavorite": False,
+        "exifInfo": {"make": "Canon", "model": "EOS R5", "fileSizeInByte": 1024 + i, "city": "Paris"},
+        "people": [{"id": "person-1", "name": "Alice"}],
+        "tags": [],
+        "unknownField": "dropped",
+    }
+    asset.update(extra)
+    return asset
+
+
+def deep_sizeof(obj, seen=None):
+    """Approximate the memory held by an object graph."""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple)):
+        size += sum(deep_sizeof(v, seen) for v in obj)
+    elif hasattr(obj, "__slots__"):
+        for cls in type(obj).__mro__:
+            for attr in getattr(cls, "__slots__", ()):
+                if hasattr(obj, attr):
+                    size += deep_sizeof(getattr(obj, attr), seen)
+    return size
+
+
+class TestModels(unittest.TestCase):
+    def test_from_dict_fields(self):
+        """Test that records keep the listed fields under attribute names"""
+        asset = Asset.from_dict(make_asset(1))
+        self.assertEqual(asset.id, "asset-1")
+        self.assertEqual(asset.original_file_name, "IMG_0001.JPG")
+        self.assertFalse(asset.is_favorite)
+        self.assertIsNone(asset.library_id)
+        self.assertFalse(hasattr(asset, "__dict__"))
+
+    def test_lazy_nested_blocks(self):
+        """Test that nested blocks are parsed on first access and cached"""
+        asset = Asset.from_dict(make_asset(1))
+        self.assertIsInstance(asset._exif_info, tuple)
+        exif = asset.exif_info
+        self.assertIsInstance(exif, ExifInfo)
+        self.assertEqual(exif.make, "Canon")
+        self.assertIs(asset.exif_info, exif)
+        self.assertEqual([p.name for p in asset.people], ["Alice"])
+        self.assertIsInstance(asset.people[0], Person)
+        self.assertEqual(asset.tags, ())
+
+    def test_missing_nested_blocks(self):
+        """Test records whose nested blocks are absent or empty"""
+        asset = Asset.from_dict({"id": "a"})
+        self.assertIsNone(asset.exif_info)
+        self.assertIsNone(asset.people)
+
+    def test_interning(self):
+        """Test that repeated strings are shared between and within records"""
+        first = Asset.from_dict(make_asset(1, ownerId="".join(["own", "er-9"])))
+        second = Asset.from_dict(make_asset(2, ownerId="".join(["own", "er-9"])))
+        self.assertIs(first.owner_id, second.owner_id)
+        self.assertIs(first.exif_info.make, second.exif_info.make)
+        # Equal strings within one record share a single object
+        self.assertIs(first.file_created_at, first.local_date_time)
+
+    def test_to_dict_round_trip(self):
+        """Test converting a record back to an API dictionary"""
+        data = make_asset(1)
+        data.pop("unknownField")
+        result = Asset.from_dict(data).to_dict()
+        self.assertEqual(result["id"], "asset-1")
+        self.assertEqual(result["exifInfo"]["make"], "Canon")
+        self.assertEqual(result["people"][0]["name"], "Alice")
+        self.assertEqual(result["tags"], [])
+        self.assertEqual(Asset.from_dict(result), Asset.from_dict(data))
+
+    def test_album_assets(self):
+        """Test that album assets become Asset records"""
+        album = Album.from_dict({"id": "album-1", "albumName": "Trip", "assets": [make_asset(1), make_asset(2)]})
+        self.assertEqual(album.album_name, "Trip")
+        self.assertEqual([a.id for a in album.assets], ["asset-1", "asset-2"])
+        self.assertEqual(album.assets[1].exif_info.file_size_in_byte, 1026)
+
+    def test_memory_savings(self):
+        """Test that records take far less memory than the raw dictionaries"""
+        # Round-trip through JSON so values are distinct objects, as in a real response
+        raw = json.loads(json.dumps([make_asset(i) for i in range(200)]))
+        typed = Asset.from_list(raw)
+        self.assertLess(deep_sizeof(typed) * 1.5, deep_sizeof(raw))
+
+
+class TestTypedClientMethods(unittest.TestCase):
+    def setUp(self):
+        self.client = ImmichClient("http://localhost:2283", "test-api-key")
+
+    def test_iter_assets_typed(self):
+        """Test typed asset iteration"""
+        page = {"assets": {"items": [make_asset(1), make_asset(2)], "nextPage": None}}
+        with patch.object(ImmichClient, "post", return_value=page) as mock_post:
+            assets = list(self.client.iter_assets(typed=True, isFavorite=True))
+        self.assertEqual([a.id for a in assets], ["asset-1", "asset-2"])
+        self.assertNotIn("typed", mock_post.call_args.kwargs["json"])
+
+    def test_list_albums_typed(self):
+        """Test typed album listing"""
+        with patch.object(ImmichClient, "get", return_value=[{"id": "a1", "albumName": "One"}]):
+            albums = self.client.list_albums(shared=True, typed=True)
+        self.assertIsInstance(albums[0], Album)
+        self.assertEqual(albums[0].album_name, "One")
+
+    def test_get_all_people_typed(self):
+        """Test typed people listing"""
+        response = {"total": 1, "people": [{"id": "p1", "name": "Alice"}]}
+        with patch.object(ImmichClient, "get", return_value=response):
+            result = self.client.get_all_people(typed=True)
+        self.assertEqual(result["total"], 1)
+        self.assertIsInstance(result["people"][0], Person)
+
+    def test_list_tags_typed(self):
+        """Test typed tag listing"""
+        with patch.object(ImmichClient, "get", return_value=[{"id": "t1", "value": "a/b", "parentId": "t0"}]):
+            tags = self.client.list_tags(typed=True)
+        self.assertIsInstance(tags[0], Tag)
+        self.assertEqual(tags[0].parent_id, "t0")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -83,5 +83,101 @@ class TestPartnersMixin(unittest.TestCase):
         self.assertTrue(result)
 
 
+class TestCombinedLibrary(unittest.TestCase):
+    ME = {"id": "me", "email": "me@example.com"}
+    PARTNERS = [
+        {"id": "p1", "email": "anna@example.com", "inTimeline": True},
+        {"id": "p2", "name": "Ben", "inTimeline": False},
+    ]
+
+    def setUp(self):
+        self.client = ImmichClient("http://localhost:2283", "test-api-key")
+        self.client.get_me = MagicMock(return_value=self.ME)
+        self.client.list_partners = MagicMock(return_value=self.PARTNERS)
+
+    @staticmethod
+    def asset(asset_id, owner, digest):
+        import base64
+        return {"id": asset_id, "ownerId": owner, "checksum": base64.b64encode(digest * 20).decode()}
+
+    def test_capture_year_windows_cover_timeline(self):
+        """Test that the year windows cover the whole timeline"""
+        from immich_lib.api.partners import capture_year_windows
+        windows = capture_year_windows(2020, 2022)
+        self.assertEqual(windows[0], (None, "2019-12-31T23:59:59.999Z"))
+        self.assertEqual(windows[1], ("2020-01-01T00:00:00.000Z", "2020-12-31T23:59:59.999Z"))
+        self.assertEqual(windows[-1], ("2022-01-01T00:00:00.000Z", None))
+        self.assertEqual(len(windows), 4)
+
+    def test_dedupes_by_checksum_and_tags_owner(self):
+        """Test checksum dedupe and owner tagging across windows"""
+        shards = {
+            "2023-01-01T00:00:00.000Z": [self.asset("a1", "me", b"x"), self.asset("a2", "p1", b"y")],
+            "2024-01-01T00:00:00.000Z": [self.asset("a3", "p1", b"x"), self.asset("a4", "me", b"z")],
+        }
+        self.client.iter_assets = MagicMock(
+            side_effect=lambda **kwargs: iter(shards.get(kwargs.get("takenAfter"), []))
+        )
+        report = {}
+        assets = list(self.client.iter_combined_library(concurrency=3, report=report, type="IMAGE"))
+
+        self.assertEqual(sorted(a["id"] for a in assets), ["a1", "a2", "a4"])
+        owners = {a["id"]: a["owner"] for a in assets}
+        self.assertEqual(owners["a2"], "anna@example.com")
+        self.assertEqual(owners["a1"], "me@example.com")
+        self.assertEqual(report["listed"], 4)
+        self.assertEqual(report["duplicates"], 1)
+        self.assertEqual(report["hidden"], ["Ben"])
+        for call in self.client.iter_assets.call_args_list:
+            self.assertEqual(call[1]["type"], "IMAGE")
+
+    def test_dedupe_keeps_own_copy_then_lowest_id(self):
+        """Test that the kept copy does not depend on which window is listed first"""
+        shards = {
+            "2022-01-01T00:00:00.000Z": [self.asset("b9", "p1", b"x"), self.asset("c5", "p1", b"y")],
+            "2023-01-01T00:00:00.000Z": [self.asset("b1", "p3", b"y")],
+            "2024-01-01T00:00:00.000Z": [self.asset("z9", "me", b"x")],
+        }
+        self.client.iter_assets = MagicMock(
+            side_effect=lambda **kwargs: iter(shards.get(kwargs.get("takenAfter"), []))
+        )
+        for concurrency in (1, 4):
+            report = {}
+            assets = list(self.client.iter_combined_library(concurrency=concurrency, report=report))
+            self.assertEqual([a["id"] for a in assets], ["z9", "b1"])
+            self.assertEqual(report["duplicates"], 2)
+            self.assertEqual(report["owners"], {"me@example.com": 1, "p3": 1})
+
+    def test_without_dedupe_yields_every_copy(self):
+        """Test that dedupe=False yields every copy"""
+        self.client.iter_assets = MagicMock(
+            side_effect=lambda **kwargs: iter(
+                [self.asset("a1", "me", b"x"), self.asset("a2", "p1", b"x")]
+                if "takenAfter" not in kwargs else []
+            )
+        )
+        assets = list(self.client.iter_combined_library(dedupe=False))
+        self.assertEqual([a["id"] for a in assets], ["a1", "a2"])
+
+    def test_listing_error_is_raised(self):
+        """Test that a failed window raises after the listing"""
+        def listing(**kwargs):
+            if "takenBefore" not in kwargs:
+                raise RuntimeError("forbidden")
+            return iter([])
+        self.client.iter_assets = MagicMock(side_effect=listing)
+        with self.assertRaises(RuntimeError):
+            list(self.client.iter_combined_library())
+
+    def test_abandoned_iteration_stops_listing(self):
+        """Test that closing the iterator stops the listing threads"""
+        self.client.iter_assets = MagicMock(
+            side_effect=lambda **kwargs: iter(self.asset(f"{id(kwargs)}-{i}", "me", bytes([i % 256])) for i in range(100000))
+        )
+        assets = self.client.iter_combined_library(dedupe=False, page_size=10)
+        next(assets)
+        assets.close()
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,152 @@
+import io
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+from immich_lib.client import ImmichClient
+from immich_lib.cli import main
+from immich_lib.profiling import PhaseStats, SamplingProfiler, run_profiled
+
+
+class TestPhaseStats(unittest.TestCase):
+    def test_measure_and_report(self):
+        """Test phase timing and the printed summary"""
+        stats = PhaseStats()
+        with stats.measure("write", 2048):
+            pass
+        stats.add("write", 0.5, 1024)
+        stats.add("http", 1.0)
+        phases = stats.as_dict()["phases"]
+        self.assertEqual(phases["write"]["calls"], 2)
+        self.assertEqual(phases["write"]["bytes"], 3072)
+        report = stats.report()
+        self.assertLess(report.index("http"), report.index("write"))
+        self.assertIn("other", report)
+
+    def test_transfer_report(self):
+        """Test the wire versus decoded size line of the report"""
+        stats = PhaseStats()
+        stats.add_transfer(1024 * 1024, 8 * 1024 * 1024)
+        stats.add_transfer(1024 * 1024, 8 * 1024 * 1024)
+        self.assertEqual(stats.as_dict()["transfer"], {"wire_bytes": 2 * 1024 * 1024, "decoded_bytes": 16 * 1024 * 1024})
+        self.assertIn("2.0 MB on the wire, 16.0 MB decoded (8.0x)", stats.report())
+        self.assertNotIn("on the wire", PhaseStats().report())
+
+    def test_timed_iter(self):
+        """Test that timed iteration counts the bytes of each chunk"""
+        stats = PhaseStats()
+        self.assertEqual(list(stats.timed_iter("http", [b"ab", b"cde"])), [b"ab", b"cde"])
+        self.assertEqual(stats.as_dict()["phases"]["http"]["bytes"], 5)
+
+
+class TestClientInstrumentation(unittest.TestCase):
+    @patch("requests.Session.request")
+    def test_request_phases(self, mock_request):
+        """Test that JSON requests record HTTP and decode time"""
+        response = MagicMock(status_code=200, headers={"Content-Type": "application/json"}, content=b'{"a": 1}')
+        response.json.return_value = {"a": 1}
+        mock_request.return_value = response
+        client = ImmichClient("http://localhost:2283", "key")
+        client.stats = PhaseStats()
+        self.assertEqual(client.get("server/version"), {"a": 1})
+        phases = client.stats.as_dict()["phases"]
+        self.assertEqual(phases["http"]["calls"], 1)
+        self.assertEqual(phases["decode"]["bytes"], 8)
+
+    @patch("requests.Session.request")
+    def test_compressed_response_sizes(self, mock_request):
+        """Test that wire and decoded sizes of responses are recorded"""
+        body = b'{"items": [' + b'{"a": 1}, ' * 100 + b'{}]}'
+        response = MagicMock(status_code=200, headers={"Content-Type": "application/json"}, content=body)
+        response.raw.tell.return_value = 80
+        response.json.return_value = {"items": []}
+        mock_request.return_value = response
+        client = ImmichClient("http://localhost:2283", "key")
+        client.stats = PhaseStats()
+        client.post("search/metadata", json={})
+        self.assertEqual(client.stats.as_dict()["transfer"], {"wire_bytes": 80, "decoded_bytes": len(body)})
+
+        # Without a byte count from the raw stream, Content-Length is the wire size
+        response.raw = None
+        response.headers["Content-Length"] = "90"
+        client.post("search/metadata", json={})
+        self.assertEqual(client.stats.as_dict()["transfer"]["wire_bytes"], 170)
+
+    @patch("requests.Session.request")
+    def test_download_phases(self, mock_request):
+        """Test that downloads record HTTP and write time"""
+        response = MagicMock(status_code=200, headers={"Content-Type": "image/jpeg", "content-length": "6"})
+        response.iter_content.return_value = [b"abc", b"def"]
+        mock_request.return_value = response
+        client = ImmichClient("http://localhost:2283", "key")
+        client.stats = PhaseStats()
+        with tempfile.TemporaryDirectory() as tmp:
+            self.assertTrue(client.download_asset("a1", os.path.join(tmp, "a1.jpg")))
+        phases = client.stats.as_dict()["phases"]
+        self.assertEqual(phases["write"]["bytes"], 6)
+        self.assertEqual(phases["write"]["calls"], 2)
+        self.assertIn("progress", phases)
+
+
+class TestProfilers(unittest.TestCase):
+    def test_sampling_profiler_speedscope(self):
+        """Test the wall-clock sampler's speedscope output"""
+        profiler = SamplingProfiler(interval=0.001)
+        profiler.start()
+        time.sleep(0.05)
+        profiler.stop()
+        data = profiler.to_speedscope()
+        self.assertTrue(data["profiles"])
+        profile = data["profiles"][0]
+        self.assertEqual(len(profile["samples"]), len(profile["weights"]))
+        for stack in profile["samples"]:
+            self.assertTrue(all(0 <= i < len(data["shared"]["frames"]) for i in stack))
+        self.assertTrue(profiler.top())
+
+    def test_run_profiled_outputs(self):
+        """Test that every profiler mode returns the result and saves a profile"""
+        with tempfile.TemporaryDirectory() as tmp:
+            for mode in ("cprofile", "wall", "tracemalloc"):
+                path = os.path.join(tmp, mode)
+                stream = io.StringIO()
+                self.assertEqual(run_profiled(lambda: sum(range(1000)), mode, path, stream=stream), 499500)
+                self.assertTrue(os.path.exists(path))
+                self.assertIn(path, stream.getvalue())
+            with open(os.path.join(tmp, "wall")) as f:
+                self.assertIn("shared", json.load(f))
+
+    def test_run_profiled_unknown_mode(self):
+        """Test that an unknown profiler mode is rejected"""
+        with self.assertRaises(ValueError):
+            run_profiled(lambda: None, "perf")
+
+
+class TestCliProfiling(unittest.TestCase):
+    @patch("immich_lib.cli.ImmichClient")
+    @patch("sys.stderr", new_callable=io.StringIO)
+    @patch("sys.stdout", new_callable=io.StringIO)
+    def test_stats_flag(self, mock_stdout, mock_stderr, MockClient):
+        """Test '--stats' prints the phase summary"""
+        MockClient.return_value.list_albums.return_value = [{"id": "a1", "albumName": "Test", "assetCount": 2}]
+        main(["--url", "u", "--key", "k", "--stats", "list-albums"])
+        self.assertIn("Test", mock_stdout.getvalue())
+        self.assertIn("wall", mock_stderr.getvalue())
+        self.assertIsInstance(MockClient.return_value.stats, PhaseStats)
+
+    @patch("immich_lib.cli.ImmichClient")
+    @patch("sys.stderr", new_callable=io.StringIO)
+    @patch("sys.stdout", new_callable=io.StringIO)
+    def test_profile_flag(self, mock_stdout, mock_stderr, MockClient):
+        """Test '--profile' runs the command under a profiler"""
+        MockClient.return_value.list_albums.return_value = []
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "out.pstats")
+            main(["--url", "u", "--key", "k", "--profile", "cprofile", "--profile-output", path, "list-albums"])
+            self.assertTrue(os.path.exists(path))
+        self.assertIn("cumulative", mock_stderr.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,162 @@
+import json
+import os
+import random
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+from immich_lib import similar
+
+
+def gradient(width, height, step=1, noise=0, seed=0):
+    rng = random.Random(seed)
+    return [[x * step * 10 + y + rng.randint(0, noise) for x in range(width)] for y in range(height)]
+
+
+def fake_pixels(data, method):
+    """Decode the test 'images': JSON pixel rows instead of JPEG bytes."""
+    if data == b"corrupt":
+        raise OSError("cannot identify image file")
+    return json.loads(data)
+
+
+def picture(seed, noise=0, noise_seed=0):
+    """A 32x32 image built from random low-frequency DCT coefficients, optionally with pixel noise."""
+    pattern = random.Random(seed)
+    coefficients = [[pattern.uniform(-100, 100) for _ in range(8)] for _ in range(8)]
+    dct = similar._dct_matrix(32)
+    rng = random.Random(noise_seed)
+    return [
+        [128 + sum(coefficients[k][l] * dct[k][y] * dct[l][x] for k in range(8) for l in range(8))
+         + rng.uniform(-noise, noise) for x in range(32)]
+        for y in range(32)
+    ]
+
+
+class TestHashes(unittest.TestCase):
+    def test_dhash_of_gradient(self):
+        """Test the dHash of a horizontal gradient"""
+        self.assertEqual(similar.hash_pixels([gradient(9, 8)], "dhash"), [2 ** 64 - 1])
+        self.assertEqual(similar.hash_pixels([gradient(9, 8, step=-1)], "dhash"), [0])
+
+    def test_numpy_and_python_agree(self):
+        """Test that the NumPy and pure-Python hashes are identical"""
+        rng = random.Random(1)
+        images = {
+            "dhash": [[[rng.randint(0, 255) for _ in range(9)] for _ in range(8)] for _ in range(4)],
+            "phash": [[[rng.randint(0, 255) for _ in range(32)] for _ in range(32)] for _ in range(4)],
+        }
+        for method, batch in images.items():
+            expected = similar.hash_pixels(batch, method)
+            with patch.object(similar, "import_numpy", return_value=None):
+                self.assertEqual(similar.hash_pixels(batch, method), expected)
+
+    def test_phash_tolerates_noise(self):
+        """Test that pHash changes little under mild noise"""
+        clean, noisy, other = similar.hash_pixels(
+            [picture(1), picture(1, noise=10, noise_seed=3), picture(2)], "phash"
+        )
+        self.assertLessEqual(similar.hamming(clean, noisy), 6)
+        self.assertGreater(similar.hamming(clean, other), 20)
+
+    def test_unknown_method(self):
+        """Test that an unknown hash method is rejected"""
+        with self.assertRaises(ValueError):
+            similar.hash_pixels([], "ahash")
+
+
+class TestMultiIndexHash(unittest.TestCase):
+    def test_query_matches_brute_force(self):
+        """Test that multi-index queries match a brute-force scan"""
+        rng = random.Random(7)
+        values = [rng.getrandbits(64) for _ in range(300)]
+        values += [v ^ (1 << rng.randrange(64)) ^ (1 << rng.randrange(64)) for v in values[:100]]
+        for radius in (0, 3, 6, 9):
+            index = similar.MultiIndexHash(radius)
+            for value in values:
+                index.add(value)
+            for probe in values[:40] + values[300:340]:
+                expected = [i for i, v in enumerate(values) if similar.hamming(probe, v) <= radius]
+                self.assertEqual(index.query(probe), expected)
+
+    def test_pairs_with_and_without_numpy(self):
+        """Test that both pair joins find the same pairs"""
+        rng = random.Random(3)
+        values = [rng.getrandbits(64) for _ in range(200)]
+        values += [v ^ (1 << rng.randrange(64)) ^ (1 << rng.randrange(64)) for v in values[:50]]
+        index = similar.MultiIndexHash(6)
+        for value in values:
+            index.add(value)
+        expected = [
+            (i, j) for i in range(len(values)) for j in range(i + 1, len(values))
+            if similar.hamming(values[i], values[j]) <= 6
+        ]
+        self.assertEqual(index.pairs(), expected)
+        with patch.object(similar, "import_numpy", return_value=None):
+            self.assertEqual(index.pairs(), expected)
+
+    def test_group_similar(self):
+        """Test grouping hashes within the threshold"""
+        hashes = {"a": 0b0000, "b": 0b0001, "c": 0b0011, "d": 0b1111 << 20, "e": 0b0000}
+        self.assertEqual(similar.group_similar(hashes, 1), [["a", "b", "c", "e"]])
+        self.assertEqual(similar.group_similar(hashes, 0), [["a", "e"]])
+
+
+class TestFindSimilar(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = os.path.join(self.tmp.name, "cache", "hashes.json")
+        images = {
+            "a1": gradient(9, 8),
+            "a2": gradient(9, 8, noise=3, seed=1),
+            "a3": gradient(9, 8, step=-1),
+        }
+        self.assets = [{"id": k, "updatedAt": "t1"} for k in images] + [{"id": "bad", "updatedAt": "t1"}]
+        self.client = MagicMock()
+        self.client.iter_assets.side_effect = lambda **kwargs: iter(self.assets)
+
+        def view(asset_id, size):
+            response = MagicMock()
+            response.content = json.dumps(images[asset_id]).encode() if asset_id in images else b"corrupt"
+            return response
+
+        self.client.view_asset.side_effect = view
+        patcher = patch.multiple(similar, _load_pixels=fake_pixels, _pillow=MagicMock())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_scan_then_cached_rescan(self):
+        """Test that a rescan only hashes new images"""
+        result = similar.find_similar(self.client, threshold=4, cache_path=self.cache, processes=0)
+        self.client.iter_assets.assert_called_with(page_size=1000, type="IMAGE")
+        self.client.view_asset.assert_called_with("bad", size="thumbnail")
+        self.assertEqual(result["groups"], [["a1", "a2"]])
+        self.assertEqual((result["hashed"], result["cached"], result["failed"]), (3, 0, 1))
+
+        self.client.view_asset.reset_mock()
+        self.assets[2]["updatedAt"] = "t2"
+        result = similar.find_similar(self.client, threshold=4, cache_path=self.cache, processes=0)
+        self.assertEqual([c[0][0] for c in self.client.view_asset.call_args_list], ["a3", "bad"])
+        self.assertEqual((result["hashed"], result["cached"]), (1, 2))
+        self.assertEqual(result["groups"], [["a1", "a2"]])
+
+    def test_cache_of_other_method_is_ignored(self):
+        """Test that a cache written by another hash method is ignored"""
+        similar.find_similar(self.client, cache_path=self.cache, processes=0)
+        self.client.view_asset.reset_mock()
+        cache = similar.HashCache(self.cache, "phash")
+        self.assertEqual(cache.entries, {})
+        self.assertEqual(similar.HashCache(self.cache, "dhash").get("a1", "t1"), 2 ** 64 - 1)
+        self.assertIsNone(similar.HashCache(self.cache, "dhash").get("a1", "t0"))
+
+    def test_requires_pillow(self):
+        """Test that a missing Pillow raises ImportError"""
+        with patch.object(similar, "_pillow", side_effect=ImportError("Pillow is required")):
+            with self.assertRaises(ImportError):
+                similar.find_similar(self.client, processes=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,8 @@
 import unittest
 from unittest.mock import patch, MagicMock
 from immich_lib.client import ImmichClient
-
+from immich_lib.api import stacks
+from immich_lib.api.stacks import StackCandidate, group_stack_candidates, to_stack_candidate
 
 
 class TestStacksMixin(unittest.TestCase):
@@ -80,5 +81,81 @@ class TestStacksMixin(unittest.TestCase):
         self.assertTrue(result)
 
 
+class TestAutoStack(unittest.TestCase):
+    def setUp(self):
+        self.client = ImmichClient("http://localhost:2283", "test-api-key")
+        self.candidates = [
+            StackCandidate("b2", 100.4, "Canon R5", "img_0002", ".jpg", 10),
+            StackCandidate("b1", 100.0, "Canon R5", "img_0001", ".cr3", 50),
+            StackCandidate("b3", 100.9, "Canon R5", "img_0003", ".jpg", 20),
+            StackCandidate("p1", 100.2, "Pixel 8", "pxl_1", ".jpg", 5),
+            StackCandidate("s1", 500.0, "Canon R5", "img_0010", ".jpg", 5),
+            StackCandidate("r1", 900.0, "Canon R5", "img_0020", ".cr3", 40),
+            StackCandidate("r2", 900.0, "Canon R5", "img_0020", ".jpg", 8),
+        ]
+
+    def _check_grouping(self):
+        bursts = group_stack_candidates(self.candidates, mode="burst", max_gap=1.0)
+        self.assertEqual(
+            bursts,
+            [
+                {"primaryAssetId": "b2", "assetIds": ["b2", "b1", "b3"]},
+                {"primaryAssetId": "r2", "assetIds": ["r2", "r1"]},
+            ],
+        )
+        pairs = group_stack_candidates(self.candidates, mode="raw", primary="raw")
+        self.assertEqual(pairs, [{"primaryAssetId": "r1", "assetIds": ["r1", "r2"]}])
+        largest = group_stack_candidates(self.candidates, primary="largest")
+        self.assertEqual(largest[0]["primaryAssetId"], "b1")
+
+    def test_group_stack_candidates_pure_python(self):
+        """Test burst and RAW+JPEG grouping without NumPy"""
+        with patch.object(stacks, "import_numpy", return_value=None):
+            self._check_grouping()
+
+    @unittest.skipIf(stacks.import_numpy() is None, "NumPy not installed")
+    def test_group_stack_candidates_numpy(self):
+        """Test burst and RAW+JPEG grouping with NumPy"""
+        self._check_grouping()
+
+    def test_group_stack_candidates_custom_primary(self):
+        """Test a callable primary rule"""
+        result = group_stack_candidates(self.candidates, primary=lambda group: group[-1])
+        self.assertEqual(result[0]["primaryAssetId"], "b3")
+        with self.assertRaises(ValueError):
+            group_stack_candidates(self.candidates, primary="unknown")
+
+    def test_to_stack_candidate(self):
+        """Test reduction of an asset dict to a compact record"""
+        candidate = to_stack_candidate({
+            "id": "a1",
+            "originalFileName": "IMG_0001.JPG",
+            "deviceId": "phone",
+            "fileCreatedAt": "2024-01-01T10:00:00.000Z",
+            "exifInfo": {"make": "Canon", "model": "R5", "fileSizeInByte": 123},
+        })
+        self.assertEqual(candidate.device, "Canon R5")
+        self.assertEqual((candidate.stem, candidate.ext, candidate.size), ("img_0001", ".jpg", 123))
+        self.assertIsNone(to_stack_candidate({"id": "a2"}))
+
+    @patch.object(ImmichClient, "create_stack")
+    @patch.object(ImmichClient, "iter_assets")
+    def test_auto_stack(self, mock_iter, mock_create):
+        """Test that auto_stack skips stacked assets and honours dry-run"""
+        mock_iter.return_value = [
+            {"id": "a1", "deviceId": "d", "fileCreatedAt": "2024-01-01T10:00:00.000Z", "originalFileName": "a.jpg"},
+            {"id": "a2", "deviceId": "d", "fileCreatedAt": "2024-01-01T10:00:00.500Z", "originalFileName": "b.jpg"},
+            {"id": "a3", "deviceId": "d", "fileCreatedAt": "2024-01-01T10:00:00.700Z", "stack": {"id": "s"}},
+        ]
+
+        planned = self.client.auto_stack(dry_run=True)
+        self.assertEqual(planned, [{"primaryAssetId": "a1", "assetIds": ["a1", "a2"]}])
+        mock_create.assert_not_called()
+        mock_iter.assert_called_with(type="IMAGE", withExif=True, withStacked=True)
+
+        self.client.auto_stack()
+        mock_create.assert_called_once_with("a1", ["a1", "a2"])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,135 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+from immich_lib import sync
+
+
+def make_client(assets):
+    client = MagicMock()
+    client.iter_album_assets.side_effect = lambda album_id: iter(list(assets))
+
+    def download(asset_id, path):
+        with open(path, "wb") as f:
+            f.write(asset_id.encode())
+        return True
+
+    client.download_asset.side_effect = download
+    return client
+
+
+class TestSyncAlbum(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+        self.assets = [
+            {"id": "a1", "originalFileName": "one.jpg", "checksum": "c1", "updatedAt": "t1"},
+            {"id": "a2", "originalFileName": "two.jpg", "checksum": "c2", "updatedAt": "t1"},
+        ]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_initial_then_noop(self):
+        """Test that a second sync of an unchanged album transfers nothing"""
+        client = make_client(self.assets)
+        plan = sync.sync_album(client, "album-1", self.dir)
+        self.assertEqual(len(plan["download"]), 2)
+        self.assertEqual(plan["failed"], [])
+        client.iter_album_assets.assert_called_with("album-1")
+        self.assertTrue(os.path.exists(os.path.join(self.dir, "one.jpg")))
+        self.assertFalse(os.path.exists(os.path.join(self.dir, "one.jpg.part")))
+        with open(os.path.join(self.dir, sync.STATE_FILE)) as f:
+            self.assertEqual(json.load(f)["assets"]["a2"]["path"], "two.jpg")
+
+        client.download_asset.reset_mock()
+        plan = sync.sync_album(client, "album-1", self.dir)
+        self.assertEqual(plan["download"], [])
+        self.assertEqual(plan["unchanged"], 2)
+        client.download_asset.assert_not_called()
+
+    def test_changed_and_missing_assets_are_downloaded(self):
+        """Test that changed and deleted local files are downloaded again"""
+        client = make_client(self.assets)
+        sync.sync_album(client, "album-1", self.dir)
+        self.assets[0]["checksum"] = "c1-new"
+        os.remove(os.path.join(self.dir, "two.jpg"))
+        plan = sync.sync_album(client, "album-1", self.dir)
+        self.assertEqual(sorted(plan["download"]), [("a1", "one.jpg"), ("a2", "two.jpg")])
+
+    def test_delete_removes_only_tracked_files(self):
+        """Test that --delete only removes files the sync created"""
+        client = make_client(self.assets)
+        sync.sync_album(client, "album-1", self.dir)
+        with open(os.path.join(self.dir, "mine.txt"), "w") as f:
+            f.write("keep")
+        del self.assets[1]
+
+        sync.sync_album(client, "album-1", self.dir)
+        self.assertTrue(os.path.exists(os.path.join(self.dir, "two.jpg")))
+
+        plan = sync.sync_album(client, "album-1", self.dir, delete=True)
+        self.assertEqual(plan["remove"], ["a2"])
+        self.assertFalse(os.path.exists(os.path.join(self.dir, "two.jpg")))
+        self.assertTrue(os.path.exists(os.path.join(self.dir, "mine.txt")))
+
+    def test_upload_new_local_files(self):
+        """Test uploading new local files into the album"""
+        client = make_client(self.assets)
+        client.upload_asset.return_value = {"id": "new-1", "status": "created"}
+        with open(os.path.join(self.dir, "local.jpg"), "wb") as f:
+            f.write(b"data")
+        plan = sync.sync_album(client, "album-1", self.dir, upload=True)
+        self.assertEqual(plan["upload"], ["local.jpg"])
+        client.add_assets_to_album.assert_called_once_with("album-1", ["new-1"])
+        state = sync.load_state(self.dir)
+        self.assertEqual(state["assets"]["new-1"]["checksum"], "oXyaqmHoChv3HQ2FCvTluqmAC70=")
+
+        # Uploaded files are tracked, so they are not uploaded again
+        plan = sync.sync_album(client, "album-1", self.dir, upload=True, dry_run=True)
+        self.assertEqual(plan["upload"], [])
+
+    def test_name_collisions(self):
+        """Test that assets with the same file name get distinct paths"""
+        self.assets[1]["originalFileName"] = "one.jpg"
+        plan = sync.sync_album(make_client(self.assets), "album-1", self.dir)
+        self.assertEqual(sorted(path for _, path in plan["download"]), ["one.jpg", "one_a2.jpg"])
+
+    def test_untracked_local_file_is_not_overwritten(self):
+        """Test that a new asset named like an untracked local file gets another name"""
+        with open(os.path.join(self.dir, "one.jpg"), "wb") as f:
+            f.write(b"mine")
+        client = make_client(self.assets)
+        client.upload_asset.return_value = {"id": "u1"}
+        plan = sync.sync_album(client, "album-1", self.dir, upload=True)
+        self.assertIn(("a1", "one_a1.jpg"), plan["download"])
+        self.assertEqual(plan["upload"], ["one.jpg"])
+        with open(os.path.join(self.dir, "one.jpg"), "rb") as f:
+            self.assertEqual(f.read(), b"mine")
+
+    def test_failed_download_is_retried(self):
+        """Test that a failed download is retried on the next run"""
+        client = make_client(self.assets)
+        client.download_asset.side_effect = lambda asset_id, path: False
+        plan = sync.sync_album(client, "album-1", self.dir)
+        self.assertEqual(sorted(plan["failed"]), ["a1", "a2"])
+        self.assertEqual(sync.load_state(self.dir)["assets"], {})
+
+    def test_dry_run(self):
+        """Test that a dry run only reports the plan"""
+        client = make_client(self.assets)
+        plan = sync.sync_album(client, "album-1", self.dir, dry_run=True)
+        self.assertEqual(len(plan["download"]), 2)
+        client.download_asset.assert_not_called()
+        self.assertFalse(os.path.exists(os.path.join(self.dir, sync.STATE_FILE)))
+
+    def test_other_album_rejected(self):
+        """Test that a directory synced with one album refuses another"""
+        sync.sync_album(make_client(self.assets), "album-1", self.dir)
+        with self.assertRaises(ValueError):
+            sync.sync_album(make_client(self.assets), "album-2", self.dir)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -109,6 +109,146 @@ class TestTagsMixin(unittest.TestCase):
         result = self.client.untag_assets("tag123", ["asset1", "asset2"])
         self.assertTrue(result)
 
+    @patch.object(ImmichClient, "get")
+    def test_tag_index_lookups(self, mock_get):
+        """Test that the tag index resolves paths and children from one listing"""
+        mock_get.return_value = [
+            {"id": "t1", "name": "Travel", "value": "Travel", "parentId": None},
+            {"id": "t2", "name": "Japan", "value": "Travel/Japan", "parentId": "t1"},
+            {"id": "t3", "name": "Tokyo", "parentId": "t2"},
+        ]
+
+        self.assertEqual(self.client.resolve_tag("Travel/Japan"), "t2")
+        self.assertEqual(self.client.resolve_tag("/Travel/Japan/Tokyo/"), "t3")
+        self.assertIsNone(self.client.resolve_tag("Travel/France"))
+        index = self.client.get_tag_index()
+        self.assertEqual([t["id"] for t in index.get_children("t1")], ["t2"])
+        self.assertEqual([t["id"] for t in index.get_children()], ["t1"])
+        mock_get.assert_called_once_with("tags")
+
+    @patch.object(ImmichClient, "put")
+    @patch.object(ImmichClient, "get")
+    def test_ensure_tags_creates_missing_in_bulk(self, mock_get, mock_put):
+        """Test that ensure_tags upserts only missing paths and refreshes the index"""
+        mock_get.side_effect = [
+            [{"id": "t1", "name": "Travel", "value": "Travel"}],
+            [
+                {"id": "t1", "name": "Travel", "value": "Travel"},
+                {"id": "t2", "name": "Japan", "value": "Travel/Japan", "parentId": "t1"},
+                {"id": "t3", "name": "Family", "value": "Family"},
+            ],
+        ]
+
+        result = self.client.ensure_tags(["Travel", "Travel/Japan", "Family"])
+        self.assertEqual(result, {"Travel": "t1", "Travel/Japan": "t2", "Family": "t3"})
+        mock_put.assert_called_once_with("tags", json={"tags": ["Family", "Travel/Japan"]})
+
+    @patch.object(ImmichClient, "delete")
+    @patch.object(ImmichClient, "get")
+    def test_tag_index_invalidated_on_delete(self, mock_get, mock_delete):
+        """Test that deleting a tag forces the index to reload"""
+        mock_get.side_effect = [
+            [{"id": "t1", "name": "Travel", "value": "Travel"}],
+            [],
+        ]
+
+        self.assertEqual(self.client.resolve_tag("Travel"), "t1")
+        self.client.delete_tag("t1")
+        self.assertIsNone(self.client.resolve_tag("Travel"))
+        self.assertEqual(mock_get.call_count, 2)
+
+    @patch.object(ImmichClient, "put")
+    @patch.object(ImmichClient, "get")
+    def test_plan_tag_assignments_diffs_current(self, mock_get, mock_put):
+        """Test that the planner only emits missing assignments"""
+        mock_get.return_value = [
+            {"id": "t1", "name": "Travel", "value": "Travel"},
+            {"id": "t2", "name": "Family", "value": "Family"},
+        ]
+        assignments = {"a1": ["Travel"], "a2": ["Travel", "Family"], "a3": ["Family"]}
+        current = {"t1": {"a1"}, "t2": {"a2", "a3"}}
+
+        plan = self.client.plan_tag_assignments(assignments, current=current)
+        self.assertEqual(plan, {"add": {"t1": ["a2"]}, "remove": {}})
+        mock_put.assert_not_called()
+
+    @patch.object(ImmichClient, "get")
+    def test_plan_tag_assignments_prune(self, mock_get):
+        """Test that pruning untags listed assets only"""
+        mock_get.return_value = [
+            {"id": "t1", "name": "Travel", "value": "Travel"},
+            {"id": "t2", "name": "Family", "value": "Family"},
+        ]
+        assignments = {"a1": ["Travel"], "a2": []}
+        current = {"t1": {"a1", "a2", "other"}, "t2": {"a1"}}
+
+        plan = self.client.plan_tag_assignments(assignments, current=current, prune=True)
+        self.assertEqual(plan["add"], {})
+        self.assertEqual(plan["remove"], {"t1": ["a2"], "t2": ["a1"]})
+
+    @patch.object(ImmichClient, "post")
+    @patch.object(ImmichClient, "get")
+    def test_plan_tag_assignments_prune_uses_asset_tags(self, mock_get, mock_post):
+        """Test that pruning reads the given assets' tags instead of searching every tag"""
+        tags = [
+            {"id": "t1", "name": "Travel", "value": "Travel"},
+            {"id": "t2", "name": "Family", "value": "Family"},
+            {"id": "t3", "name": "Work", "value": "Work"},
+        ]
+        mock_get.return_value = tags
+        assets = [{"id": "a1", "tags": [tags[1]]}, {"id": "a2", "tags": [tags[0]]}]
+
+        plan = self.client.plan_tag_assignments({"a1": ["Travel"], "a2": ["Travel"]}, prune=True, assets=assets)
+        self.assertEqual(plan, {"add": {"t1": ["a1"]}, "remove": {"t2": ["a1"]}})
+        mock_get.assert_called_once_with("tags")
+        mock_post.assert_not_called()
+
+    @patch.object(ImmichClient, "post")
+    @patch.object(ImmichClient, "get")
+    def test_plan_tag_assignments_prune_searches_tags(self, mock_get, mock_post):
+        """Test that pruning without current assignments pages through tags, not assets"""
+        mock_get.return_value = [
+            {"id": "t1", "name": "Travel", "value": "Travel"},
+            {"id": "t2", "name": "Family", "value": "Family"},
+        ]
+        tagged = {"t1": [{"id": "a2"}], "t2": [{"id": "a1"}, {"id": "other"}]}
+        mock_post.side_effect = lambda path, json: {
+            "assets": {"items": tagged[json["tagIds"][0]], "nextPage": None}
+        }
+        assignments = {f"a{i}": ["Travel"] for i in range(1, 101)}
+
+        plan = self.client.plan_tag_assignments(assignments, prune=True)
+        self.assertEqual(plan["add"], {"t1": sorted(set(assignments) - {"a2"})})
+        self.assertEqual(plan["remove"], {"t2": ["a1"]})
+        mock_get.assert_called_once_with("tags")
+        self.assertEqual(mock_post.call_count, 2)
+
+    @patch.object(ImmichClient, "post")
+    @patch.object(ImmichClient, "get")
+    def test_plan_tag_assignments_fetches_current(self, mock_get, mock_post):
+        """Test that current assignments are fetched through paged search"""
+        mock_get.return_value = [{"id": "t1", "name": "Travel", "value": "Travel"}]
+        mock_post.return_value = {"assets": {"items": [{"id": "a1"}], "nextPage": None}}
+
+        plan = self.client.plan_tag_assignments({"a1": ["Travel"]})
+        self.assertEqual(plan, {"add": {}, "remove": {}})
+        mock_post.assert_called_once_with(
+            "search/metadata", json={"tagIds": ["t1"], "page": 1, "size": 1000}
+        )
+
+    @patch.object(ImmichClient, "delete")
+    @patch.object(ImmichClient, "put")
+    def test_apply_tag_plan_chunks_calls(self, mock_put, mock_delete):
+        """Test that plans are executed in chunked requests"""
+        plan = {"add": {"t1": ["a1", "a2", "a3"]}, "remove": {"t2": ["a4"]}}
+
+        calls = self.client.apply_tag_plan(plan, chunk_size=2, concurrency=2)
+        self.assertEqual(calls, 3)
+        mock_put.assert_any_call("tags/t1/assets", json={"ids": ["a1", "a2"]})
+        mock_put.assert_any_call("tags/t1/assets", json={"ids": ["a3"]})
+        mock_delete.assert_called_once_with("tags/t2/assets", json={"ids": ["a4"]})
+        self.assertEqual(self.client.apply_tag_plan({"add": {}, "remove": {}}), 0)
+
 
 if __name__ == "__main__":
     unittest.main()
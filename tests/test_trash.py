@@ -1,4 +1,5 @@
 import unittest
+from datetime import datetime, timedelta, timezone
 from unittest.mock import patch, MagicMock
 import requests
 from immich_lib.client import ImmichClient
@@ -58,6 +59,60 @@ class TestTrashMixin(unittest.TestCase):
         result = self.client.restore_assets(["asset1", "asset2"])
         self.assertEqual(result["status"], "success")
 
+    @patch.object(ImmichClient, "post")
+    def test_iter_trash_filters(self, mock_post):
+        """Test the trash iterator pages search/metadata and skips live assets"""
+        mock_post.side_effect = [
+            {"assets": {"items": [{"id": "a1", "isTrashed": True}, {"id": "a2", "isTrashed": False}], "nextPage": "2"}},
+            {"assets": {"items": [{"id": "a3", "isTrashed": True}], "nextPage": None}},
+        ]
+        result = list(self.client.iter_trash(page_size=2, older_than=30, type="VIDEO"))
+        self.assertEqual([a["id"] for a in result], ["a1", "a3"])
+        query = mock_post.call_args_list[0][1]["json"]
+        self.assertTrue(query["withDeleted"])
+        self.assertEqual(query["type"], "VIDEO")
+        self.assertEqual(query["size"], 2)
+        cutoff = datetime.fromisoformat(query["trashedBefore"])
+        self.assertAlmostEqual(
+            (datetime.now(timezone.utc) - cutoff).total_seconds(), timedelta(days=30).total_seconds(), delta=60
+        )
+
+    @patch.object(ImmichClient, "post")
+    def test_iter_trash_defaults_to_now(self, mock_post):
+        """Test the trash iterator always asks the server for trashed assets only"""
+        mock_post.return_value = {"assets": {"items": [], "nextPage": None}}
+        list(self.client.iter_trash())
+        query = mock_post.call_args[1]["json"]
+        cutoff = datetime.fromisoformat(query["trashedBefore"])
+        self.assertAlmostEqual((datetime.now(timezone.utc) - cutoff).total_seconds(), 0, delta=60)
+
+    @patch.object(ImmichClient, "delete_assets")
+    @patch.object(ImmichClient, "iter_trash")
+    def test_purge_trash_batches(self, mock_iter, mock_delete):
+        """Test purging deletes in chunks and relists until nothing new is found"""
+        trash = [{"id": f"a{i}", "type": "IMAGE" if i % 2 else "VIDEO"} for i in range(7)]
+        # The second listing still returns what was already deleted plus a straggler
+        mock_iter.side_effect = [iter(trash[:5]), iter(trash), iter(trash)]
+        mock_delete.side_effect = [True, True, Exception("boom"), True]
+
+        result = self.client.purge_trash(older_than=7, chunk_size=2, concurrency=1)
+        self.assertEqual(mock_iter.call_count, 3)
+        mock_iter.assert_called_with(page_size=1000, older_than=7)
+        batches = [c[0][0] for c in mock_delete.call_args_list]
+        self.assertEqual(batches, [["a0", "a1"], ["a2", "a3"], ["a4"], ["a5", "a6"]])
+        self.assertTrue(all(c[1] == {"force": True} for c in mock_delete.call_args_list))
+        self.assertEqual(result, {"matched": 7, "deleted": 6, "failed": 1})
+
+    @patch.object(ImmichClient, "delete_assets")
+    @patch.object(ImmichClient, "iter_trash")
+    def test_purge_trash_filter_and_dry_run(self, mock_iter, mock_delete):
+        """Test dry runs only count assets accepted by the filter"""
+        mock_iter.return_value = iter([{"id": "a1", "type": "IMAGE"}, {"id": "a2", "type": "VIDEO"}])
+        result = self.client.purge_trash(asset_type="VIDEO", filter=lambda a: a["id"] != "a2", dry_run=True)
+        mock_iter.assert_called_with(page_size=1000, older_than=None, type="VIDEO")
+        mock_delete.assert_not_called()
+        self.assertEqual(result, {"matched": 1, "deleted": 0, "failed": 0})
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,44 @@
+import json
+import unittest
+from immich_lib.utils import chunked, imap_ordered, iter_json_array, parse_datetime, run_concurrently
+
+
+class TestUtils(unittest.TestCase):
+    def test_chunked(self):
+        """Test splitting an iterable into fixed-size lists"""
+        self.assertEqual(list(chunked(range(5), 2)), [[0, 1], [2, 3], [4]])
+        self.assertEqual(list(chunked([], 3)), [])
+
+    def test_run_concurrently_preserves_order(self):
+        """Test that results come back in input order"""
+        self.assertEqual(run_concurrently(lambda x: x * 2, range(10), concurrency=4), list(range(0, 20, 2)))
+        self.assertEqual(run_concurrently(lambda x: x, [], concurrency=4), [])
+
+    def test_imap_ordered(self):
+        """Test lazy bounded mapping keeps input order"""
+        self.assertEqual(list(imap_ordered(lambda x: x + 1, range(20), concurrency=3)), list(range(1, 21)))
+        self.assertEqual(list(imap_ordered(lambda x: x, [1, 2], concurrency=1)), [1, 2])
+
+    def test_parse_datetime(self):
+        """Test parsing of API timestamps with 'Z' and odd fractional precision"""
+        self.assertEqual(parse_datetime("2024-01-01T10:00:00.5Z").microsecond, 500000)
+        self.assertEqual(parse_datetime("2024-01-01T10:00:00.123456789+02:00").microsecond, 123456)
+        self.assertIsNone(parse_datetime(None))
+        self.assertIsNone(parse_datetime("not a date"))
+
+    def test_iter_json_array(self):
+        """Test streaming one array field of a JSON object split at arbitrary byte boundaries"""
+        assets = [{"id": str(i), "size": -1.5e3 * i, "name": "é\"\\", "ok": True, "x": None} for i in range(50)]
+        document = {"id": "album", "albumUsers": [{"assets": [0]}], "assetCount": 12345, "assets": assets, "z": 1.5}
+        body = json.dumps(document, ensure_ascii=False, indent=1).encode()
+        for size in (1, 3, 64, len(body)):
+            chunks = [body[i:i + size] for i in range(0, len(body), size)]
+            self.assertEqual(list(iter_json_array(chunks, "assets")), assets)
+        self.assertEqual(list(iter_json_array([b'{"assets": []}'], "assets")), [])
+        self.assertEqual(list(iter_json_array([b'{}'], "assets")), [])
+        with self.assertRaises(ValueError):
+            list(iter_json_array([b'{"assets": [1, 2'], "assets"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import base64
+import hashlib
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+from immich_lib import verify
+from immich_lib.backup import backup_path
+
+
+def make_asset(index, content, owner="me@example.com"):
+    return {
+        "id": f"asset-{index:04d}-id",
+        "owner": owner,
+        "originalFileName": f"IMG_{index}.jpg",
+        "fileCreatedAt": "2024-05-01T10:00:00.000Z",
+        "checksum": base64.b64encode(hashlib.sha1(content).digest()).decode(),
+        "exifInfo": {"fileSizeInByte": len(content)},
+    }
+
+
+class TestVerifyMirror(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.contents = {0: b"good", 1: b"same", 2: b"size", 3: b"lost", 4: b"dup!"}
+        self.assets = [make_asset(i, content) for i, content in self.contents.items()]
+        # The same file in a partner's library, mirrored only under the first owner
+        self.assets.append(dict(make_asset(5, b"dup!"), owner="anna@example.com"))
+        self.client = MagicMock()
+        self.client.iter_combined_library.side_effect = lambda **kwargs: iter(self.assets)
+
+        self.write(self.assets[0], b"good")
+        self.write(self.assets[1], b"SAME")  # same size, wrong content
+        self.write(self.assets[2], b"sized")  # wrong size
+        self.write(self.assets[4], b"dup!")
+        self.extra = os.path.join(self.root, "me@example.com", "stray.jpg")
+        with open(self.extra, "wb") as f:
+            f.write(b"?")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, asset, content):
+        path = backup_path(self.root, asset["owner"], asset)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(content)
+
+    def path(self, index):
+        return backup_path(self.root, self.assets[index]["owner"], self.assets[index])
+
+    def test_reports_missing_corrupt_and_extra(self):
+        """Test reporting missing, corrupt and extra files"""
+        report = verify.verify_mirror(self.client, self.root, concurrency=4)
+        self.assertEqual(report["checked"], 6)
+        self.assertEqual(report["ok"], 2)
+        self.assertEqual(sorted(report["corrupt"]), sorted([self.path(1), self.path(2)]))
+        self.assertEqual(report["missing"], [self.path(3)])
+        self.assertEqual(report["extra"], [self.extra])
+        self.assertEqual(self.client.iter_combined_library.call_args[1]["dedupe"], False)
+        self.client.download_asset.assert_not_called()
+
+    def test_repair_downloads_bad_files(self):
+        """Test that --repair downloads bad and missing files again"""
+        def download(asset_id, output_path, throttle=None, progress=True):
+            index = int(asset_id.split("-")[1])
+            with open(output_path, "wb") as f:
+                f.write(self.contents[index])
+            return True
+
+        self.client.download_asset.side_effect = download
+        report = verify.verify_mirror(self.client, self.root, repair=True)
+        self.assertEqual(report["repaired"], 3)
+        self.assertEqual(report["failed"], 0)
+
+        report = verify.verify_mirror(self.client, self.root)
+        self.assertEqual(report["ok"], 5)
+        self.assertEqual(report["corrupt"] + report["missing"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()